@@ -17,3 +17,19 @@ http.interceptors.request.use((config) => {
 
   return config;
 });
+
+type Page<T> = { items: T[]; nextCursor: string | null };
+
+// server vraća liste u stranicama ({ items, nextCursor }) - prati cursor do kraja
+export async function getAllPages<T>(url: string, params: Record<string, unknown> = {}): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const res: { data: Page<T> } = await http.get(url, {
+      params: { ...params, limit: 200, ...(cursor ? { cursor } : {}) },
+    });
+    items.push(...res.data.items);
+    cursor = res.data.nextCursor;
+  } while (cursor);
+  return items;
+}
@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import { http } from "../api/https";
+import { http, getAllPages } from "../api/https";
 import { endpoints } from "../api/endpoints";
 import type { CourseRequest } from "../types/courses";
 
@@ -14,8 +14,7 @@ export default function AdminPendingCourses() {
   const fetchRequests = async () => {
     setLoading(true);
     try {
-      const res = await http.get(endpoints.admin.courseRequests);
-      setRequests(res.data.filter((r: CourseRequest) => r.status === "PENDING"));
+      setRequests(await getAllPages<CourseRequest>(endpoints.admin.courseRequests, { status: "PENDING" }));
     } catch (err) {
       console.error(err);
     } finally {
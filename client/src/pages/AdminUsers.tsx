@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import { http } from "../api/https";
+import { http, getAllPages } from "../api/https";
 import { endpoints } from "../api/endpoints";
 import type { User } from "../types/auth";
 
@@ -26,8 +26,7 @@ export default function AdminUsersPage() {
   const fetchUsers = async () => {
     setLoading(true);
     try {
-      const res = await http.get(endpoints.admin.users);
-      setUsers(res.data);
+      setUsers(await getAllPages<User>(endpoints.admin.users));
     } catch (err) {
       console.error(err);
     } finally {
@@ -1,4 +1,4 @@
-import { useEffect, useState} from "react";
+import { useEffect, useRef, useState} from "react";
 import type { FormEvent } from "react";
 import { useParams } from "react-router-dom";
 import { http } from "../api/https";
@@ -6,6 +6,8 @@ import { endpoints } from "../api/endpoints";
 import type { Course } from "../types/courses";
 import type { Task, TaskSubmission } from "../types/tasks";
 import { useAuth } from "../auth/AuthContext";
+import { createSocket, onBatchedEvent, subscribeRoom, unsubscribeRoom } from "../ws/socket";
+import type { SubmissionDelta } from "../ws/socket";
 
 export default function CourseDetailsPage() {
   const { id } = useParams<{ id?: string }>();
@@ -15,6 +17,8 @@ export default function CourseDetailsPage() {
   const [course, setCourse] = useState<Course | null>(null);
   const [tasks, setTasks] = useState<Task[]>([]);
   const [submissions, setSubmissions] = useState<TaskSubmission[]>([]);
+  const tasksRef = useRef<Task[]>([]);
+  tasksRef.current = tasks;
   const [loading, setLoading] = useState(false);
 
   const [newTaskTitle, setNewTaskTitle] = useState("");
@@ -32,11 +36,39 @@ export default function CourseDetailsPage() {
       await fetchCourse(courseId);
       await fetchTasks(courseId);
       if (hasRole && hasRole(["PROFESOR"])) {
-        await fetchAllSubmissions();
+        await fetchAllSubmissions(courseId);
       }
     })();
   }, [courseId, user]);
 
+  const isCourseProfessor = !!course && hasRole && hasRole(["PROFESOR"]) && course.professorId === user?.id;
+
+  // predaje i ocene stižu kao delta događaji iz sobe "course:<id>"
+  useEffect(() => {
+    if (courseId === null || !isCourseProfessor || !user) return;
+
+    const room = `course:${courseId}`;
+    const sessionId = localStorage.getItem("session_id") ?? "";
+    const socket = createSocket(http.defaults.baseURL ?? "", String(user.id), user.role);
+
+    // sobe se gube pri ponovnom povezivanju pa se pretplata obnavlja na svaki connect
+    const subscribe = () => {
+      subscribeRoom(socket, room, sessionId).catch((err) => console.error("subscribe error:", err));
+    };
+    socket.on("connect", subscribe);
+
+    const stop = onBatchedEvent<SubmissionDelta>(socket, "submission.delta", (delta) => {
+      setSubmissions((prev) => applySubmissionDelta(prev, delta, tasksRef.current));
+    });
+
+    return () => {
+      stop();
+      socket.off("connect", subscribe);
+      unsubscribeRoom(socket, room);
+      socket.disconnect();
+    };
+  }, [courseId, isCourseProfessor, user?.id]);
+
   const fetchCourse = async (cid: number) => {
     setLoading(true);
     try {
@@ -61,16 +93,11 @@ export default function CourseDetailsPage() {
     }
   };
 
-  const fetchAllSubmissions = async () => {
+  // sva rešenja kursa jednim zahtevom; posle toga stižu samo delta događaji
+  const fetchAllSubmissions = async (cid: number) => {
     try {
-      const allSubs: TaskSubmission[] = [];
-      for (const task of tasks) {
-        if (typeof task.id !== "undefined" && task.id !== null) {
-          const res = await http.get(endpoints.tasks.submissions(task.id));
-          if (Array.isArray(res.data)) allSubs.push(...res.data);
-        }
-      }
-      setSubmissions(allSubs);
+      const res = await http.get(endpoints.courses.allSubmissions(cid));
+      setSubmissions(res.data ?? []);
     } catch (err) {
       console.error("fetchAllSubmissions error:", err);
       setSubmissions([]);
@@ -176,12 +203,12 @@ export default function CourseDetailsPage() {
     }
 
     try {
-      await http.post(endpoints.tasks.grade(submissionId), {
+      const res = await http.post(endpoints.tasks.grade(submissionId), {
         grade,
         comment,
       });
       alert("Ocena postavljena ✅");
-      await fetchAllSubmissions();
+      setSubmissions((prev) => prev.map((s) => (s.id === submissionId ? res.data : s)));
     } catch (err: any) {
       alert(err?.response?.data?.error ?? "Greška pri ocenjivanju.");
     }
@@ -237,7 +264,7 @@ export default function CourseDetailsPage() {
                 </a>
               ) : (
                 <a
-                  href={course.materialPath}
+                  href={`${http.defaults.baseURL}${course.materialPath}`}
                   target="_blank"
                   rel="noopener noreferrer"
                   style={{ color: "#9a7556", textDecoration: "underline" }}
@@ -499,4 +526,34 @@ export default function CourseDetailsPage() {
       </div>
     </div>
   );
-}
\ No newline at end of file
+}
+
+function applySubmissionDelta(prev: TaskSubmission[], delta: SubmissionDelta, tasks: Task[]): TaskSubmission[] {
+  const existing = prev.find((s) => s.id === delta.submissionId);
+  const changes = {
+    grade: delta.grade,
+    submittedAt: delta.submittedAt,
+    gradedAt: delta.gradedAt,
+  };
+
+  if (existing) {
+    // ponovna predaja briše ocenu i komentar; komentar nije deo delte pa se čuva kod ocene
+    const comment = delta.action === "resubmitted" ? null : existing.comment;
+    const updated = prev.map((s) => (s.id === delta.submissionId ? { ...s, ...changes, comment } : s));
+    return delta.action === "graded"
+      ? updated
+      : [updated.find((s) => s.id === delta.submissionId)!, ...updated.filter((s) => s.id !== delta.submissionId)];
+  }
+
+  const created: TaskSubmission = {
+    id: delta.submissionId,
+    taskId: delta.taskId,
+    taskTitle: tasks.find((t) => t.id === delta.taskId)?.title ?? "",
+    studentId: delta.studentId,
+    studentName: delta.studentName,
+    filePath: `/api/tasks/${delta.taskId}/submissions/${delta.submissionId}/download`,
+    comment: null,
+    ...changes,
+  };
+  return [created, ...prev];
+}
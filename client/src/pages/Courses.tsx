@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import { http } from "../api/https";
+import { http, getAllPages } from "../api/https";
 import { endpoints } from "../api/endpoints";
 import type { Course } from "../types/courses";
 import { SearchBar } from "../components/SearchBar";
@@ -22,9 +22,7 @@ export default function CoursesPage() {
     setLoading(true);
     setError(null);
     try {
-      const res = await http.get("/api/courses/");
-      console.log("Fetched courses:", res.data); // ✅ DEBUG
-      setCourses(res.data);
+      setCourses(await getAllPages<Course>("/api/courses/"));
     } catch (err: any) {
       console.error("Error fetching courses:", err);
       setError(err?.response?.data?.error || "Greška pri učitavanju kurseva");
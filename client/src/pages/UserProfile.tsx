@@ -359,7 +359,7 @@ export default function UserProfile() {
                 height: 120,
                 borderRadius: "50%",
                 background: profileImage
-                  ? `url(${profileImage}) center/cover`
+                  ? `url(${profileImage.startsWith("data:") ? profileImage : `${http.defaults.baseURL}${profileImage}`}) center/cover`
                   : "linear-gradient(135deg, #d6bca3, #b99a7f)",
                 display: "flex",
                 alignItems: "center",
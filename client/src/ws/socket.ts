@@ -6,3 +6,42 @@ export function createSocket(serverUrl: string, userId: string, role: string): S
     query: { user_id: userId, role },
   });
 }
+
+type BatchedEvent = { event: string; data: unknown };
+
+// server šalje događaje spojene po sobi: "batch" -> { room, events: [{ event, data }] }
+export function onBatchedEvent<T>(socket: Socket, event: string, handler: (data: T) => void): () => void {
+  const listener = (frame: { room: string; events: BatchedEvent[] }) => {
+    for (const item of frame.events) {
+      if (item.event === event) handler(item.data as T);
+    }
+  };
+  socket.on("batch", listener);
+  return () => {
+    socket.off("batch", listener);
+  };
+}
+
+export type SubmissionDelta = {
+  action: "submitted" | "resubmitted" | "graded";
+  submissionId: number;
+  taskId: number;
+  courseId: number;
+  studentId: number;
+  studentName: string;
+  status: "SUBMITTED" | "GRADED";
+  grade: number | null;
+  fileSize: number | null;
+  submittedAt: string;
+  gradedAt: string | null;
+};
+
+// profesor prati predaje svog kursa ("course:<id>") ili zadatka ("task:<id>")
+export async function subscribeRoom(socket: Socket, room: string, sessionId: string): Promise<void> {
+  const ack = await socket.emitWithAck("subscribe", { room, sessionId });
+  if (!ack?.ok) throw new Error(ack?.error ?? "Subscribe failed");
+}
+
+export function unsubscribeRoom(socket: Socket, room: string): void {
+  socket.emit("unsubscribe", { room });
+}
@@ -1,16 +1,23 @@
 import os
 import uuid
-import json
 from functools import wraps
 from typing import Optional, Dict
 
 from flask import Blueprint, request, jsonify
-from passlib.hash import pbkdf2_sha256
 from sqlalchemy.orm import Session
 
 from app.models import User
 from app.redis_client import get_redis
+from app.fastjson import dumps, loads
 from app.database import SessionLocal
+from app.passwords import hash_password, verify_password, PasswordHasherBusy
+from app.rate_limit import (
+    rate_limit,
+    LOGIN_LIMIT_PER_IP,
+    LOGIN_LIMIT_PER_EMAIL,
+    REGISTER_LIMIT_PER_IP,
+    REGISTER_LIMIT_PER_EMAIL,
+)
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/api/auth")
 
@@ -29,7 +36,7 @@ def create_session(user_dict: Dict) -> str:
     redis.setex(
         f"session:{session_id}",
         SESSION_EXP_SECONDS,
-        json.dumps(session_data),
+        dumps(session_data),
     )
     return session_id
 
@@ -39,7 +46,7 @@ def get_session(session_id: str) -> Optional[Dict]:
     data = redis.get(f"session:{session_id}")
     if not data:
         return None
-    return json.loads(data)
+    return loads(data)
 
 
 def delete_session(session_id: str) -> None:
@@ -47,6 +54,11 @@ def delete_session(session_id: str) -> None:
     redis.delete(f"session:{session_id}")
 
 
+def busy_response():
+    """Odgovor kad je red za heširanje lozinki pun ili heširanje traje predugo"""
+    return jsonify({"error": "Server is busy, please try again"}), 503, {"Retry-After": "1"}
+
+
 def session_required(fn):
 
     @wraps(fn)
@@ -92,6 +104,7 @@ def role_required(*roles):
 
 
 @auth_bp.route("/register", methods=["POST"])
+@rate_limit("register", per_ip=REGISTER_LIMIT_PER_IP, per_email=REGISTER_LIMIT_PER_EMAIL)
 def register():
     """Javna registracija"""
     db: Session = SessionLocal()
@@ -119,7 +132,7 @@ def register():
                 {"error": "Password must be at least 6 characters"}
             ), 400
 
-        password_hash = pbkdf2_sha256.hash(password)
+        password_hash = hash_password(password)
 
         user = User(
             first_name=data["firstName"].strip(),
@@ -153,6 +166,9 @@ def register():
             }
         ), 201
 
+    except PasswordHasherBusy:
+        db.rollback()
+        return busy_response()
     except Exception as e:
         db.rollback()
         print(f"❌ Registration error: {e}")
@@ -164,6 +180,7 @@ def register():
 
 
 @auth_bp.route("/login", methods=["POST"])
+@rate_limit("login", per_ip=LOGIN_LIMIT_PER_IP, per_email=LOGIN_LIMIT_PER_EMAIL)
 def login():
     db: Session = SessionLocal()
     try:
@@ -183,10 +200,16 @@ def login():
             print(f"❌ User not found: {email}")
             return jsonify({"error": "Invalid credentials"}), 401
            
-        if not pbkdf2_sha256.verify(password, user.password_hash):
+        valid, new_hash = verify_password(password, user.password_hash)
+        if not valid:
             print(f"❌ Invalid password for: {email}")
             return jsonify({"error": "Invalid credentials"}), 401
 
+        # hash sa starim parametrima (npr. manje rundi) se zamenjuje novim
+        if new_hash:
+            user.password_hash = new_hash
+            db.commit()
+
         session_id = create_session(
             {
                 "id": user.id,
@@ -210,7 +233,10 @@ def login():
             }
         ), 200
 
+    except PasswordHasherBusy:
+        return busy_response()
     except Exception as e:
+        db.rollback()
         print(f"❌ Login error: {e}")
         return jsonify({"error": "Internal server error"}), 500
     finally:
@@ -0,0 +1,196 @@
+"""
+Content-addressed skladište fajlova (predaje, materijali, slike profila).
+
+Sadržaj se adresira SHA-256 heš vrednošću i čuva u backendu (podrazumevano
+lokalni fajl sistem), a u bazi ostaje samo kratka referenca oblika
+"blob:<mime>;sha256,<hex>" - po uzoru na data URL koji zamenjuje.
+"""
+
+import os
+import re
+import base64
+import hashlib
+import binascii
+import mimetypes
+import tempfile
+from io import BytesIO
+from typing import BinaryIO, Callable, Dict, Optional, Tuple
+
+from app.signed_urls import sign_path
+
+BLOB_REF_PREFIX = "blob:"
+DATA_URL_PREFIX = "data:"
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class BlobError(ValueError):
+    pass
+
+
+class BlobStore:
+    """Interfejs backend-a; implementacije rade samo sa digest-om"""
+
+    def put(self, data: bytes) -> str:
+        raise NotImplementedError
+
+    def open(self, digest: str) -> BinaryIO:
+        raise NotImplementedError
+
+    def exists(self, digest: str) -> bool:
+        raise NotImplementedError
+
+    def size(self, digest: str) -> int:
+        raise NotImplementedError
+
+    def delete(self, digest: str) -> None:
+        raise NotImplementedError
+
+
+class LocalBlobStore(BlobStore):
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, digest: str) -> str:
+        if not _DIGEST_RE.match(digest or ""):
+            raise BlobError("Invalid blob digest")
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if os.path.exists(path):
+            return digest
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # upis u privremeni fajl pa atomski rename - nema polu-upisanih blobova
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return digest
+
+    def open(self, digest: str) -> BinaryIO:
+        try:
+            return open(self._path(digest), "rb")
+        except FileNotFoundError:
+            raise BlobError("Blob not found")
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def size(self, digest: str) -> int:
+        return os.path.getsize(self._path(digest))
+
+    def delete(self, digest: str) -> None:
+        try:
+            os.remove(self._path(digest))
+        except FileNotFoundError:
+            pass
+
+
+BACKENDS: Dict[str, Callable[[], BlobStore]] = {
+    "local": lambda: LocalBlobStore(os.getenv("BLOB_STORE_DIR", "blobs")),
+}
+
+_blob_store: Optional[BlobStore] = None
+
+
+def register_backend(name: str, factory: Callable[[], BlobStore]) -> None:
+    BACKENDS[name] = factory
+
+
+def get_blob_store() -> BlobStore:
+    global _blob_store
+    if _blob_store is None:
+        backend = os.getenv("BLOB_STORE_BACKEND", "local")
+        if backend not in BACKENDS:
+            raise RuntimeError(f"Unknown blob store backend: {backend}")
+        _blob_store = BACKENDS[backend]()
+    return _blob_store
+
+
+def make_ref(mime: str, digest: str) -> str:
+    return f"{BLOB_REF_PREFIX}{mime};sha256,{digest}"
+
+
+def is_blob_ref(value: Optional[str]) -> bool:
+    return bool(value) and value.startswith(BLOB_REF_PREFIX)
+
+
+def is_data_url(value: Optional[str]) -> bool:
+    return bool(value) and value.startswith(DATA_URL_PREFIX)
+
+
+def parse_ref(ref: str) -> Tuple[str, str]:
+    """Vraća (mime, digest)"""
+    try:
+        mime, digest = ref[len(BLOB_REF_PREFIX):].split(";sha256,", 1)
+    except ValueError:
+        raise BlobError("Invalid blob reference")
+    return mime, digest
+
+
+def parse_data_url(data_url: str) -> Tuple[str, bytes]:
+    """Vraća (mime, sadržaj) iz "data:<mime>;base64,<payload>" """
+    try:
+        header, payload = data_url[len(DATA_URL_PREFIX):].split(",", 1)
+    except ValueError:
+        raise BlobError("Invalid data URL")
+
+    if not header.endswith(";base64"):
+        raise BlobError("Data URL must be base64 encoded")
+
+    try:
+        data = base64.b64decode(payload, validate=True)
+    except (binascii.Error, ValueError):
+        raise BlobError("Invalid base64 payload")
+
+    mime = header[: -len(";base64")] or "application/octet-stream"
+    return mime, data
+
+
+def store_data_url(data_url: str) -> Tuple[str, int]:
+    """Upisuje sadržaj i vraća (referenca, veličina u bajtovima)"""
+    mime, data = parse_data_url(data_url)
+    digest = get_blob_store().put(data)
+    return make_ref(mime, digest), len(data)
+
+
+def value_size(value: str) -> int:
+    if is_blob_ref(value):
+        _, digest = parse_ref(value)
+        return get_blob_store().size(digest)
+    return len(parse_data_url(value)[1])
+
+
+def open_value(value: str) -> Tuple[BinaryIO, str]:
+    """Otvara sadržaj kolone bilo da je referenca ili (nemigrirani) data URL"""
+    if is_blob_ref(value):
+        mime, digest = parse_ref(value)
+        return get_blob_store().open(digest), mime
+
+    if is_data_url(value):
+        mime, data = parse_data_url(value)
+        return BytesIO(data), mime
+
+    raise BlobError("Value is not stored content")
+
+
+def blob_url(value: Optional[str]) -> Optional[str]:
+    """Potpisan URL za referencu (app.signed_urls); nemigrirani data URL se vraća kakav jeste"""
+    if not value or not is_blob_ref(value):
+        return value
+
+    mime, digest = parse_ref(value)
+    ext = mimetypes.guess_extension(mime) or ""
+    return sign_path(f"/api/blobs/{digest}{ext}")
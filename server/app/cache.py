@@ -0,0 +1,104 @@
+"""
+Verzionisani read-through keš u Redis-u.
+
+Ključ sadrži trenutnu verziju namespace-a. Mutacija posle commit-a samo
+poveća verziju (INCR), pa stari ključevi postaju nedostižni i ističu po TTL-u.
+Ako Redis nije dostupan, keš se preskače i čita se direktno iz baze.
+"""
+
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from app.redis_client import get_redis
+from app.fastjson import dumps, loads
+from app.metrics import register_metrics
+
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "300"))
+
+COURSES_CACHE = "courses"
+# namespace-i samo sa verzijom (bez keširanih vrednosti) - koristi ih app.etag
+TASKS_CACHE = "tasks:course:{course_id}"
+USER_CACHE = "users:{user_id}"
+
+
+def _version_key(namespace: str) -> str:
+    return f"cache:{namespace}:version"
+
+
+def _stats_key(namespace: str) -> str:
+    return f"cache:{namespace}:stats"
+
+
+def get_version(namespace: str) -> int:
+    return int(get_redis().get(_version_key(namespace)) or 0)
+
+
+def get_versions(namespaces: List[str]) -> List[int]:
+    """Verzije više namespace-a jednim MGET-om"""
+    values = get_redis().mget([_version_key(namespace) for namespace in namespaces])
+    return [int(value or 0) for value in values]
+
+
+def bump(namespace: str) -> None:
+    """Poziva se posle commit-a svake mutacije koja menja keširane podatke"""
+    try:
+        get_redis().incr(_version_key(namespace))
+    except Exception as e:
+        print(f"⚠️ Cache invalidation failed for '{namespace}': {e}")
+
+
+def read_through(
+    namespace: str,
+    key: str,
+    loader: Callable[[], Optional[Any]],
+    ttl: int = CACHE_TTL_SECONDS,
+) -> Optional[Any]:
+    """Vraća keširanu vrednost ili poziva loader; None se ne kešira"""
+    try:
+        redis = get_redis()
+        cache_key = f"cache:{namespace}:v{get_version(namespace)}:{key}"
+        cached = redis.get(cache_key)
+    except Exception as e:
+        print(f"⚠️ Cache unavailable: {e}")
+        return loader()
+
+    if cached is not None:
+        try:
+            redis.hincrby(_stats_key(namespace), "hits", 1)
+        except Exception as e:
+            print(f"⚠️ Cache stats write failed for '{namespace}': {e}")
+        return loads(cached)
+
+    value = loader()
+
+    # vrednost je već učitana - greška pri upisu u keš ne sme da obori zahtev
+    try:
+        pipe = redis.pipeline(transaction=False)
+        pipe.hincrby(_stats_key(namespace), "misses", 1)
+        pipe.sadd("cache:namespaces", namespace)
+        if value is not None:
+            pipe.setex(cache_key, ttl, dumps(value))
+        pipe.execute()
+    except Exception as e:
+        print(f"⚠️ Cache write failed for '{namespace}': {e}")
+
+    return value
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    redis = get_redis()
+    stats = {}
+    for namespace in sorted(redis.smembers("cache:namespaces")):
+        raw = redis.hgetall(_stats_key(namespace))
+        hits = int(raw.get("hits", 0))
+        misses = int(raw.get("misses", 0))
+        stats[namespace] = {
+            "hits": hits,
+            "misses": misses,
+            "hitRatio": round(hits / (hits + misses), 4) if hits + misses else None,
+            "version": get_version(namespace),
+        }
+    return stats
+
+
+register_metrics("cache", cache_stats)
@@ -0,0 +1,182 @@
+"""
+Kompresija odgovora (gzip, brotli ako je paket instaliran) prema Accept-Encoding.
+
+- obični odgovori se kompresuju samo ako su veći od COMPRESS_MIN_BYTES
+- generator odgovori (stream_with_context, npr. izvoz izveštaja) se
+  kompresuju u hodu, bez učitavanja celog tela u memoriju
+- već kompresovani tipovi (slike, arhive, PDF, binarni fajlovi) i fajlovi
+  iz send_file (direct_passthrough, podržavaju Range) se ne diraju
+- kompresovani odgovor dobija ETag sa sufiksom kodiranja (npr. "abc-gzip")
+"""
+
+import os
+import zlib
+import threading
+from typing import Dict, Iterable, Iterator, Optional
+
+from flask import Flask, request
+
+from app.metrics import register_metrics
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+# dinamički odgovori - visoki nivoi brotli-ja su prespori
+COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+
+ENCODINGS = ("br", "gzip")
+
+SKIP_TYPE_PREFIXES = ("image/", "audio/", "video/", "font/woff")
+SKIP_TYPES = {
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-bzip2",
+    "application/x-xz",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/pdf",
+    "application/octet-stream",
+}
+# svg je tekst i dobro se kompresuje
+COMPRESSIBLE_EXCEPTIONS = {"image/svg+xml"}
+
+_stats = {encoding: {"responses": 0, "streamed": 0, "bytesIn": 0, "bytesOut": 0} for encoding in ENCODINGS}
+_stats_lock = threading.Lock()
+
+
+def _record(encoding: str, bytes_in: int, bytes_out: int, streamed: bool = False) -> None:
+    with _stats_lock:
+        stats = _stats[encoding]
+        stats["responses"] += 1
+        stats["streamed"] += int(streamed)
+        stats["bytesIn"] += bytes_in
+        stats["bytesOut"] += bytes_out
+
+
+def compression_stats() -> Dict:
+    with _stats_lock:
+        return {
+            encoding: {
+                **stats,
+                "ratio": round(stats["bytesOut"] / stats["bytesIn"], 4) if stats["bytesIn"] else None,
+            }
+            for encoding, stats in _stats.items()
+        }
+
+
+def is_compressible(mimetype: Optional[str]) -> bool:
+    if not mimetype:
+        return False
+    if mimetype in COMPRESSIBLE_EXCEPTIONS:
+        return True
+    return mimetype not in SKIP_TYPES and not mimetype.startswith(SKIP_TYPE_PREFIXES)
+
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """br ako ga klijent prihvata bar koliko i gzip i paket je dostupan, inače gzip"""
+    gzip_q = accept_encodings["gzip"]
+    br_q = accept_encodings["br"] if brotli is not None else 0
+    if br_q > 0 and br_q >= gzip_q:
+        return "br"
+    if gzip_q > 0:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._obj = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+            self.compress = self._obj.process
+            self.flush = self._obj.finish
+        else:
+            # wbits=31 -> gzip zaglavlje
+            self._obj = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 31)
+            self.compress = self._obj.compress
+            self.flush = self._obj.flush
+
+
+def compress_bytes(data: bytes, encoding: str) -> bytes:
+    compressor = _Compressor(encoding)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable, encoding: str) -> Iterator[bytes]:
+    compressor = _Compressor(encoding)
+    bytes_in = bytes_out = 0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            bytes_in += len(chunk)
+            out = compressor.compress(chunk)
+            if out:
+                bytes_out += len(out)
+                yield out
+        out = compressor.flush()
+        bytes_out += len(out)
+        yield out
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+        _record(encoding, bytes_in, bytes_out, streamed=True)
+
+
+def _suffix_etag(response, encoding: str) -> None:
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak=weak)
+
+
+def compress_response(response):
+    if response.status_code == 304:
+        # 304 mora da nosi isti Vary kao odgovor koji potvrđuje
+        response.vary.add("Accept-Encoding")
+        return response
+
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 206)
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or not is_compressible(response.mimetype)
+    ):
+        return response
+
+    # telo zavisi od Accept-Encoding čak i kad se ovaj put ne kompresuje
+    response.vary.add("Accept-Encoding")
+
+    if request.method == "HEAD":
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+        compressed = compress_bytes(data, encoding)
+        _record(encoding, len(data), len(compressed))
+        response.set_data(compressed)
+
+    response.headers["Content-Encoding"] = encoding
+    _suffix_etag(response, encoding)
+    return response
+
+
+def init_compression(app: Flask) -> None:
+    app.after_request(compress_response)
+
+
+register_metrics("compression", compression_stats)
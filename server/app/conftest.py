@@ -0,0 +1,150 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def engine():
+    pytest.importorskip("flask")
+    pytest.importorskip("sqlalchemy")
+    try:
+        from app.database import engine as db_engine
+        with db_engine.connect():
+            pass
+    except Exception as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    from app.migrations import migrate
+    migrate(db_engine)
+    return db_engine
+
+
+@pytest.fixture(scope="session")
+def redis_ready():
+    from app.redis_client import init_redis
+    try:
+        init_redis()
+    except Exception as e:
+        pytest.skip(f"Redis not available: {e}")
+
+
+@pytest.fixture
+def db(engine):
+    # posebna sesija, ne SessionLocal - rute se izvršavaju u niti testa, pa bi
+    # njihov db.close() zatvorio i sesiju testa
+    from sqlalchemy.orm import Session
+    session = Session(bind=engine)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(engine, redis_ready):
+    from flask import Flask
+    from routes.courses import courses_bp
+    from app.routes.tasks import tasks_bp
+
+    from app.json_provider import FastJSONProvider
+
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.config["TESTING"] = True
+    app.register_blueprint(courses_bp)
+    app.register_blueprint(tasks_bp)
+    return app.test_client()
+
+
+def session_headers(user):
+    from app.auth import create_session
+    session_id = create_session({"id": user.id, "email": user.email, "role": user.role})
+    return {"X-Session-ID": session_id}
+
+
+@pytest.fixture
+def seeded(db):
+    """Profesor sa kursom, N studenata, upisima, zadacima i predajama"""
+    from app.models import User, Course, CourseEnrollment, Task, TaskSubmission
+    from app.course_stats import rebuild as rebuild_course_stats
+
+    tag = uuid.uuid4().hex[:8]
+    students_count = 25
+
+    professor = User(
+        first_name="Prof", last_name=tag, email=f"prof-{tag}@test.com",
+        role="PROFESOR", password_hash="x",
+    )
+    students = [
+        User(
+            first_name="Student", last_name=f"{tag}-{i}", email=f"student-{tag}-{i}@test.com",
+            role="STUDENT", password_hash="x",
+        )
+        for i in range(students_count)
+    ]
+    db.add(professor)
+    db.add_all(students)
+    db.flush()
+
+    courses = [
+        Course(professor_id=professor.id, name=f"Kurs {tag}-{i}", description="test")
+        for i in range(3)
+    ]
+    db.add_all(courses)
+    db.flush()
+
+    course = courses[0]
+    tasks = [
+        Task(
+            course_id=course.id, title=f"Zadatak {i}", description="test",
+            deadline=datetime.utcnow() + timedelta(days=7),
+        )
+        for i in range(3)
+    ]
+    db.add_all(tasks)
+    db.flush()
+
+    for student in students:
+        for c in courses:
+            db.add(CourseEnrollment(course_id=c.id, student_id=student.id))
+        for task in tasks:
+            db.add(TaskSubmission(task_id=task.id, student_id=student.id, file_path="data:text/x-python;base64,"))
+    db.flush()
+    rebuild_course_stats(db, [c.id for c in courses])
+    db.commit()
+
+    yield {
+        "professor": professor,
+        "student": students[0],
+        "course": course,
+        "task": tasks[0],
+    }
+
+    db.query(User).filter(User.id.in_([professor.id] + [s.id for s in students])).delete(
+        synchronize_session=False
+    )
+    db.commit()
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        from sqlalchemy import event
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+@pytest.fixture
+def count_queries(engine):
+    return lambda: QueryCounter(engine)
@@ -0,0 +1,131 @@
+"""
+Inkrementalno održavana statistika po kursu (tabela course_stats).
+
+Upisi (upis na kurs, novi zadatak, predaja, ocena) pozivaju record() u
+istoj transakciji kao i promena - jedan upsert koji uvećava brojače. Čitanje
+je po primarnom ključu, bez brojanja redova. rebuild() ponovo računa
+brojače iz izvornih tabela kad dođe do odstupanja (server/rebuild_course_stats.py).
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import Course, CourseStats, CourseEnrollment, Task, TaskSubmission
+
+COUNTERS = {
+    "enrollments": "enrollment_count",
+    "tasks": "task_count",
+    "submissions": "submission_count",
+    "graded": "graded_count",
+    "grade_sum": "grade_sum",
+}
+
+
+def record(db: Session, course_id: int, **deltas: int) -> None:
+    """
+    Uvećava brojače kursa, npr. record(db, 5, enrollments=1); commit radi
+    pozivalac. Ključevi su iz COUNTERS, vrednosti mogu biti i negativne.
+    """
+    values = {}
+    for name, delta in deltas.items():
+        if name not in COUNTERS:
+            raise ValueError(f"Unknown course stats counter: {name}")
+        if delta:
+            values[COUNTERS[name]] = delta
+    if not values:
+        return
+
+    now = datetime.utcnow()
+    stmt = insert(CourseStats).values(course_id=course_id, updated_at=now, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CourseStats.course_id],
+        set_={
+            **{column: getattr(CourseStats, column) + stmt.excluded[column] for column in values},
+            "updated_at": now,
+        },
+    )
+    db.execute(stmt)
+
+
+def _empty(course_id: int) -> Dict:
+    return {
+        "courseId": course_id,
+        "enrollmentCount": 0,
+        "taskCount": 0,
+        "submissionCount": 0,
+        "gradedCount": 0,
+        "averageGrade": None,
+        "updatedAt": None,
+    }
+
+
+def get_stats(db: Session, course_ids: Iterable[int]) -> Dict[int, Dict]:
+    """Statistika za date kurseve u jednom upitu po primarnom ključu"""
+    course_ids = list(course_ids)
+    stats = {course_id: _empty(course_id) for course_id in course_ids}
+    if course_ids:
+        for row in db.query(CourseStats).filter(CourseStats.course_id.in_(course_ids)):
+            stats[row.course_id] = row.to_dict()
+    return stats
+
+
+def rebuild(db: Session, course_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Prepisuje brojače vrednostima izračunatim iz izvornih tabela; commit radi
+    pozivalac. Radi i sa Connection umesto Session (migracije).
+    """
+    enrollments = (
+        select(CourseEnrollment.course_id, func.count().label("n"))
+        .group_by(CourseEnrollment.course_id)
+        .subquery()
+    )
+    tasks = (
+        select(Task.course_id, func.count().label("n"))
+        .group_by(Task.course_id)
+        .subquery()
+    )
+    submissions = (
+        select(
+            Task.course_id,
+            func.count(TaskSubmission.id).label("n"),
+            func.count(TaskSubmission.grade).label("graded"),
+            func.sum(TaskSubmission.grade).label("grade_sum"),
+        )
+        .select_from(TaskSubmission)
+        .join(Task, Task.id == TaskSubmission.task_id)
+        .group_by(Task.course_id)
+        .subquery()
+    )
+
+    now = datetime.utcnow()
+    source = (
+        select(
+            Course.id,
+            func.coalesce(enrollments.c.n, 0),
+            func.coalesce(tasks.c.n, 0),
+            func.coalesce(submissions.c.n, 0),
+            func.coalesce(submissions.c.graded, 0),
+            func.coalesce(submissions.c.grade_sum, 0),
+            literal(now, CourseStats.updated_at.type),
+        )
+        .outerjoin(enrollments, enrollments.c.course_id == Course.id)
+        .outerjoin(tasks, tasks.c.course_id == Course.id)
+        .outerjoin(submissions, submissions.c.course_id == Course.id)
+    )
+    if course_ids is not None:
+        course_ids = list(course_ids)
+        if not course_ids:
+            return 0
+        source = source.where(Course.id.in_(course_ids))
+
+    columns = ["course_id", *COUNTERS.values(), "updated_at"]
+    stmt = insert(CourseStats).from_select(columns, source)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CourseStats.course_id],
+        set_={column: stmt.excluded[column] for column in columns[1:]},
+    )
+    return db.execute(stmt).rowcount
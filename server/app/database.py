@@ -35,9 +35,11 @@ SessionLocal = scoped_session(
 
 
 def init_db():
-    print("🔧 Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created successfully!")
+    from app.migrations import migrate
+
+    print("🔧 Applying database migrations...")
+    applied = migrate(engine)
+    print(f"✅ Database schema up to date ({len(applied)} migration(s) applied)")
 
 
 def get_db():
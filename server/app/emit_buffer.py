@@ -0,0 +1,108 @@
+"""
+Spajanje Socket.IO događaja po sobi u jedan frame.
+
+Događaji za istu sobu se skupljaju WINDOW sekundi od prvog događaja i šalju
+kao jedan "batch" frame: {"room": ..., "events": [{"event": ..., "data": ...}]}.
+Kad se skupi max_batch događaja frame se šalje odmah, bez čekanja na prozor.
+Redosled događaja u sobi je očuvan.
+"""
+
+import os
+import time
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+EMIT_BUFFER_WINDOW_MS = int(os.getenv("EMIT_BUFFER_WINDOW_MS", "100"))
+EMIT_BUFFER_MAX_BATCH = int(os.getenv("EMIT_BUFFER_MAX_BATCH", "50"))
+
+BATCH_EVENT = "batch"
+
+
+def _spawn_thread(fn, *args):
+    thread = threading.Thread(target=fn, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+class EmitBuffer:
+    def __init__(
+        self,
+        emit: Callable[..., Any],
+        window_seconds: float = EMIT_BUFFER_WINDOW_MS / 1000,
+        max_batch: int = EMIT_BUFFER_MAX_BATCH,
+        spawn: Callable[..., Any] = _spawn_thread,
+        sleep: Callable[[float], Any] = time.sleep,
+    ):
+        """
+        emit(event, data, room=...) šalje frame; spawn/sleep se zamenjuju sa
+        socketio.start_background_task/socketio.sleep da bi radilo u svakom
+        async modu (threading, gevent, eventlet).
+        """
+        self.emit = emit
+        self.window_seconds = window_seconds
+        self.max_batch = max(1, max_batch)
+        self.spawn = spawn
+        self.sleep = sleep
+        self._pending: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._scheduled = set()
+        self._lock = threading.Lock()
+        self.events = 0
+        self.frames = 0
+        self.largest_frame = 0
+        self.errors = 0
+
+    def add(self, event: str, data: Any, room: str) -> None:
+        with self._lock:
+            self.events += 1
+            pending = self._pending[room]
+            pending.append({"event": event, "data": data})
+            full = len(pending) >= self.max_batch or self.window_seconds <= 0
+            schedule = not full and room not in self._scheduled
+            if schedule:
+                self._scheduled.add(room)
+
+        if full:
+            self.flush(room)
+        elif schedule:
+            self.spawn(self._flush_later, room)
+
+    def _flush_later(self, room: str) -> None:
+        self.sleep(self.window_seconds)
+        with self._lock:
+            self._scheduled.discard(room)
+        self.flush(room)
+
+    def flush(self, room: str) -> None:
+        with self._lock:
+            events = self._pending.pop(room, None)
+            if not events:
+                return
+            self.frames += 1
+            self.largest_frame = max(self.largest_frame, len(events))
+
+        try:
+            self.emit(BATCH_EVENT, {"room": room, "events": events}, room=room)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            print(f"⚠️ Batched emit to '{room}' failed ({len(events)} events): {e}")
+
+    def flush_all(self) -> None:
+        with self._lock:
+            rooms = list(self._pending)
+        for room in rooms:
+            self.flush(room)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            return {
+                "windowMs": round(self.window_seconds * 1000),
+                "maxBatch": self.max_batch,
+                "events": self.events,
+                "frames": self.frames,
+                "eventsPerFrame": round(self.events / self.frames, 2) if self.frames else None,
+                "largestFrame": self.largest_frame,
+                "pending": sum(len(events) for events in self._pending.values()),
+                "errors": self.errors,
+            }
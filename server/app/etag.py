@@ -0,0 +1,77 @@
+"""
+Jaki ETag-ovi i uslovni GET za rute koje se često ponovo učitavaju.
+
+ETag se računa samo iz verzija namespace-a iz app.cache (jedan MGET u
+Redis-u) i putanje zahteva, bez upita na bazu. Ako klijent pošalje isti
+If-None-Match, ruta se ne izvršava i vraća se 304 bez tela. Mutacije
+posle commit-a pozivaju bump() za namespace koji menjaju.
+
+Verzije se čitaju pre izvršavanja rute: ako se podaci promene u
+međuvremenu, odgovor nosi stariji ETag i sledeći zahtev dobija novo telo.
+"""
+
+import hashlib
+from functools import wraps
+from typing import List, Optional
+
+from flask import request, make_response
+
+from app.cache import get_versions
+from app.compression import ENCODINGS
+from app.signed_urls import current_window
+
+
+def compute_etag(namespaces: List[str], scope: str) -> Optional[str]:
+    """None ako verzije nisu dostupne (Redis) - tada se ETag ne šalje"""
+    try:
+        versions = get_versions(namespaces)
+    except Exception as e:
+        print(f"⚠️ ETag versions unavailable: {e}")
+        return None
+
+    stamp = "|".join(f"{ns}={v}" for ns, v in zip(namespaces, versions))
+    return hashlib.sha1(f"{scope}|{stamp}".encode()).hexdigest()
+
+
+def _matching_tag(etag: str) -> Optional[str]:
+    """Klijent vraća ETag kompresovane verzije (app.compression dodaje sufiks)"""
+    for candidate in (etag, *(f"{etag}-{encoding}" for encoding in ENCODINGS)):
+        if request.if_none_match.contains(candidate):
+            return candidate
+    return None
+
+
+def conditional(*namespaces: str):
+    """
+    Dekorator za GET rute, ispod @session_required. Namespace-i mogu da
+    koriste argumente rute i {user_id} iz sesije, npr. TASKS_CACHE.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            user = getattr(request, "user", None) or {}
+            names = [ns.format(user_id=user.get("user_id"), **kwargs) for ns in namespaces]
+            # telo nosi potpisane URL-ove (app.signed_urls) - novi prozor menja
+            # ETag dok URL-ovi iz prethodnog tela još važe
+            etag = compute_etag(names, f"{request.full_path}|{current_window()}")
+            if etag is None:
+                return fn(*args, **kwargs)
+
+            matched = _matching_tag(etag)
+            if matched:
+                response = make_response("", 304)
+                response.set_etag(matched)
+            else:
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                response.set_etag(etag)
+
+            # odgovor zavisi od sesije - deljeni keševi ne smeju da ga čuvaju
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+
+        return wrapper
+
+    return decorator
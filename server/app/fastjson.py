@@ -0,0 +1,65 @@
+"""
+Brza JSON serijalizacija (orjson) za odgovore, Socket.IO pakete i JSON u Redis-u.
+
+orjson nativno serijalizuje datetime/date u ISO 8601 (isto kao .isoformat()),
+pa to_dict metode modela vraćaju datetime objekte. Ako orjson nije instaliran,
+koristi se stdlib json sa istim izlazom.
+"""
+
+import json
+import uuid
+import dataclasses
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# int ključevi (npr. statistika po id-u kursa) postaju stringovi kao u stdlib json-u
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def _default(value: Any) -> Any:
+    """Tipovi koje orjson ne pokriva (i svi ovi za stdlib); Decimal kao string kao u Flask-u"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+    return dumps(obj).encode()
+
+
+def dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode()
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(data) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class SocketIOJSON:
+    """Zamena za json modul u Flask-SocketIO (SocketIO(json=...)); dodatni argumenti se ignorišu"""
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs) -> str:
+        return dumps(obj)
+
+    @staticmethod
+    def loads(data, *args, **kwargs):
+        return loads(data)
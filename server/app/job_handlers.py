@@ -0,0 +1,140 @@
+"""
+Handleri za poslove iz app.jobs; izvršava ih app.job_worker.
+"""
+
+from concurrent.futures import wait, FIRST_COMPLETED
+from datetime import datetime
+from typing import Any, Dict
+
+from app.jobs import (
+    job_handler, update_progress, take_secret, save_checkpoint, get_checkpoint, JOB_HEARTBEAT_SECONDS,
+)
+from app.database import SessionLocal
+from app.models import User, CourseEnrollment
+from app.outbox import enqueue_emails
+from app.process_handler import process_manager, report_partition_worker
+from app.report_engine import plan_partitions, merge_report
+from app.user_import import run_import
+
+EMAIL_BATCH_SIZE = 500
+
+
+@job_handler("report")
+def run_report(job_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Izveštaj se deli na particije po id-jevima i računa paralelno u pool-u"""
+    report_type = params["type"]
+    pool = process_manager.pool
+
+    db = SessionLocal()
+    try:
+        partitions = plan_partitions(db, report_type, pool.size)
+    finally:
+        db.close()
+
+    update_progress(job_id, 5, f"Computing {len(partitions)} partition(s)")
+    futures = [
+        pool.submit(report_partition_worker, report_type, lo, hi)
+        for lo, hi in partitions
+    ]
+
+    # čeka se sa timeout-om da bi heartbeat išao i dok jedna particija dugo radi -
+    # inače bi je requeue_stale vratio u red iako se još izvršava
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=JOB_HEARTBEAT_SECONDS, return_when=FIRST_COMPLETED)
+        for future in done:
+            future.result()
+        computed = len(futures) - len(pending)
+        update_progress(
+            job_id,
+            5 + computed * 90 // len(futures),
+            f"Computed {computed}/{len(futures)} partition(s)",
+        )
+
+    partials = [future.result() for future in futures]
+
+    return {
+        "type": report_type,
+        "format": params.get("format", "json"),
+        "requested_by": params.get("requested_by"),
+        "generated_at": datetime.utcnow().isoformat(),
+        "partitions": len(partitions),
+        "data": merge_report(report_type, partials),
+        "status": "completed",
+    }
+
+
+@job_handler("user_import")
+def run_user_import(job_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Uvoz korisnika; sadržaj sa lozinkama se briše iz Redis-a čim se preuzme"""
+    secret = take_secret(job_id)
+    if not secret:
+        raise ValueError("Import content is no longer available, upload the file again")
+
+    def progress(done, total):
+        update_progress(job_id, done * 100 // max(total, 1), f"Imported {done}/{total} rows")
+
+    return run_import(secret["content"], params["format"], progress=progress)
+
+
+def recipient_query(db, params):
+    recipient_type = params["recipient_type"]
+
+    if recipient_type == "all_students":
+        return db.query(User.id, User.email).filter(User.role == "STUDENT")
+    if recipient_type == "all_professors":
+        return db.query(User.id, User.email).filter(User.role == "PROFESOR")
+    if recipient_type == "course_students":
+        return db.query(User.id, User.email).join(
+            CourseEnrollment, CourseEnrollment.student_id == User.id
+        ).filter(CourseEnrollment.course_id == params["course_id"])
+
+    raise ValueError(f"Unknown recipient_type: {recipient_type}")
+
+
+@job_handler("bulk_email")
+def run_bulk_email(job_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Primaoce čita u paketima i upisuje ih u email outbox.
+
+    Posle svakog paketa čuva se cursor (poslednji user id), pa ponovljen
+    posao nastavlja od njega. Paket upisan pre pada a posle poslednjeg
+    cursor-a se preskače po ključu (job_id, user_id) u outbox-u.
+    """
+    db = SessionLocal()
+    try:
+        query = recipient_query(db, params)
+        total = query.count()
+        checkpoint = get_checkpoint(job_id)
+        queued = checkpoint.get("queued", 0)
+        last_id = checkpoint.get("last_id", 0)
+        skipped = 0
+
+        while True:
+            batch = query.filter(User.id > last_id).order_by(User.id).limit(EMAIL_BATCH_SIZE).all()
+            if not batch:
+                break
+
+            inserted = enqueue_emails(db, (
+                {
+                    "to": email,
+                    "subject": params["subject"],
+                    "body": params["body"],
+                    "key": f"bulk:{job_id}:{user_id}",
+                }
+                for user_id, email in batch
+            ))
+            db.commit()
+
+            queued += len(batch)
+            skipped += len(batch) - inserted
+            last_id = batch[-1][0]
+            save_checkpoint(job_id, {"last_id": last_id, "queued": queued})
+            update_progress(job_id, queued * 100 // max(total, 1), f"Queued {queued}/{total} emails")
+
+        return {"recipient_count": queued, "duplicates_skipped": skipped}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,87 @@
+"""
+Job worker - izvršava poslove iz Redis reda (app.jobs).
+
+Pokretanje: python -m app.job_worker
+Može da radi proizvoljan broj worker-a na više hostova; svaki preuzima
+jedan po jedan posao, a CPU-intenzivan deo šalje u lokalni worker pool.
+"""
+
+import time
+import signal
+import traceback
+
+from app.redis_client import init_redis
+from app import jobs
+from app import job_handlers  # noqa: F401 - registruje handlere
+from app.socketio_app import emit_external
+
+REQUEUE_INTERVAL_SECONDS = 60
+
+_running = True
+
+
+def run_job(job_id: str) -> None:
+    job = jobs.get_job(job_id, include_params=True)
+    if job is None:
+        print(f"[JobWorker] Job {job_id} expired before it was picked up")
+        return
+
+    handler = jobs.HANDLERS.get(job["kind"])
+    if handler is None:
+        jobs.fail(job_id, f"No handler for job kind '{job['kind']}'")
+        return
+
+    print(f"[JobWorker] Running {job['kind']} job {job_id}")
+    jobs.mark_running(job_id)
+    try:
+        result = handler(job_id, job["params"])
+        jobs.complete(job_id, result)
+        print(f"[JobWorker] Job {job_id} completed")
+    except Exception as e:
+        traceback.print_exc()
+        jobs.fail(job_id, str(e))
+
+    # klijent dobija obaveštenje preko message queue-a, bez obzira na koji web proces je povezan
+    finished = jobs.get_job(job_id)
+    if finished is not None:
+        emit_external(f"job.{finished['status']}", {
+            "id": job_id,
+            "kind": finished["kind"],
+            "status": finished["status"],
+            "error": finished["error"],
+        }, room=f"user:{finished['userId']}")
+
+
+def _stop(signum, frame):
+    global _running
+    print("[JobWorker] Stopping after current job...")
+    _running = False
+
+
+def main():
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    init_redis()
+    print(f"[JobWorker] Started, handlers: {', '.join(sorted(jobs.HANDLERS))}")
+
+    last_requeue = 0.0
+    while _running:
+        if time.time() - last_requeue > REQUEUE_INTERVAL_SECONDS:
+            requeued = jobs.requeue_stale()
+            if requeued:
+                print(f"[JobWorker] Requeued {requeued} stale job(s)")
+            last_requeue = time.time()
+
+        job_id = jobs.claim(timeout=5)
+        if job_id is None:
+            continue
+
+        try:
+            run_job(job_id)
+        finally:
+            jobs.ack(job_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Distribuirani red poslova u Redis-u.
+
+Posao ima ID, vlasnika, status, progres i rezultat koji se čuvaju u hešu
+job:<id> sa TTL-om. ID-jevi čekaju u listi jobs:queue odakle ih preuzima
+bilo koji job worker (python -m app.job_worker) na bilo kom hostu.
+
+Osetljivi parametri (npr. lozinke iz uvoza korisnika) ne idu u heš posla
+nego u poseban ključ job:<id>:secret sa kratkim TTL-om koji handler briše
+pri preuzimanju. U Redis-u su najduže dok worker ne preuzme posao, a
+najviše JOB_SECRET_TTL_SECONDS - posao preuzet posle toga ne uspeva.
+"""
+
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from app.redis_client import get_redis
+from app.fastjson import dumps, loads
+
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", str(24 * 3600)))
+# posao u obradi bez heartbeat-a duže od ovoga se vraća u red (pao worker)
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "600"))
+# handler koji dugo čeka (npr. particije izveštaja) javlja heartbeat bar ovako često
+JOB_HEARTBEAT_SECONDS = int(os.getenv("JOB_HEARTBEAT_SECONDS", "30"))
+# koliko osetljivi parametri čekaju da worker preuzme posao
+JOB_SECRET_TTL_SECONDS = int(os.getenv("JOB_SECRET_TTL_SECONDS", "900"))
+
+QUEUE_KEY = "jobs:queue"
+PROCESSING_KEY = "jobs:processing"
+
+HANDLERS: Dict[str, Callable[[str, Dict[str, Any]], Any]] = {}
+
+# KEYS: jobs:processing, jobs:queue, job:<id>; ARGV: id posla, granica za heartbeat.
+# Posao se vraća u red samo ako ga je baš ovaj poziv skinuo iz jobs:processing,
+# pa dva worker-a koja istovremeno traže zaglavljene poslove ne dupliraju isti posao.
+REQUEUE_STALE_LUA = """
+local heartbeat = tonumber(redis.call('HGET', KEYS[3], 'heartbeatAt'))
+if heartbeat and heartbeat >= tonumber(ARGV[2]) then return 0 end
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) ~= 1 then return 0 end
+if redis.call('EXISTS', KEYS[3]) == 0 then return 0 end
+redis.call('HSET', KEYS[3], 'status', 'queued')
+redis.call('LPUSH', KEYS[2], ARGV[1])
+return 1
+"""
+
+_requeue_script = None
+_requeue_script_client = None
+
+
+def job_handler(kind: str):
+    """Registruje funkciju (job_id, params) -> rezultat za dati tip posla"""
+
+    def decorator(fn):
+        HANDLERS[kind] = fn
+        return fn
+
+    return decorator
+
+
+def _job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def _secret_key(job_id: str) -> str:
+    return f"job:{job_id}:secret"
+
+
+def _user_key(user_id) -> str:
+    return f"jobs:user:{user_id}"
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def enqueue(kind: str, params: Dict[str, Any], user_id, secret: Optional[Dict[str, Any]] = None) -> str:
+    job_id = uuid.uuid4().hex
+    redis = get_redis()
+
+    pipe = redis.pipeline()
+    pipe.hset(_job_key(job_id), mapping={
+        "id": job_id,
+        "kind": kind,
+        "status": "queued",
+        "progress": 0,
+        "userId": user_id,
+        "params": dumps(params),
+        "createdAt": _now(),
+        "heartbeatAt": time.time(),
+    })
+    pipe.expire(_job_key(job_id), JOB_TTL_SECONDS)
+    if secret is not None:
+        pipe.set(_secret_key(job_id), dumps(secret), ex=JOB_SECRET_TTL_SECONDS)
+    pipe.zadd(_user_key(user_id), {job_id: time.time()})
+    pipe.expire(_user_key(user_id), JOB_TTL_SECONDS)
+    pipe.lpush(QUEUE_KEY, job_id)
+    pipe.execute()
+
+    return job_id
+
+
+def _decode(raw: Dict[str, str], include_params: bool = False) -> Dict[str, Any]:
+    job = {
+        "id": raw["id"],
+        "kind": raw["kind"],
+        "status": raw["status"],
+        "progress": int(raw.get("progress", 0)),
+        "message": raw.get("message"),
+        "userId": int(raw["userId"]) if raw.get("userId", "").isdigit() else raw.get("userId"),
+        "createdAt": raw.get("createdAt"),
+        "startedAt": raw.get("startedAt"),
+        "finishedAt": raw.get("finishedAt"),
+        "error": raw.get("error"),
+        "result": loads(raw["result"]) if raw.get("result") else None,
+    }
+    if include_params:
+        job["params"] = loads(raw["params"]) if raw.get("params") else {}
+    return job
+
+
+def get_job(job_id: str, include_params: bool = False) -> Optional[Dict[str, Any]]:
+    raw = get_redis().hgetall(_job_key(job_id))
+    return _decode(raw, include_params) if raw else None
+
+
+def list_jobs(user_id, limit: int = 50) -> List[Dict[str, Any]]:
+    redis = get_redis()
+    job_ids = redis.zrevrange(_user_key(user_id), 0, limit - 1)
+
+    pipe = redis.pipeline(transaction=False)
+    for job_id in job_ids:
+        pipe.hgetall(_job_key(job_id))
+
+    jobs = []
+    expired = []
+    for job_id, raw in zip(job_ids, pipe.execute()):
+        if raw:
+            job = _decode(raw)
+            job.pop("result")
+            jobs.append(job)
+        else:
+            expired.append(job_id)
+
+    if expired:
+        redis.zrem(_user_key(user_id), *expired)
+    return jobs
+
+
+def take_secret(job_id: str) -> Optional[Dict[str, Any]]:
+    """Čita i briše osetljive parametre posla; None ako su istekli ili već preuzeti"""
+    pipe = get_redis().pipeline()
+    pipe.get(_secret_key(job_id))
+    pipe.delete(_secret_key(job_id))
+    raw, _ = pipe.execute()
+    return loads(raw) if raw else None
+
+
+def save_checkpoint(job_id: str, checkpoint: Dict[str, Any]) -> None:
+    """Dokle je posao stigao - ponovljen posao (requeue_stale) nastavlja odatle"""
+    get_redis().hset(_job_key(job_id), mapping={
+        "checkpoint": dumps(checkpoint),
+        "heartbeatAt": time.time(),
+    })
+
+
+def get_checkpoint(job_id: str) -> Dict[str, Any]:
+    raw = get_redis().hget(_job_key(job_id), "checkpoint")
+    return loads(raw) if raw else {}
+
+
+def update_progress(job_id: str, progress: int, message: Optional[str] = None) -> None:
+    mapping = {"progress": max(0, min(int(progress), 100)), "heartbeatAt": time.time()}
+    if message is not None:
+        mapping["message"] = message
+    get_redis().hset(_job_key(job_id), mapping=mapping)
+
+
+def mark_running(job_id: str) -> None:
+    get_redis().hset(_job_key(job_id), mapping={
+        "status": "running",
+        "startedAt": _now(),
+        "heartbeatAt": time.time(),
+    })
+
+
+def complete(job_id: str, result: Any) -> None:
+    get_redis().hset(_job_key(job_id), mapping={
+        "status": "completed",
+        "progress": 100,
+        "result": dumps(result),
+        "finishedAt": _now(),
+    })
+
+
+def fail(job_id: str, error: str) -> None:
+    get_redis().hset(_job_key(job_id), mapping={
+        "status": "failed",
+        "error": error,
+        "finishedAt": _now(),
+    })
+
+
+def claim(timeout: int = 5) -> Optional[str]:
+    """Blokirajuće preuzimanje; posao ostaje u jobs:processing do ack()"""
+    return get_redis().brpoplpush(QUEUE_KEY, PROCESSING_KEY, timeout=timeout)
+
+
+def ack(job_id: str) -> None:
+    get_redis().lrem(PROCESSING_KEY, 1, job_id)
+
+
+def _get_requeue_script():
+    global _requeue_script, _requeue_script_client
+    redis = get_redis()
+    if _requeue_script is None or _requeue_script_client is not redis:
+        _requeue_script = redis.register_script(REQUEUE_STALE_LUA)
+        _requeue_script_client = redis
+    return _requeue_script
+
+
+def requeue_stale() -> int:
+    """Vraća u red poslove bez heartbeat-a duže od JOB_STALE_SECONDS (pao worker)"""
+    redis = get_redis()
+    script = _get_requeue_script()
+    cutoff = time.time() - JOB_STALE_SECONDS
+    requeued = 0
+
+    for job_id in redis.lrange(PROCESSING_KEY, 0, -1):
+        requeued += script(keys=[PROCESSING_KEY, QUEUE_KEY, _job_key(job_id)], args=[job_id, cutoff])
+
+    return requeued
@@ -0,0 +1,24 @@
+"""
+Flask JSON provider nad app.fastjson (orjson ako je instaliran).
+
+Za razliku od podrazumevanog provider-a datumi se serijalizuju kao ISO 8601,
+a ključevi se ne sortiraju (redosled iz to_dict).
+"""
+
+from flask.json.provider import JSONProvider
+
+from app.fastjson import dumps, dumps_bytes, loads
+
+
+class FastJSONProvider(JSONProvider):
+    mimetype = "application/json"
+
+    def dumps(self, obj, **kwargs) -> str:
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,75 @@
+"""
+Live praćenje predaja za profesora.
+
+Profesor se preko Socket.IO događaja "subscribe" pridružuje sobi
+"course:<id>" ili "task:<id>" (samo za svoj kurs; admin za bilo koji).
+submit/grade objavljuju kratak "submission.delta" u obe sobe, pa prikaz
+predaja može da se ažurira bez ponovnog učitavanja cele liste.
+"""
+
+import re
+from typing import Dict, Optional, Tuple
+
+from app.models import Course, Task, TaskSubmission
+from app.database import SessionLocal
+from app.socketio_app import buffered_emit
+
+ROOM_PATTERN = re.compile(r"^(course|task):(\d+)$")
+
+
+def parse_room(room: str) -> Optional[Tuple[str, int]]:
+    match = ROOM_PATTERN.match(room or "")
+    if not match:
+        return None
+    return match.group(1), int(match.group(2))
+
+
+def authorize_room(user: Dict, room: str) -> Optional[str]:
+    """Vraća grešku ili None ako korisnik sme da prati sobu"""
+    parsed = parse_room(room)
+    if parsed is None:
+        return "Unknown room"
+    kind, object_id = parsed
+
+    role = user.get("role")
+    if role not in ("PROFESOR", "ADMIN"):
+        return "Forbidden"
+
+    db = SessionLocal()
+    try:
+        if kind == "course":
+            professor_id = db.query(Course.professor_id).filter(Course.id == object_id).scalar()
+        else:
+            professor_id = db.query(Course.professor_id).join(
+                Task, Task.course_id == Course.id
+            ).filter(Task.id == object_id).scalar()
+    finally:
+        db.close()
+
+    if professor_id is None:
+        return "Not found"
+    if role != "ADMIN" and professor_id != user.get("user_id"):
+        return "You are not the owner of this course"
+    return None
+
+
+def submission_delta(submission: TaskSubmission, course_id: int, action: str) -> Dict:
+    """Samo polja koja se menjaju - bez komentara i sadržaja fajla"""
+    return {
+        "action": action,
+        "submissionId": submission.id,
+        "taskId": submission.task_id,
+        "courseId": course_id,
+        "studentId": submission.student_id,
+        "studentName": f"{submission.student.first_name} {submission.student.last_name}",
+        "status": "GRADED" if submission.grade is not None else "SUBMITTED",
+        "grade": submission.grade,
+        "fileSize": submission.file_size,
+        "submittedAt": submission.submitted_at,
+        "gradedAt": submission.graded_at,
+    }
+
+
+def publish_submission_delta(delta: Dict) -> None:
+    buffered_emit("submission.delta", delta, room=f"task:{delta['taskId']}")
+    buffered_emit("submission.delta", delta, room=f"course:{delta['courseId']}")
@@ -8,18 +8,29 @@ from .create_test_data import seed
 from app.auth import auth_bp
 from app.routes.users import users_bp
 from app.routes.admin import admin_bp
-from app.routes.courses import courses_bp
+from routes.courses import courses_bp
 from app.routes.tasks import tasks_bp
 from app.routes.reports import reports_bp
-from app.socketio_app import socketio, register_ws_handlers
+from app.routes.blobs import blobs_bp
+from app.socketio_app import (
+    socketio,
+    register_ws_handlers,
+    SOCKETIO_ASYNC_MODE,
+    SOCKETIO_MESSAGE_QUEUE,
+    SOCKETIO_CHANNEL,
+)
 from app.redis_client import init_redis
 from app.database import init_db
+from app.compression import init_compression
+from app.proxy import init_proxy_fix
+from app.json_provider import FastJSONProvider
 
 load_dotenv()
 
 
 def create_app():
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
     app.config["SECRET_KEY"] = os.getenv(
         "SECRET_KEY", "dev-secret-key-change-in-production"
@@ -62,6 +73,9 @@ def create_app():
     app.register_blueprint(courses_bp)
     app.register_blueprint(tasks_bp)
     app.register_blueprint(reports_bp)
+    app.register_blueprint(blobs_bp)
+
+    init_compression(app)
 
     @app.get("/health")
     def health():
@@ -74,10 +88,14 @@ def create_app():
     socketio.init_app(
         app,
         cors_allowed_origins=["http://localhost:5173"],  
-        async_mode="threading"
+        async_mode=SOCKETIO_ASYNC_MODE,
+        message_queue=SOCKETIO_MESSAGE_QUEUE,
+        channel=SOCKETIO_CHANNEL,
     )
     register_ws_handlers()
 
+    init_proxy_fix(app)
+
     return app
 
 
@@ -93,6 +111,6 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=port,
-        debug=True,
+        debug=os.getenv("FLASK_DEBUG", "1") == "1",
         allow_unsafe_werkzeug=True,
     )
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+Registar metrika koje se izlažu preko /api/admin/metrics.
+
+Svaki podsistem registruje funkciju koja vraća dict sa svojim brojačima.
+"""
+
+from typing import Callable, Dict
+
+_providers: Dict[str, Callable[[], Dict]] = {}
+
+
+def register_metrics(name: str, provider: Callable[[], Dict]) -> None:
+    _providers[name] = provider
+
+
+def collect_metrics() -> Dict:
+    metrics = {}
+    for name, provider in _providers.items():
+        try:
+            metrics[name] = provider()
+        except Exception as e:
+            metrics[name] = {"error": str(e)}
+    return metrics
@@ -0,0 +1,143 @@
+"""
+Jednostavne verzionisane migracije šeme.
+
+Svaka migracija je funkcija (conn) -> None registrovana sa @migration(verzija).
+Primenjene verzije se pamte u tabeli schema_migrations; migrate() primenjuje
+ostale po redu, sve u jednoj transakciji i pod advisory lock-om, pa je
+bezbedno da više procesa pri startu pozove migrate() istovremeno.
+
+Pokretanje ručno: python migrate.py [--status]
+"""
+
+from typing import Callable, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+# proizvoljan ključ za pg_advisory_xact_lock - isti za sve procese aplikacije
+MIGRATION_LOCK_KEY = 724_101_401
+
+MIGRATIONS: List[Tuple[str, str, Callable[[Connection], None]]] = []
+
+
+def migration(version: str):
+    """Registruje migraciju; verzije se primenjuju redom kojim su registrovane"""
+
+    def decorator(fn):
+        MIGRATIONS.append((version, (fn.__doc__ or "").strip(), fn))
+        return fn
+
+    return decorator
+
+
+@migration("0001_baseline")
+def baseline(conn: Connection) -> None:
+    """Tabele iz modela (postojeće tabele se preskaču)"""
+    from app.models import Base
+
+    Base.metadata.create_all(bind=conn)
+
+
+@migration("0002_file_sizes")
+def file_sizes(conn: Connection) -> None:
+    """Kolone sa veličinom fajlova za baze napravljene pre blob store-a"""
+    conn.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS profile_image_size INTEGER"))
+    conn.execute(text("ALTER TABLE courses ADD COLUMN IF NOT EXISTS material_size INTEGER"))
+    conn.execute(text("ALTER TABLE task_submissions ADD COLUMN IF NOT EXISTS file_size INTEGER"))
+
+
+@migration("0003_indexes")
+def indexes(conn: Connection) -> None:
+    """Kompozitni, parcijalni i unique indeksi za česte upite"""
+    # duplikati moraju da nestanu pre unique indeksa; kod predaja ostaje poslednja
+    conn.execute(text("""
+        DELETE FROM course_enrollments a
+        USING course_enrollments b
+        WHERE a.course_id = b.course_id AND a.student_id = b.student_id AND a.id > b.id
+    """))
+    conn.execute(text("""
+        DELETE FROM task_submissions a
+        USING task_submissions b
+        WHERE a.task_id = b.task_id AND a.student_id = b.student_id AND a.id < b.id
+    """))
+
+    statements = [
+        "CREATE INDEX IF NOT EXISTS ix_users_role_created ON users (role, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_users_created ON users (created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_course_requests_status_created ON course_requests (status, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_course_requests_professor ON course_requests (professor_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_courses_professor ON courses (professor_id)",
+        "CREATE INDEX IF NOT EXISTS ix_courses_created ON courses (created_at, id)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_course_enrollments_course_student "
+        "ON course_enrollments (course_id, student_id)",
+        "CREATE INDEX IF NOT EXISTS ix_course_enrollments_student ON course_enrollments (student_id)",
+        "CREATE INDEX IF NOT EXISTS ix_tasks_course_deadline ON tasks (course_id, deadline)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_task_submissions_task_student "
+        "ON task_submissions (task_id, student_id)",
+        "CREATE INDEX IF NOT EXISTS ix_task_submissions_student_submitted "
+        "ON task_submissions (student_id, submitted_at)",
+        "CREATE INDEX IF NOT EXISTS ix_task_submissions_ungraded "
+        "ON task_submissions (task_id) WHERE grade IS NULL",
+        "CREATE INDEX IF NOT EXISTS ix_email_outbox_unsent "
+        "ON email_outbox (id) WHERE status IN ('PENDING', 'SENDING')",
+    ]
+    for statement in statements:
+        conn.execute(text(statement))
+
+
+@migration("0004_course_stats_backfill")
+def course_stats_backfill(conn: Connection) -> None:
+    """Popunjava course_stats za kurseve nastale pre inkrementalne statistike"""
+    from app.course_stats import rebuild
+
+    rebuild(conn)
+
+
+@migration("0005_outbox_dedupe_key")
+def outbox_dedupe_key(conn: Connection) -> None:
+    """Ključ za idempotentan upis poruka iz poslova koji se mogu ponoviti"""
+    conn.execute(text("ALTER TABLE email_outbox ADD COLUMN IF NOT EXISTS dedupe_key VARCHAR(64)"))
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_email_outbox_dedupe_key ON email_outbox (dedupe_key)"
+    ))
+
+
+def _ensure_table(conn: Connection) -> None:
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(120) PRIMARY KEY,
+            applied_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+        )
+    """))
+
+
+def applied_versions(conn: Connection) -> List[str]:
+    _ensure_table(conn)
+    return [row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))]
+
+
+def migrate(engine: Engine) -> List[str]:
+    """Primenjuje sve neprimenjene migracije i vraća njihove verzije"""
+    applied_now = []
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        applied = set(applied_versions(conn))
+
+        for version, description, fn in MIGRATIONS:
+            if version in applied:
+                continue
+            print(f"🔧 Applying migration {version}: {description}")
+            fn(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version) VALUES (:version)"),
+                {"version": version},
+            )
+            applied_now.append(version)
+
+    return applied_now
+
+
+def status(engine: Engine) -> List[Tuple[str, str, bool]]:
+    with engine.begin() as conn:
+        applied = set(applied_versions(conn))
+    return [(version, description, version in applied) for version, description, _ in MIGRATIONS]
@@ -1,12 +1,19 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index, text
+from sqlalchemy.orm import relationship, declarative_base, deferred
 from datetime import datetime
 
+from app.signed_urls import sign_path
+
+
 Base = declarative_base()
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_role_created", "role", "created_at", "id"),
+        Index("ix_users_created", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
     first_name = Column(String(60), nullable=False)
@@ -19,7 +26,9 @@ class User(Base):
     number = Column(String(20), nullable=True)
     role = Column(String(20), nullable=False, default="STUDENT")
     password_hash = Column(String(255), nullable=False)
-    profile_image = Column(Text, nullable=True)
+    # sadržaj (ili blob referenca) se učitava samo na detail/download endpointima
+    profile_image = deferred(Column(Text, nullable=True))
+    profile_image_size = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
@@ -40,12 +49,17 @@ class User(Base):
             "street": self.street or "",
             "number": self.number or "",
             "role": self.role,
-            "profileImage": self.profile_image,
+            "profileImage": sign_path(f"/api/users/{self.id}/profile-image") if self.profile_image_size is not None else None,
+            "profileImageSize": self.profile_image_size,
         }
 
 
 class CourseRequest(Base):
     __tablename__ = "course_requests"
+    __table_args__ = (
+        Index("ix_course_requests_status_created", "status", "created_at"),
+        Index("ix_course_requests_professor", "professor_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     professor_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -68,18 +82,23 @@ class CourseRequest(Base):
             "description": self.description,
             "status": self.status,
             "rejectionReason": self.rejection_reason,
-            "createdAt": self.created_at.isoformat(),
+            "createdAt": self.created_at,
         }
 
 
 class Course(Base):
     __tablename__ = "courses"
+    __table_args__ = (
+        Index("ix_courses_professor", "professor_id"),
+        Index("ix_courses_created", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
     professor_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     name = Column(String(120), nullable=False)
     description = Column(Text, nullable=False)
-    material_path = Column(Text, nullable=True)
+    material_path = deferred(Column(Text, nullable=True))
+    material_size = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
@@ -94,13 +113,46 @@ class Course(Base):
             "professorName": f"{self.professor.first_name} {self.professor.last_name}",
             "name": self.name,
             "description": self.description,
-            "materialPath": self.material_path,
-            "createdAt": self.created_at.isoformat(),
+            "materialPath": sign_path(f"/api/courses/{self.id}/material") if self.material_size is not None else None,
+            "materialSize": self.material_size,
+            "createdAt": self.created_at,
+        }
+
+
+class CourseStats(Base):
+    """Brojači po kursu koje inkrementalno održava app.course_stats"""
+    __tablename__ = "course_stats"
+
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    enrollment_count = Column(Integer, nullable=False, default=0)
+    task_count = Column(Integer, nullable=False, default=0)
+    submission_count = Column(Integer, nullable=False, default=0)
+    graded_count = Column(Integer, nullable=False, default=0)
+    grade_sum = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    @property
+    def average_grade(self):
+        return self.grade_sum / self.graded_count if self.graded_count else None
+
+    def to_dict(self):
+        return {
+            "courseId": self.course_id,
+            "enrollmentCount": self.enrollment_count,
+            "taskCount": self.task_count,
+            "submissionCount": self.submission_count,
+            "gradedCount": self.graded_count,
+            "averageGrade": self.average_grade,
+            "updatedAt": self.updated_at,
         }
 
 
 class CourseEnrollment(Base):
     __tablename__ = "course_enrollments"
+    __table_args__ = (
+        Index("uq_course_enrollments_course_student", "course_id", "student_id", unique=True),
+        Index("ix_course_enrollments_student", "student_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
@@ -118,12 +170,15 @@ class CourseEnrollment(Base):
             "courseName": self.course.name,
             "studentId": self.student_id,
             "studentName": f"{self.student.first_name} {self.student.last_name}",
-            "enrolledAt": self.enrolled_at.isoformat(),
+            "enrolledAt": self.enrolled_at,
         }
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_course_deadline", "course_id", "deadline"),
+    )
 
     id = Column(Integer, primary_key=True)
     course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
@@ -143,18 +198,24 @@ class Task(Base):
             "courseName": self.course.name,
             "title": self.title,
             "description": self.description,
-            "deadline": self.deadline.isoformat(),
-            "createdAt": self.created_at.isoformat(),
+            "deadline": self.deadline,
+            "createdAt": self.created_at,
         }
 
 
 class TaskSubmission(Base):
     __tablename__ = "task_submissions"
+    __table_args__ = (
+        Index("uq_task_submissions_task_student", "task_id", "student_id", unique=True),
+        Index("ix_task_submissions_student_submitted", "student_id", "submitted_at"),
+        Index("ix_task_submissions_ungraded", "task_id", postgresql_where=text("grade IS NULL")),
+    )
 
     id = Column(Integer, primary_key=True)
     task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
     student_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    file_path = Column(Text, nullable=False)
+    file_path = deferred(Column(Text, nullable=False))
+    file_size = Column(Integer, nullable=True)
     grade = Column(Integer, nullable=True)
     comment = Column(Text, nullable=True)
     submitted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -170,9 +231,43 @@ class TaskSubmission(Base):
             "taskTitle": self.task.title,
             "studentId": self.student_id,
             "studentName": f"{self.student.first_name} {self.student.last_name}",
-            "filePath": self.file_path,
+            "filePath": f"/api/tasks/{self.task_id}/submissions/{self.id}/download",
+            "fileSize": self.file_size,
             "grade": self.grade,
             "comment": self.comment,
-            "submittedAt": self.submitted_at.isoformat(),
-            "gradedAt": self.graded_at.isoformat() if self.graded_at else None,
-        }
\ No newline at end of file
+            "submittedAt": self.submitted_at,
+            "gradedAt": self.graded_at,
+        }
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_unsent", "id", postgresql_where=text("status IN ('PENDING', 'SENDING')")),
+        Index("uq_email_outbox_dedupe_key", "dedupe_key", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    recipient = Column(String(120), nullable=False)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(String(20), nullable=False, default="PENDING")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    claimed_at = Column(DateTime, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+    # poruka sa istim ključem se upisuje samo jednom (ponovljen posao)
+    dedupe_key = Column(String(64), nullable=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "recipient": self.recipient,
+            "subject": self.subject,
+            "status": self.status,
+            "attempts": self.attempts,
+            "lastError": self.last_error,
+            "createdAt": self.created_at,
+            "sentAt": self.sent_at,
+        }
@@ -0,0 +1,53 @@
+"""
+Transakcioni outbox za email.
+
+Poruke se upisuju u istoj DB transakciji kao i poslovna promena, a šalje ih
+poseban dispatcher proces (app.outbox_dispatcher) - zahtev se ne blokira
+slanjem, a poruka se ne gubi ako se commit desi a slanje ne.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable
+
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models import EmailOutbox
+
+
+def enqueue_email(db: Session, to: str, subject: str, body: str) -> None:
+    """Dodaje poruku u tekuću transakciju; commit radi pozivalac"""
+    db.add(EmailOutbox(recipient=to, subject=subject, body=body))
+
+
+def enqueue_emails(db: Session, messages: Iterable[Dict[str, str]]) -> int:
+    """
+    Bulk varijanta za fan-out; poruke su dict-ovi sa to/subject/body i
+    opcionim key - poruka čiji ključ već postoji u outbox-u se preskače.
+    Vraća broj upisanih poruka.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "recipient": m["to"],
+            "subject": m["subject"],
+            "body": m["body"],
+            "status": "PENDING",
+            "attempts": 0,
+            "created_at": now,
+            "next_attempt_at": now,
+            "dedupe_key": m.get("key"),
+        }
+        for m in messages
+    ]
+    if not rows:
+        return 0
+
+    if any(row["dedupe_key"] for row in rows):
+        stmt = insert(EmailOutbox).values(rows).on_conflict_do_nothing(
+            index_elements=[EmailOutbox.dedupe_key]
+        )
+        return db.execute(stmt).rowcount
+
+    db.bulk_insert_mappings(EmailOutbox, rows)
+    return len(rows)
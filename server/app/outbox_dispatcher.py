@@ -0,0 +1,162 @@
+"""
+Dispatcher za email outbox.
+
+Pokretanje: python -m app.outbox_dispatcher
+
+Preuzima pakete PENDING poruka (FOR UPDATE SKIP LOCKED, pa može da radi
+više dispatcher-a paralelno), šalje ih sa ograničenim brojem paralelnih
+slanja i za svaku poruku upisuje status. Neuspešna slanja se ponavljaju sa
+eksponencijalnim čekanjem do OUTBOX_MAX_ATTEMPTS.
+"""
+
+import os
+import time
+import signal
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from sqlalchemy import or_, and_
+
+from app.database import SessionLocal
+from app.models import EmailOutbox
+from app.email_utils import send_email
+
+BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+CONCURRENCY = int(os.getenv("OUTBOX_CONCURRENCY", "8"))
+MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+RETRY_BASE_SECONDS = int(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "30"))
+POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1.0"))
+# poruka ostala u SENDING duže od ovoga (pao dispatcher) se ponovo preuzima
+SENDING_TIMEOUT_SECONDS = int(os.getenv("OUTBOX_SENDING_TIMEOUT", "300"))
+
+_running = True
+
+
+def claim_batch() -> List[Tuple[int, str, str, str]]:
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=SENDING_TIMEOUT_SECONDS)
+
+        # poruka koja je iscrpela pokušaje a zaglavila se u slanju (ruši ili
+        # blokira dispatcher) više se ne preuzima
+        db.query(EmailOutbox).filter(
+            EmailOutbox.status == "SENDING",
+            EmailOutbox.claimed_at < stale,
+            EmailOutbox.attempts >= MAX_ATTEMPTS,
+        ).update(
+            {"status": "FAILED", "last_error": "Sending timed out"},
+            synchronize_session=False,
+        )
+
+        messages = (
+            db.query(EmailOutbox)
+            .filter(
+                or_(
+                    and_(EmailOutbox.status == "PENDING", EmailOutbox.next_attempt_at <= now),
+                    and_(
+                        EmailOutbox.status == "SENDING",
+                        EmailOutbox.claimed_at < stale,
+                        EmailOutbox.attempts < MAX_ATTEMPTS,
+                    ),
+                )
+            )
+            .order_by(EmailOutbox.id)
+            .limit(BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        for message in messages:
+            message.status = "SENDING"
+            message.claimed_at = now
+            message.attempts += 1
+
+        batch = [(m.id, m.recipient, m.subject, m.body) for m in messages]
+        db.commit()
+        return batch
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _send(message: Tuple[int, str, str, str]) -> Tuple[int, Optional[str]]:
+    message_id, to, subject, body = message
+    try:
+        send_email(to=to, subject=subject, body=body)
+        return message_id, None
+    except Exception as e:
+        return message_id, str(e)
+
+
+def record_results(results: List[Tuple[int, Optional[str]]]) -> None:
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        sent_ids = [message_id for message_id, error in results if error is None]
+        if sent_ids:
+            db.query(EmailOutbox).filter(EmailOutbox.id.in_(sent_ids)).update(
+                {"status": "SENT", "sent_at": now, "last_error": None},
+                synchronize_session=False,
+            )
+
+        for message_id, error in results:
+            if error is None:
+                continue
+            message = db.query(EmailOutbox).filter(EmailOutbox.id == message_id).first()
+            message.last_error = error
+            if message.attempts >= MAX_ATTEMPTS:
+                message.status = "FAILED"
+            else:
+                message.status = "PENDING"
+                message.next_attempt_at = now + timedelta(
+                    seconds=RETRY_BASE_SECONDS * 2 ** (message.attempts - 1)
+                )
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def dispatch_once(executor: ThreadPoolExecutor) -> int:
+    batch = claim_batch()
+    if not batch:
+        return 0
+
+    results = list(executor.map(_send, batch))
+    record_results(results)
+
+    failed = len([r for r in results if r[1] is not None])
+    print(f"[Outbox] Sent {len(results) - failed}, failed {failed}")
+    return len(batch)
+
+
+def _stop(signum, frame):
+    global _running
+    print("[Outbox] Stopping after current batch...")
+    _running = False
+
+
+def main():
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    print(f"[Outbox] Dispatcher started (batch={BATCH_SIZE}, concurrency={CONCURRENCY})")
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        while _running:
+            try:
+                if dispatch_once(executor) == 0:
+                    time.sleep(POLL_INTERVAL)
+            except Exception as e:
+                print(f"[Outbox] Dispatch error: {e}")
+                time.sleep(POLL_INTERVAL)
+
+
+if __name__ == "__main__":
+    main()
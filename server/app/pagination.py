@@ -0,0 +1,78 @@
+"""
+Keyset (cursor) paginacija za list endpointe.
+
+Stranica se seče po (vreme, id) paru umesto OFFSET-a, tako da cena upita
+ne raste sa brojem prethodnih stranica.
+"""
+
+import os
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from flask import request
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_LIMIT = int(os.getenv("DEFAULT_PAGE_LIMIT", "50"))
+MAX_PAGE_LIMIT = int(os.getenv("MAX_PAGE_LIMIT", "200"))
+
+
+class PaginationError(ValueError):
+    pass
+
+
+def encode_cursor(ts: datetime, row_id: int) -> str:
+    raw = f"{ts.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        ts, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(ts), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise PaginationError("Invalid cursor")
+
+
+def page_params() -> Tuple[int, Optional[Tuple[datetime, int]]]:
+    raw_limit = request.args.get("limit")
+    try:
+        limit = int(raw_limit) if raw_limit else DEFAULT_PAGE_LIMIT
+    except ValueError:
+        raise PaginationError("limit must be an integer")
+
+    if limit < 1:
+        raise PaginationError("limit must be positive")
+    limit = min(limit, MAX_PAGE_LIMIT)
+
+    cursor = request.args.get("cursor")
+    return limit, decode_cursor(cursor) if cursor else None
+
+
+def paginate(query, ts_column, id_column, serialize=None, options=()):
+    """Vraća {"items": [...], "nextCursor": ...}, najnoviji redovi prvi"""
+    limit, cursor = page_params()
+
+    if cursor:
+        query = query.filter(tuple_(ts_column, id_column) < cursor)
+
+    rows = (
+        query.options(*options)
+        .order_by(None)
+        .order_by(ts_column.desc(), id_column.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, ts_column.key), getattr(last, id_column.key))
+
+    serialize = serialize or (lambda row: row.to_dict())
+    return {
+        "items": [serialize(row) for row in rows],
+        "nextCursor": next_cursor,
+    }
@@ -0,0 +1,217 @@
+"""
+Heširanje i provera lozinki u posebnom pool-u procesa.
+
+pbkdf2 je namerno CPU-intenzivan; u request niti bi pod GIL-om blokirao
+ostale zahteve. Poslovi idu u zaseban ProcessPoolExecutor, a red ispred
+njega je ograničen semaforom - kad je pun, hash_password/verify_password
+odmah podižu PasswordQueueFull (ruta vraća 503) umesto da zahtevi čekaju.
+Mesto u redu se oslobađa tek kad posao zaista završi (i posle isteka
+PASSWORD_HASH_TIMEOUT_SECONDS), pa red ograničava stvarni posao u pool-u.
+
+Broj rundi se podešava sa PASSWORD_HASH_ROUNDS; hash sa drugim parametrima
+se pri uspešnom login-u transparentno ponovo hešira (verify_password vraća
+novi hash).
+"""
+
+import os
+import time
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Tuple
+
+from passlib.hash import pbkdf2_sha256
+
+from app.metrics import register_metrics
+
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", str(pbkdf2_sha256.default_rounds)))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+# koliko poslova sme da čeka ili se izvršava; preko toga -> PasswordQueueFull
+PASSWORD_HASH_QUEUE_SIZE = int(
+    os.getenv("PASSWORD_HASH_QUEUE_SIZE", str(PASSWORD_HASH_WORKERS * 4))
+)
+PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "10"))
+POOL_START_METHOD = os.getenv("WORKER_START_METHOD", "forkserver")
+
+BATCH_CHUNK_SIZE = 50
+
+
+class PasswordHasherBusy(Exception):
+    """Pool ne može da obradi lozinku na vreme - ruta vraća 503 (auth.busy_response)"""
+
+
+class PasswordQueueFull(PasswordHasherBusy):
+    pass
+
+
+class PasswordTimeout(PasswordHasherBusy):
+    pass
+
+
+def _hasher(rounds: int):
+    return pbkdf2_sha256.using(rounds=rounds)
+
+
+def _hash_worker(password: str, rounds: int) -> str:
+    return _hasher(rounds).hash(password)
+
+
+def _hash_many_worker(passwords: List[str], rounds: int) -> List[str]:
+    hasher = _hasher(rounds)
+    return [hasher.hash(password) for password in passwords]
+
+
+def _verify_worker(password: str, password_hash: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    hasher = _hasher(rounds)
+    if not hasher.verify(password, password_hash):
+        return False, None
+    if hasher.needs_update(password_hash):
+        return True, hasher.hash(password)
+    return True, None
+
+
+class _Timing:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "avgMs": round(self.total / self.count * 1000, 2) if self.count else None,
+            "maxMs": round(self.max * 1000, 2),
+        }
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASH_WORKERS,
+        queue_size: int = PASSWORD_HASH_QUEUE_SIZE,
+        rounds: int = PASSWORD_HASH_ROUNDS,
+        timeout: float = PASSWORD_HASH_TIMEOUT_SECONDS,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.rounds = rounds
+        self.timeout = timeout
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.rehashed = 0
+        self.timings = {"hash": _Timing(), "verify": _Timing()}
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(POOL_START_METHOD),
+                )
+                print(f"✅ Started password hashing pool: {self.workers} workers")
+            return self._executor
+
+    def _run(self, kind: str, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordQueueFull("Password hashing queue is full")
+
+        with self._lock:
+            self._in_flight += 1
+        started = time.perf_counter()
+
+        def release(_future=None):
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._in_flight -= 1
+                self.timings[kind].add(elapsed)
+            self._slots.release()
+
+        try:
+            future = self._ensure_executor().submit(fn, *args)
+        except Exception:
+            release()
+            raise
+        # slot se vraća kad posao završi, ne kad zahtev prestane da čeka
+        future.add_done_callback(release)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # posao koji još nije počeo se otkazuje; započeti drži slot do kraja
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise PasswordTimeout("Password hashing timed out")
+
+    def hash(self, password: str) -> str:
+        return self._run("hash", _hash_worker, password, self.rounds)
+
+    def verify(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """(ispravna lozinka, novi hash ako su se parametri promenili ili None)"""
+        ok, new_hash = self._run("verify", _verify_worker, password, password_hash, self.rounds)
+        if new_hash:
+            with self._lock:
+                self.rehashed += 1
+        return ok, new_hash
+
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """Za masovni uvoz - deli lozinke po procesima i ne troši mesta u redu za zahteve"""
+        executor = self._ensure_executor()
+        futures = [
+            executor.submit(_hash_many_worker, passwords[i:i + BATCH_CHUNK_SIZE], self.rounds)
+            for i in range(0, len(passwords), BATCH_CHUNK_SIZE)
+        ]
+        hashes = []
+        for future in futures:
+            hashes.extend(future.result())
+        return hashes
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "rounds": self.rounds,
+                "workers": self.workers,
+                "queueDepth": self._in_flight,
+                "queueCapacity": self.queue_size,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "hash": self.timings["hash"].to_dict(),
+                "verify": self.timings["verify"].to_dict(),
+                "rehashed": self.rehashed,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher()
+
+register_metrics("passwords", password_hasher.stats)
+atexit.register(password_hasher.shutdown)
+
+
+def hash_password(password: str) -> str:
+    return password_hasher.hash(password)
+
+
+def verify_password(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    return password_hasher.verify(password, password_hash)
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    return password_hasher.hash_many(passwords)
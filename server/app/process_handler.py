@@ -1,32 +1,53 @@
 
 import os
 import time
-from multiprocessing import Process, Queue, current_process
+import pickle
+import secrets
+import threading
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+from collections import deque
+from concurrent.futures import Future, wait
+from multiprocessing import current_process
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, Set
 
+POOL_SIZE = int(os.getenv("WORKER_POOL_SIZE", str(os.cpu_count() or 2)))
+# radnik se reciklira posle ovoliko poslova da memorija ne bi rasla
+MAX_JOBS_PER_WORKER = int(os.getenv("WORKER_MAX_JOBS", "100"))
+POOL_START_METHOD = os.getenv("WORKER_START_METHOD", "forkserver")
+
+# koliko poslednjih rezultata ProcessManager čuva za get_results(); stariji se odbacuju
+RESULTS_MAXLEN = int(os.getenv("WORKER_RESULTS_MAXLEN", "100"))
+
+# rezultati veći od ovoga idu kroz shared memory, a kroz red samo deskriptor
+SHM_THRESHOLD_BYTES = int(os.getenv("WORKER_SHM_THRESHOLD_BYTES", str(1024 * 1024)))
+
+# forkserver učita samo ove module (bez Flask aplikacije) i od njega se forkuju radnici
+PRELOAD_MODULES = ["app.process_handler"]
+
+
+def send_bulk_emails_worker(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
 
-def send_bulk_emails_worker(tasks: List[Dict[str, Any]], result_queue: Queue):
-  
     process_name = current_process().name
     print(f"[{process_name}] Started email sending process")
-    
+
     results = []
     for task in tasks:
         try:
             to = task.get('to')
             subject = task.get('subject')
             body = task.get('body')
-            
+
             print(f"[{process_name}] Sending email to {to}")
-            time.sleep(0.5)  
-            
+            time.sleep(0.5)
+
             results.append({
                 'to': to,
                 'status': 'sent',
                 'timestamp': datetime.utcnow().isoformat()
             })
-            
+
         except Exception as e:
             print(f"[{process_name}] Error sending email: {e}")
             results.append({
@@ -34,49 +55,63 @@ def send_bulk_emails_worker(tasks: List[Dict[str, Any]], result_queue: Queue):
                 'status': 'failed',
                 'error': str(e)
             })
-    
-    result_queue.put({
+
+    print(f"[{process_name}] Completed sending {len(results)} emails")
+
+    return {
         'process': process_name,
         'completed': len(results),
         'results': results
-    })
-    
-    print(f"[{process_name}] Completed sending {len(results)} emails")
+    }
 
 
-def generate_report_worker(report_type: str, data: Dict[str, Any], result_queue: Queue):
+def generate_report_worker(report_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
     process_name = current_process().name
     print(f"[{process_name}] Started generating {report_type} report")
-    
+
     try:
-        time.sleep(2)  
-        
+        time.sleep(2)
+
         report = {
             'type': report_type,
             'generated_at': datetime.utcnow().isoformat(),
             'data': data,
             'status': 'completed'
         }
-        
-        result_queue.put(report)
+
         print(f"[{process_name}] Report generated successfully")
-        
+        return report
+
     except Exception as e:
         print(f"[{process_name}] Error generating report: {e}")
-        result_queue.put({
+        return {
             'type': report_type,
             'status': 'failed',
             'error': str(e)
-        })
+        }
+
 
+def report_partition_worker(report_type: str, lo: Optional[int], hi: Optional[int]) -> Dict[str, Any]:
+    """Računa delimične agregate izveštaja za opseg id-jeva [lo, hi) sopstvenom konekcijom"""
+    from app.report_engine import compute_partial, worker_session
 
-def process_file_worker(file_path: str, operation: str, result_queue: Queue):
+    process_name = current_process().name
+    print(f"[{process_name}] Computing {report_type} report partition [{lo}, {hi})")
+
+    db = worker_session()
+    try:
+        return compute_partial(db, report_type, lo, hi)
+    finally:
+        db.close()
+
+
+def process_file_worker(file_path: str, operation: str) -> Dict[str, Any]:
     process_name = current_process().name
     print(f"[{process_name}] Started processing file: {file_path}")
-    
+
     try:
         time.sleep(1)
-        
+
         result = {
             'file': file_path,
             'operation': operation,
@@ -85,91 +120,253 @@ def process_file_worker(file_path: str, operation: str, result_queue: Queue):
             'lines_processed': 1000,  # Simulacija
             'errors': 0
         }
-        
-        result_queue.put(result)
+
         print(f"[{process_name}] File processing completed")
-        
+        return result
+
     except Exception as e:
         print(f"[{process_name}] Error processing file: {e}")
-        result_queue.put({
+        return {
             'file': file_path,
             'status': 'failed',
             'error': str(e)
-        })
+        }
+
+
+class SharedResult:
+    """Deskriptor rezultata koji je ostao u shared memory segmentu"""
+
+    __slots__ = ("name", "size")
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+
+
+def pack_result(result: Any, threshold: int = SHM_THRESHOLD_BYTES, name: Optional[str] = None) -> Any:
+    """
+    Veliki rezultat upisuje u novi shared memory segment i vraća SharedResult.
+    Segment posle toga pripada potrošaču - on ga čita i oslobađa (unpack_result).
+    Ime segmenta bira potrošač (WorkerPool) da bi mogao da ga obriše i kad
+    rezultat nikad ne stigne.
+    """
+    data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) < threshold:
+        return result
+
+    shm = SharedMemory(name=name, create=True, size=len(data))
+    try:
+        shm.buf[:len(data)] = data
+    except Exception:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    return SharedResult(shm.name, len(data))
+
+
+def unpack_result(value: Any) -> Any:
+    """Čita rezultat direktno iz segmenta (bez kopije u bytes) i oslobađa segment"""
+    if not isinstance(value, SharedResult):
+        return value
+
+    shm = SharedMemory(name=value.name)
+    try:
+        with shm.buf[:value.size] as view:
+            return pickle.loads(view)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def unlink_segment(name: str) -> bool:
+    """Briše segment ako još postoji; vraća True ako je nešto obrisano"""
+    try:
+        shm = SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    shm.close()
+    shm.unlink()
+    return True
+
+
+def _run_packed(fn: Callable, args: tuple, threshold: int, name: str) -> Any:
+    return pack_result(fn(*args), threshold, name)
+
+
+class WorkerPool:
+    """
+    Dugotrajan pool procesa ograničene veličine.
+
+    Pool se pravi pri prvom poslu; poslovi se predaju kroz submit() koji
+    vraća concurrent.futures.Future. Rezultati veći od shm_threshold se
+    prenose kroz shared memory (pack_result / unpack_result); imena segmenata
+    čiji rezultat još nije preuzet pool pamti i briše ih u shutdown().
+    """
+
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        max_jobs_per_worker: int = MAX_JOBS_PER_WORKER,
+        start_method: str = POOL_START_METHOD,
+        shm_threshold: int = SHM_THRESHOLD_BYTES,
+    ):
+        self.size = size
+        self.shm_threshold = shm_threshold
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.start_method = start_method
+        self._pool = None
+        self._lock = threading.Lock()
+        self._segments: Set[str] = set()
+        # callback-ovi rade u niti pool-a koju shutdown() čeka - ne smeju da čekaju na self._lock
+        self._segments_lock = threading.Lock()
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            ctx = multiprocessing.get_context(self.start_method)
+            if self.start_method == "forkserver":
+                ctx.set_forkserver_preload(PRELOAD_MODULES)
+            self._pool = ctx.Pool(
+                processes=self.size,
+                maxtasksperchild=self.max_jobs_per_worker,
+            )
+            print(f"✅ Started worker pool: {self.size} workers ({self.start_method})")
+        return self._pool
+
+    def submit(self, fn: Callable, *args) -> Future:
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        # radnik pravi segment pod ovim imenom samo ako je rezultat veliki
+        name = f"lp_{secrets.token_hex(8)}"
+
+        with self._lock:
+            pool = self._ensure_pool()
+            with self._segments_lock:
+                self._segments.add(name)
+            pool.apply_async(
+                _run_packed,
+                (fn, args, self.shm_threshold, name),
+                callback=lambda value: self._resolve(future, name, value),
+                error_callback=lambda error: self._fail(future, name, error),
+            )
+        return future
+
+    def _release(self, name: str):
+        with self._segments_lock:
+            self._segments.discard(name)
+
+    def _resolve(self, future: Future, name: str, value: Any):
+        try:
+            future.set_result(unpack_result(value))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            self._release(name)
+
+    def _fail(self, future: Future, name: str, error: BaseException):
+        # radnik je mogao da napravi segment pa da pukne pre nego što je vratio deskriptor
+        try:
+            unlink_segment(name)
+        except OSError as e:
+            print(f"⚠️  Could not remove shared memory segment {name}: {e}")
+        self._release(name)
+        future.set_exception(error)
+
+    def _unlink_outstanding(self):
+        # rezultati koje niko neće preuzeti (terminate, izgubljen callback)
+        with self._segments_lock:
+            segments, self._segments = self._segments, set()
+        leaked = sum(1 for name in segments if unlink_segment(name))
+        if leaked:
+            print(f"🧹 Removed {leaked} unclaimed shared memory segment(s)")
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._pool is None:
+                return
+            try:
+                if wait:
+                    self._pool.close()
+                    self._pool.join()
+                else:
+                    self._pool.terminate()
+            finally:
+                self._pool = None
+                self._unlink_outstanding()
 
 
 class ProcessManager:
-    def __init__(self):
-        self.active_processes: List[Process] = []
-        self.result_queue = Queue()
-    
-    def send_bulk_emails(self, email_tasks: List[Dict[str, Any]]) -> Process:
-        process = Process(
-            target=send_bulk_emails_worker,
-            args=(email_tasks, self.result_queue),
-            name=f"EmailWorker-{len(self.active_processes)}"
-        )
-        process.start()
-        self.active_processes.append(process)
-        
-        print(f"✅ Started email process: {process.name} (PID: {process.pid})")
-        return process
-    
-    def generate_report(self, report_type: str, data: Dict[str, Any]) -> Process:
-        process = Process(
-            target=generate_report_worker,
-            args=(report_type, data, self.result_queue),
-            name=f"ReportWorker-{len(self.active_processes)}"
-        )
-        process.start()
-        self.active_processes.append(process)
-        
-        print(f"✅ Started report process: {process.name} (PID: {process.pid})")
-        return process
-    
-    def process_file(self, file_path: str, operation: str = "validate") -> Process:
-        process = Process(
-            target=process_file_worker,
-            args=(file_path, operation, self.result_queue),
-            name=f"FileWorker-{len(self.active_processes)}"
-        )
-        process.start()
-        self.active_processes.append(process)
-        
-        print(f"✅ Started file process: {process.name} (PID: {process.pid})")
-        return process
-    
-    def get_results(self, timeout: float = 0.1) -> List[Dict[str, Any]]:
+    def __init__(self, pool: Optional[WorkerPool] = None):
+        self.pool = pool or WorkerPool()
+        self.pending: Set[Future] = set()
+        # status poslova je u Redis-u (app.jobs) - ovo je samo ograničena istorija
+        self.results = deque(maxlen=RESULTS_MAXLEN)
+        self._lock = threading.Lock()
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        future = self.pool.submit(fn, *args)
+        with self._lock:
+            self.pending.add(future)
+        future.add_done_callback(self._collect)
+        return future
+
+    def _collect(self, future: Future):
+        # poziva se iz callback-a i iz wait_for_completion - rezultat se uzima samo jednom
+        with self._lock:
+            if future not in self.pending:
+                return
+            self.pending.discard(future)
+
+        error = future.exception()
+        if error is not None:
+            print(f"❌ Worker job failed: {error}")
+            self.results.append({'status': 'failed', 'error': str(error)})
+        else:
+            self.results.append(future.result())
+
+    def send_bulk_emails(self, email_tasks: List[Dict[str, Any]]) -> Future:
+        future = self._submit(send_bulk_emails_worker, email_tasks)
+        print(f"✅ Queued email job ({len(email_tasks)} emails)")
+        return future
+
+    def generate_report(self, report_type: str, data: Dict[str, Any]) -> Future:
+        future = self._submit(generate_report_worker, report_type, data)
+        print(f"✅ Queued {report_type} report job")
+        return future
+
+    def process_file(self, file_path: str, operation: str = "validate") -> Future:
+        future = self._submit(process_file_worker, file_path, operation)
+        print(f"✅ Queued file job: {file_path}")
+        return future
+
+    def get_results(self) -> List[Dict[str, Any]]:
         results = []
-        while not self.result_queue.empty():
-            try:
-                result = self.result_queue.get(timeout=timeout)
-                results.append(result)
-            except:
-                break
+        while self.results:
+            results.append(self.results.popleft())
         return results
-    
+
     def wait_for_completion(self, timeout: float = None):
-        for process in self.active_processes:
-            process.join(timeout=timeout)
-            if process.is_alive():
-                print(f"⚠️  Process {process.name} still running")
-            else:
-                print(f"✅ Process {process.name} completed")
-        
-        self.active_processes = [p for p in self.active_processes if p.is_alive()]
-    
+        with self._lock:
+            pending = list(self.pending)
+
+        done, not_done = wait(pending, timeout=timeout)
+        for future in done:
+            self._collect(future)
+
+        if not_done:
+            print(f"⚠️  {len(not_done)} job(s) still running")
+        else:
+            print(f"✅ {len(done)} job(s) completed")
+
     def terminate_all(self):
-        for process in self.active_processes:
-            if process.is_alive():
-                print(f"🛑 Terminating process {process.name}")
-                process.terminate()
-                process.join(timeout=1)
-        
-        self.active_processes.clear()
-    
+        print("🛑 Terminating worker pool")
+        self.pool.shutdown(wait=False)
+        with self._lock:
+            self.pending.clear()
+
     def get_active_count(self) -> int:
-        return len([p for p in self.active_processes if p.is_alive()])
+        with self._lock:
+            return len(self.pending)
 
 
 process_manager = ProcessManager()
@@ -182,4 +379,4 @@ def cleanup_processes():
 
 
 import atexit
-atexit.register(cleanup_processes)
\ No newline at end of file
+atexit.register(cleanup_processes)
@@ -0,0 +1,24 @@
+"""
+Stvarna adresa klijenta iza reverse proxy-ja.
+
+Iza nginx-a/load balancera `request.remote_addr` je adresa proxy-ja, pa bi
+rate limit po IP-u delio jedan bucket na sve korisnike. ProxyFix uzima adresu
+iz X-Forwarded-For, ali samo onoliko unosa s desna koliko ima proxy-ja kojima
+verujemo - vrednosti levo od toga klijent može da podmetne.
+"""
+
+import os
+
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+# broj reverse proxy-ja ispred aplikacije koji postavljaju X-Forwarded-*;
+# 0 = klijenti se povezuju direktno i zaglavlja se ignorišu
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+
+
+def init_proxy_fix(app, hops: int = TRUSTED_PROXY_HOPS) -> None:
+    """Poziva se poslednje u create_app, da ProxyFix obuhvati i Socket.IO middleware"""
+    if hops <= 0:
+        return
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops, x_host=hops)
+    print(f"✅ Trusting {hops} proxy hop(s) for X-Forwarded-*")
@@ -0,0 +1,157 @@
+"""
+Token bucket ograničenje zahteva u Redis-u.
+
+Svi bucket-i jednog zahteva (po IP adresi i po email-u) se proveravaju i
+umanjuju jednim atomskim Lua skriptom (EVALSHA) - jedan Redis round trip po
+zahtevu. Vreme se uzima iz Redis-a (TIME) pa satovi app servera nisu bitni.
+Ako Redis nije dostupan, zahtev se propušta (fail open).
+"""
+
+import os
+import math
+import threading
+from collections import defaultdict
+from functools import wraps
+from typing import Dict, Optional, Tuple
+
+from flask import request, jsonify
+
+from app.redis_client import get_redis
+from app.metrics import register_metrics
+
+# 'kapacitet/sekundi' - npr. 20/60 je nalet od 20 zahteva, pa 20 u minuti
+LOGIN_LIMIT_PER_IP = os.getenv("LOGIN_LIMIT_PER_IP", "20/60")
+LOGIN_LIMIT_PER_EMAIL = os.getenv("LOGIN_LIMIT_PER_EMAIL", "5/60")
+REGISTER_LIMIT_PER_IP = os.getenv("REGISTER_LIMIT_PER_IP", "5/60")
+REGISTER_LIMIT_PER_EMAIL = os.getenv("REGISTER_LIMIT_PER_EMAIL", "3/3600")
+
+# KEYS: bucket-i; ARGV: (kapacitet, tokena u sekundi, cena) za svaki ključ redom.
+# Zahtev prolazi samo ako svi bucket-i imaju dovoljno tokena.
+TOKEN_BUCKET_LUA = """
+if redis.replicate_commands then redis.replicate_commands() end
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local states = {}
+local wait = 0
+
+for i = 1, #KEYS do
+  local capacity = tonumber(ARGV[(i - 1) * 3 + 1])
+  local rate = tonumber(ARGV[(i - 1) * 3 + 2])
+  local cost = tonumber(ARGV[(i - 1) * 3 + 3])
+  local state = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+  local tokens = tonumber(state[1]) or capacity
+  local ts = tonumber(state[2]) or now
+  tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+  if tokens < cost then
+    wait = math.max(wait, (cost - tokens) / rate)
+  end
+  states[i] = {tokens, capacity, rate, cost}
+end
+
+local allowed = 0
+if wait == 0 then allowed = 1 end
+
+for i = 1, #KEYS do
+  local s = states[i]
+  local tokens = s[1]
+  if allowed == 1 then tokens = tokens - s[4] end
+  redis.call('HSET', KEYS[i], 'tokens', tostring(tokens), 'ts', tostring(now))
+  redis.call('PEXPIRE', KEYS[i], math.ceil(s[2] / s[3] * 1000))
+end
+
+return {allowed, math.ceil(wait * 1000)}
+"""
+
+_script = None
+_script_client = None
+_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"allowed": 0, "limited": 0, "errors": 0})
+_stats_lock = threading.Lock()
+
+
+def parse_limit(value: str) -> Tuple[int, float]:
+    """'20/60' -> (kapacitet 20, 20/60 tokena u sekundi)"""
+    capacity, seconds = value.split("/")
+    return int(capacity), int(capacity) / float(seconds)
+
+
+def _get_script():
+    global _script, _script_client
+    redis = get_redis()
+    if _script is None or _script_client is not redis:
+        _script = redis.register_script(TOKEN_BUCKET_LUA)
+        _script_client = redis
+    return _script
+
+
+def consume(buckets: Dict[str, Tuple[int, float]], cost: int = 1) -> Tuple[bool, int]:
+    """buckets: ključ -> (kapacitet, tokena u sekundi); vraća (dozvoljeno, retry_after_ms)"""
+    keys = list(buckets)
+    args = []
+    for key in keys:
+        capacity, rate = buckets[key]
+        args.extend([capacity, rate, cost])
+
+    allowed, retry_after_ms = _get_script()(keys=keys, args=args)
+    return bool(allowed), int(retry_after_ms)
+
+
+def _record(name: str, outcome: str) -> None:
+    with _stats_lock:
+        _stats[name][outcome] += 1
+
+
+def rate_limit(name: str, per_ip: Optional[str] = None, per_email: Optional[str] = None):
+    """
+    Dekorator za rute; limiti su u obliku 'kapacitet/sekundi' (npr. '20/60').
+    Email se čita iz JSON tela zahteva.
+    """
+    ip_limit = parse_limit(per_ip) if per_ip else None
+    email_limit = parse_limit(per_email) if per_email else None
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if request.method == "OPTIONS":
+                return fn(*args, **kwargs)
+
+            buckets = {}
+            if ip_limit:
+                buckets[f"ratelimit:{name}:ip:{request.remote_addr}"] = ip_limit
+            if email_limit:
+                data = request.get_json(silent=True)
+                email = str(data.get("email") or "") if isinstance(data, dict) else ""
+                email = email.strip().lower()
+                if email:
+                    buckets[f"ratelimit:{name}:email:{email}"] = email_limit
+
+            if buckets:
+                try:
+                    allowed, retry_after_ms = consume(buckets)
+                except Exception as e:
+                    print(f"⚠️ Rate limiter unavailable, allowing request: {e}")
+                    _record(name, "errors")
+                    return fn(*args, **kwargs)
+
+                if not allowed:
+                    _record(name, "limited")
+                    retry_after = max(1, math.ceil(retry_after_ms / 1000))
+                    return (
+                        jsonify({"error": "Too many requests", "retryAfter": retry_after}),
+                        429,
+                        {"Retry-After": str(retry_after)},
+                    )
+
+            _record(name, "allowed")
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def rate_limit_stats() -> Dict:
+    with _stats_lock:
+        return {name: dict(counts) for name, counts in _stats.items()}
+
+
+register_metrics("rate_limit", rate_limit_stats)
@@ -1,13 +1,24 @@
 import os
 import redis
 
+# broj konekcija po procesu; sa gevent workerom istovremenih zahteva ima više
+# od toga, pa zahtev čeka slobodnu konekciju umesto da dobije grešku
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "100"))
+REDIS_POOL_TIMEOUT_SECONDS = float(os.getenv("REDIS_POOL_TIMEOUT_SECONDS", "5"))
+
 redis_client = None
 
 
 def init_redis():
     global redis_client
     redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-    redis_client = redis.from_url(redis_url, decode_responses=True)
+    pool = redis.BlockingConnectionPool.from_url(
+        redis_url,
+        decode_responses=True,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT_SECONDS,
+    )
+    redis_client = redis.Redis(connection_pool=pool)
     
     # Test konekcije
     try:
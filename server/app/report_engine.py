@@ -0,0 +1,291 @@
+"""
+Definicije izveštaja kao agregatnih SQL upita.
+
+Svaki izveštaj vraća samo agregate (GROUP BY u Postgres-u) i ograničen
+isečak detalja (DETAIL_LIMIT redova), tako da ni sa milionima predaja
+ništa od celih tabela ne prolazi kroz Python.
+
+Izveštaj se računa po opsezima id-jeva glavne tabele: partial() daje
+delimične agregate za jedan opseg, a merge() ih spaja. Veliki izveštaji
+se tako dele na particije koje worker pool računa paralelno.
+"""
+
+import os
+import heapq
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, func, case
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models import Course, CourseStats, User, Task, TaskSubmission
+
+DETAIL_LIMIT = int(os.getenv("REPORT_DETAIL_LIMIT", "50"))
+# ispod ovoliko redova izveštaj se ne deli na particije
+PARTITION_MIN_ROWS = int(os.getenv("REPORT_PARTITION_MIN_ROWS", "50000"))
+
+ROLES = ["ADMIN", "PROFESOR", "STUDENT"]
+
+Range = Tuple[Optional[int], Optional[int]]
+
+
+class ReportDefinition:
+    def __init__(self, name: str, id_column, partial: Callable, merge: Callable):
+        self.name = name
+        self.id_column = id_column
+        self.partial = partial
+        self.merge = merge
+
+
+REPORTS: Dict[str, ReportDefinition] = {}
+
+
+def report(name: str, id_column, merge: Callable):
+    """Registruje partial(db, lo, hi) kao izveštaj; merge(partials) spaja rezultate"""
+
+    def decorator(fn):
+        REPORTS[name] = ReportDefinition(name, id_column, fn, merge)
+        return fn
+
+    return decorator
+
+
+def _in_range(query, column, lo: Optional[int], hi: Optional[int]):
+    if lo is not None:
+        query = query.filter(column >= lo)
+    if hi is not None:
+        query = query.filter(column < hi)
+    return query
+
+
+def _top(partials: List[Dict[str, Any]], key: Callable) -> List[Dict[str, Any]]:
+    rows = (row for p in partials for row in p["detail"])
+    return heapq.nsmallest(DETAIL_LIMIT, rows, key=key)
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _merge_courses(partials):
+    courses = _top(partials, key=lambda c: (-c["enrollments"], c["id"]))
+    return {
+        "total": sum(p["total"] for p in partials),
+        "total_enrollments": sum(p["total_enrollments"] for p in partials),
+        "total_tasks": sum(p["total_tasks"] for p in partials),
+        "courses": courses,
+    }
+
+
+@report("courses", Course.id, _merge_courses)
+def courses_partial(db: Session, lo: Optional[int] = None, hi: Optional[int] = None):
+    # brojači dolaze iz course_stats (app.course_stats) - bez brojanja upisa i zadataka
+    enrollment_count = func.coalesce(CourseStats.enrollment_count, 0)
+    task_count = func.coalesce(CourseStats.task_count, 0)
+
+    rows = (
+        _in_range(
+            db.query(
+                Course.id,
+                Course.name,
+                User.email,
+                enrollment_count.label("enrollments"),
+                task_count.label("tasks"),
+                func.coalesce(CourseStats.submission_count, 0).label("submissions"),
+                CourseStats.graded_count,
+                CourseStats.grade_sum,
+                func.count().over().label("total"),
+                func.sum(enrollment_count).over().label("total_enrollments"),
+                func.sum(task_count).over().label("total_tasks"),
+            ),
+            Course.id, lo, hi,
+        )
+        .join(User, User.id == Course.professor_id)
+        .outerjoin(CourseStats, CourseStats.course_id == Course.id)
+        .order_by(enrollment_count.desc(), Course.id)
+        .limit(DETAIL_LIMIT)
+        .all()
+    )
+
+    first = rows[0] if rows else None
+    return {
+        "total": first.total if first else 0,
+        "total_enrollments": int(first.total_enrollments) if first else 0,
+        "total_tasks": int(first.total_tasks) if first else 0,
+        "detail": [
+            {
+                "id": r.id,
+                "name": r.name,
+                "professor": r.email,
+                "enrollments": r.enrollments,
+                "tasks": r.tasks,
+                "submissions": r.submissions,
+                "avg_grade": r.grade_sum / r.graded_count if r.graded_count else None,
+            }
+            for r in rows
+        ],
+    }
+
+
+def _merge_users(partials):
+    by_role = {role: 0 for role in ROLES}
+    for p in partials:
+        for role, count in p["by_role"].items():
+            by_role[role] = by_role.get(role, 0) + count
+
+    users = _top(partials, key=lambda u: (-u["created_at"].timestamp(), -u["id"]))
+    return {
+        "total": sum(by_role.values()),
+        "by_role": by_role,
+        "users": [
+            {"id": u["id"], "email": u["email"], "role": u["role"], "name": u["name"]}
+            for u in users
+        ],
+    }
+
+
+@report("users", User.id, _merge_users)
+def users_partial(db: Session, lo: Optional[int] = None, hi: Optional[int] = None):
+    by_role = dict(
+        _in_range(db.query(User.role, func.count()), User.id, lo, hi).group_by(User.role).all()
+    )
+
+    users = (
+        _in_range(
+            db.query(User.id, User.email, User.role, User.first_name, User.last_name, User.created_at),
+            User.id, lo, hi,
+        )
+        .order_by(User.created_at.desc(), User.id.desc())
+        .limit(DETAIL_LIMIT)
+        .all()
+    )
+
+    return {
+        "by_role": by_role,
+        "detail": [
+            {
+                "id": u.id,
+                "email": u.email,
+                "role": u.role,
+                "name": f"{u.first_name} {u.last_name}",
+                "created_at": u.created_at,
+            }
+            for u in users
+        ],
+    }
+
+
+def _merge_submissions(partials):
+    total = sum(p["total"] for p in partials)
+    graded = sum(p["graded"] for p in partials)
+    grade_sum = sum(p["grade_sum"] for p in partials)
+    grade_count = sum(p["grade_count"] for p in partials)
+
+    submissions = _top(partials, key=lambda s: (-s["submitted_at"].timestamp(), -s["id"]))
+    for s in submissions:
+        s["submitted_at"] = _iso(s["submitted_at"])
+
+    return {
+        "total": total,
+        "graded": graded,
+        "pending": total - graded,
+        "avg_grade": grade_sum / max(grade_count, 1),
+        "submissions": submissions,
+    }
+
+
+@report("submissions", TaskSubmission.id, _merge_submissions)
+def submissions_partial(db: Session, lo: Optional[int] = None, hi: Optional[int] = None):
+    nonzero_grade = case((TaskSubmission.grade != 0, TaskSubmission.grade))
+    total, graded, grade_sum, grade_count = _in_range(
+        db.query(
+            func.count(TaskSubmission.id),
+            func.count(TaskSubmission.grade),
+            func.sum(nonzero_grade),
+            func.count(nonzero_grade),
+        ),
+        TaskSubmission.id, lo, hi,
+    ).one()
+
+    submissions = (
+        _in_range(
+            db.query(
+                TaskSubmission.id,
+                Task.title,
+                User.email,
+                TaskSubmission.grade,
+                TaskSubmission.submitted_at,
+            ),
+            TaskSubmission.id, lo, hi,
+        )
+        .join(Task, Task.id == TaskSubmission.task_id)
+        .join(User, User.id == TaskSubmission.student_id)
+        .order_by(TaskSubmission.submitted_at.desc(), TaskSubmission.id.desc())
+        .limit(DETAIL_LIMIT)
+        .all()
+    )
+
+    return {
+        "total": total,
+        "graded": graded,
+        "grade_sum": int(grade_sum or 0),
+        "grade_count": grade_count,
+        "detail": [
+            {
+                "id": s.id,
+                "task": s.title,
+                "student": s.email,
+                "grade": s.grade,
+                "submitted_at": s.submitted_at,
+            }
+            for s in submissions
+        ],
+    }
+
+
+def plan_partitions(db: Session, report_type: str, workers: int) -> List[Range]:
+    """Deli opseg id-jeva glavne tabele na najviše `workers` jednakih delova"""
+    id_column = REPORTS[report_type].id_column
+    lo, hi, count = db.query(func.min(id_column), func.max(id_column), func.count(id_column)).one()
+
+    if not count or count < PARTITION_MIN_ROWS or workers < 2:
+        return [(None, None)]
+
+    step = -(-(hi - lo + 1) // workers)
+    return [(start, start + step) for start in range(lo, hi + 1, step)]
+
+
+def compute_partial(db: Session, report_type: str, lo: Optional[int], hi: Optional[int]):
+    return REPORTS[report_type].partial(db, lo, hi)
+
+
+def merge_report(report_type: str, partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return REPORTS[report_type].merge(partials)
+
+
+def build_report(db: Session, report_type: str) -> Dict[str, Any]:
+    """Ceo izveštaj u jednom procesu (jedna particija)"""
+    if report_type not in REPORTS:
+        raise ValueError(f"Unknown report type: {report_type}")
+    return merge_report(report_type, [compute_partial(db, report_type, None, None)])
+
+
+_worker_sessionmaker = None
+
+
+def worker_session() -> Session:
+    """
+    Sesija za procese iz worker pool-a - svaki proces pravi svoj mali engine
+    pri prvom pozivu i ne deli konekcije sa roditeljem.
+    """
+    global _worker_sessionmaker
+    if _worker_sessionmaker is None:
+        from app.database import DATABASE_URL
+
+        engine = create_engine(
+            DATABASE_URL,
+            pool_pre_ping=True,
+            pool_size=int(os.getenv("REPORT_WORKER_POOL_SIZE", "1")),
+            max_overflow=0,
+        )
+        _worker_sessionmaker = sessionmaker(bind=engine, autoflush=False)
+    return _worker_sessionmaker()
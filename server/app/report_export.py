@@ -0,0 +1,129 @@
+"""
+Streaming izvoz izveštaja u CSV ili NDJSON.
+
+Redovi se čitaju serverskim kursorom (stream_results) u paketima od
+EXPORT_BATCH_SIZE (yield_per) i odmah pišu u odgovor, pa memorija ostaje
+konstantna i za izvoz celih tabela.
+
+Generator se izvršava dok se odgovor šalje, posle same rute, pa koristi
+svoju sesiju: scoped SessionLocal je ista sesija za sav kod u toj niti, pa
+bi svaki db.close() u njoj zatvorio kursor usred izvoza.
+"""
+
+import os
+import io
+import csv
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.fastjson import dumps
+from app.models import Course, User, Task, TaskSubmission
+
+EXPORT_BATCH_SIZE = int(os.getenv("REPORT_EXPORT_BATCH_SIZE", "1000"))
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# tip izveštaja -> (nazivi kolona, funkcija (db) -> upit sa tim kolonama)
+EXPORTS: Dict[str, Tuple[List[str], Callable[[Session], Any]]] = {
+    "courses": (
+        ["id", "name", "professor", "created_at"],
+        lambda db: db.query(Course.id, Course.name, User.email, Course.created_at)
+        .join(User, User.id == Course.professor_id)
+        .order_by(Course.id),
+    ),
+    "users": (
+        ["id", "email", "role", "first_name", "last_name", "created_at"],
+        lambda db: db.query(
+            User.id, User.email, User.role, User.first_name, User.last_name, User.created_at
+        ).order_by(User.id),
+    ),
+    "submissions": (
+        ["id", "task", "student", "grade", "submitted_at", "graded_at"],
+        lambda db: db.query(
+            TaskSubmission.id,
+            Task.title,
+            User.email,
+            TaskSubmission.grade,
+            TaskSubmission.submitted_at,
+            TaskSubmission.graded_at,
+        )
+        .join(Task, Task.id == TaskSubmission.task_id)
+        .join(User, User.id == TaskSubmission.student_id)
+        .order_by(TaskSubmission.id),
+    ),
+}
+
+
+def _value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _rows(report_type: str) -> Iterator[Sequence[Any]]:
+    _, build_query = EXPORTS[report_type]
+    db = Session(bind=engine)
+    try:
+        query = build_query(db).execution_options(
+            stream_results=True, yield_per=EXPORT_BATCH_SIZE
+        )
+        for row in query:
+            yield row
+    finally:
+        db.close()
+
+
+def _csv_chunks(columns: List[str], rows: Iterator[Sequence[Any]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # zaglavlje ide odmah, pre prvog paketa iz baze
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    for i, row in enumerate(rows, start=1):
+        writer.writerow([_value(v) for v in row])
+        if i % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(columns: List[str], rows: Iterator[Sequence[Any]]) -> Iterator[str]:
+    lines = []
+    for row in rows:
+        lines.append(dumps(dict(zip(columns, row))))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+WRITERS = {
+    "csv": _csv_chunks,
+    "ndjson": _ndjson_chunks,
+}
+
+
+def export_report(report_type: str, fmt: str) -> Iterator[str]:
+    """Generator delova izvoza; sesiju otvara i zatvara sam"""
+    if report_type not in EXPORTS:
+        raise ValueError(f"Unknown report type: {report_type}")
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    columns, _ = EXPORTS[report_type]
+    return WRITERS[fmt](columns, _rows(report_type))
@@ -1,59 +1,80 @@
 from flask import Blueprint, request, jsonify
-from passlib.hash import pbkdf2_sha256
+from sqlalchemy.orm import Session
 
-from .db import db
-from .models import User, CourseRequest, Course
-from .auth import session_required, role_required
-from .socketio_app import socketio
-from .email_utils import send_email
+from app.models import User, CourseRequest, Course, CourseEnrollment, Task, TaskSubmission
+from app.auth import session_required, role_required, busy_response
+from app.passwords import hash_password, PasswordHasherBusy
+from app.socketio_app import socketio, buffered_emit
+from app.outbox import enqueue_email
+from app.database import SessionLocal
+from app.pagination import paginate, PaginationError
+from app.serializers import COURSE_REQUEST_LIST
+from app.cache import bump, COURSES_CACHE, USER_CACHE
+from app.course_stats import rebuild as rebuild_course_stats
+from app.metrics import collect_metrics
+from app.user_import import FORMATS as IMPORT_FORMATS, USER_IMPORT_MAX_BYTES
+from app import jobs
+
+admin_bp = Blueprint("admin", __name__, url_prefix="/api/admin")
 
-admin_bp = Blueprint("admin_bp", __name__)
 
 @admin_bp.post("/users")
 @session_required
 @role_required("ADMIN")
 def create_user():
     """ADMIN kreira novog korisnika (PROFESOR ili STUDENT)"""
-    data = request.get_json() or {}
-
-    required_fields = [
-        "firstName", "lastName", "email", "password",
-        "birthDate", "gender", "country", "street", "number", "role"
-    ]
-
-    missing = [f for f in required_fields if f not in data or str(data[f]).strip() == ""]
-    if missing:
-        return jsonify({"error": f"Missing fields: {', '.join(missing)}"}), 400
-
-    email = data["email"].strip().lower()
-    role = data["role"].strip().upper()
-
-    if role not in ["STUDENT", "PROFESOR"]:
-        return jsonify({"error": "Role must be STUDENT or PROFESOR"}), 400
-
-    if User.query.filter_by(email=email).first():
-        return jsonify({"error": "Email already exists"}), 409
-
-    password = str(data["password"])
-    password_hash = pbkdf2_sha256.hash(password)
-
-    user = User(
-        first_name=data["firstName"].strip(),
-        last_name=data["lastName"].strip(),
-        email=email,
-        birth_date=str(data["birthDate"]).strip(),
-        gender=str(data["gender"]).strip(),
-        country=data["country"].strip(),
-        street=data["street"].strip(),
-        number=str(data["number"]).strip(),
-        role=role,
-        password_hash=password_hash
-    )
-
-    db.session.add(user)
-    db.session.commit()
-
-    return jsonify(user.to_dict()), 201
+    db: Session = SessionLocal()
+    try:
+        data = request.get_json() or {}
+
+        required_fields = [
+            "firstName", "lastName", "email", "password",
+            "birthDate", "gender", "country", "street", "number", "role"
+        ]
+
+        missing = [f for f in required_fields if f not in data or str(data[f]).strip() == ""]
+        if missing:
+            return jsonify({"error": f"Missing fields: {', '.join(missing)}"}), 400
+
+        email = data["email"].strip().lower()
+        role = data["role"].strip().upper()
+
+        if role not in ["STUDENT", "PROFESOR"]:
+            return jsonify({"error": "Role must be STUDENT or PROFESOR"}), 400
+
+        if db.query(User).filter(User.email == email).first():
+            return jsonify({"error": "Email already exists"}), 409
+
+        password = str(data["password"])
+        password_hash = hash_password(password)
+
+        user = User(
+            first_name=data["firstName"].strip(),
+            last_name=data["lastName"].strip(),
+            email=email,
+            birth_date=str(data["birthDate"]).strip(),
+            gender=str(data["gender"]).strip(),
+            country=data["country"].strip(),
+            street=data["street"].strip(),
+            number=str(data["number"]).strip(),
+            role=role,
+            password_hash=password_hash
+        )
+
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+
+        return jsonify(user.to_dict()), 201
+
+    except PasswordHasherBusy:
+        db.rollback()
+        return busy_response()
+    except Exception as e:
+        db.rollback()
+        return jsonify({"error": "Failed to create user", "detail": str(e)}), 500
+    finally:
+        db.close()
 
 
 @admin_bp.get("/users")
@@ -61,8 +82,63 @@ def create_user():
 @role_required("ADMIN")
 def list_users():
     """ADMIN listuje sve korisnike"""
-    users = User.query.all()
-    return jsonify([u.to_dict() for u in users]), 200
+    db: Session = SessionLocal()
+    try:
+        page = paginate(db.query(User), User.created_at, User.id)
+        return jsonify(page), 200
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+    finally:
+        db.close()
+
+
+@admin_bp.post("/users/import")
+@session_required
+@role_required("ADMIN")
+def import_users():
+    """ADMIN masovno uvozi korisnike iz CSV ili NDJSON fajla - izvršava se kao posao"""
+    upload = request.files.get("file")
+    if upload:
+        raw = upload.read(USER_IMPORT_MAX_BYTES + 1)
+        filename = upload.filename or ""
+    else:
+        raw = request.get_data()[:USER_IMPORT_MAX_BYTES + 1]
+        filename = ""
+
+    if len(raw) > USER_IMPORT_MAX_BYTES:
+        return jsonify({"error": f"File is larger than {USER_IMPORT_MAX_BYTES} bytes"}), 413
+
+    fmt = (request.args.get("format") or "").lower()
+    if not fmt:
+        if filename.lower().endswith(".csv") or "csv" in (request.content_type or ""):
+            fmt = "csv"
+        elif filename.lower().endswith((".ndjson", ".jsonl")) or "ndjson" in (request.content_type or ""):
+            fmt = "ndjson"
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({"error": "Format must be csv or ndjson"}), 400
+
+    try:
+        content = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return jsonify({"error": "File must be UTF-8 encoded"}), 400
+
+    if not content.strip():
+        return jsonify({"error": "File is empty"}), 400
+
+    # sadržaj sa lozinkama ne ide u heš posla (živi JOB_TTL_SECONDS) već u
+    # ključ sa kratkim TTL-om koji worker briše pri preuzimanju
+    job_id = jobs.enqueue(
+        "user_import",
+        {"format": fmt},
+        user_id=request.user.get("user_id"),
+        secret={"content": content},
+    )
+
+    return jsonify({
+        "message": "User import started",
+        "jobId": job_id,
+        "status": "queued"
+    }), 202
 
 
 @admin_bp.delete("/users/<int:user_id>")
@@ -70,22 +146,68 @@ def list_users():
 @role_required("ADMIN")
 def delete_user(user_id):
     """ADMIN briše korisnika"""
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({"error": "User not found"}), 404
-
-    db.session.delete(user)
-    db.session.commit()
-    return jsonify({"status": "deleted"}), 200
+    db: Session = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+
+        was_professor = user.role == "PROFESOR"
+
+        # kaskadno brisanje upisa i predaja menja statistiku tih kurseva
+        affected_courses = {
+            course_id for (course_id,) in
+            db.query(CourseEnrollment.course_id).filter(CourseEnrollment.student_id == user_id)
+        }
+        affected_courses.update(
+            course_id for (course_id,) in
+            db.query(Task.course_id).join(TaskSubmission, TaskSubmission.task_id == Task.id)
+            .filter(TaskSubmission.student_id == user_id)
+            .distinct()
+        )
+
+        db.delete(user)
+        db.flush()
+        rebuild_course_stats(db, affected_courses)
+        db.commit()
+        bump(USER_CACHE.format(user_id=user_id))
+
+        if was_professor:
+            bump(COURSES_CACHE)
+
+        return jsonify({"status": "deleted"}), 200
+
+    except Exception as e:
+        db.rollback()
+        return jsonify({"error": "Failed to delete user", "detail": str(e)}), 500
+    finally:
+        db.close()
 
 
 @admin_bp.get("/course-requests")
 @session_required
 @role_required("ADMIN")
 def list_course_requests():
-    """ADMIN vidi sve zahteve za kurseve"""
-    requests = CourseRequest.query.all()
-    return jsonify([r.to_dict() for r in requests]), 200
+    """ADMIN vidi sve zahteve za kurseve (opciono filtrirano po statusu)"""
+    db: Session = SessionLocal()
+    try:
+        query = db.query(CourseRequest)
+
+        status = (request.args.get("status") or "").strip().upper()
+        if status:
+            query = query.filter(CourseRequest.status == status)
+
+        page = paginate(
+            query,
+            CourseRequest.created_at,
+            CourseRequest.id,
+            options=COURSE_REQUEST_LIST,
+        )
+        return jsonify(page), 200
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+    finally:
+        db.close()
 
 
 @admin_bp.post("/course-requests/<int:request_id>/approve")
@@ -93,33 +215,48 @@ def list_course_requests():
 @role_required("ADMIN")
 def approve_course_request(request_id):
     """ADMIN odobrava zahtev za kurs"""
-    course_req = CourseRequest.query.get(request_id)
-    if not course_req:
-        return jsonify({"error": "Request not found"}), 404
-
-    if course_req.status != "PENDING":
-        return jsonify({"error": "Request is not pending"}), 409
-
-    course = Course(
-        professor_id=course_req.professor_id,
-        name=course_req.name,
-        description=course_req.description
-    )
-    db.session.add(course)
-    
-    course_req.status = "APPROVED"
-    db.session.commit()
-
-    professor = User.query.get(course_req.professor_id)
-    send_email(
-        to=professor.email,
-        subject="Zahtev za kurs odobren",
-        body=f"Vaš zahtev za kurs '{course.name}' je odobren!"
-    )
-
-    socketio.emit("course_request.approved", course_req.to_dict(), room=f"user:{professor.id}")
-
-    return jsonify(course_req.to_dict()), 200
+    db: Session = SessionLocal()
+    try:
+        course_req = db.query(CourseRequest).filter(CourseRequest.id == request_id).first()
+        if not course_req:
+            return jsonify({"error": "Request not found"}), 404
+
+        if course_req.status != "PENDING":
+            return jsonify({"error": "Request is not pending"}), 409
+
+        course = Course(
+            professor_id=course_req.professor_id,
+            name=course_req.name,
+            description=course_req.description
+        )
+        db.add(course)
+
+        course_req.status = "APPROVED"
+
+        professor = course_req.professor
+        enqueue_email(
+            db,
+            to=professor.email,
+            subject="Zahtev za kurs odobren",
+            body=f"Vaš zahtev za kurs '{course.name}' je odobren!"
+        )
+
+        db.commit()
+        bump(COURSES_CACHE)
+        db.refresh(course_req)
+
+        payload = course_req.to_dict()
+        # lična soba ostaje na pojedinačnim događajima; batch ide samo adminima
+        socketio.emit("course_request.approved", payload, room=f"user:{professor.id}")
+        buffered_emit("course_request.approved", payload, room="admins")
+
+        return jsonify(payload), 200
+
+    except Exception as e:
+        db.rollback()
+        return jsonify({"error": "Failed to approve request", "detail": str(e)}), 500
+    finally:
+        db.close()
 
 
 @admin_bp.post("/course-requests/<int:request_id>/reject")
@@ -127,23 +264,44 @@ def approve_course_request(request_id):
 @role_required("ADMIN")
 def reject_course_request(request_id):
     """ADMIN odbija zahtev za kurs"""
-    course_req = CourseRequest.query.get(request_id)
-    if not course_req:
-        return jsonify({"error": "Request not found"}), 404
+    db: Session = SessionLocal()
+    try:
+        course_req = db.query(CourseRequest).filter(CourseRequest.id == request_id).first()
+        if not course_req:
+            return jsonify({"error": "Request not found"}), 404
 
-    if course_req.status != "PENDING":
-        return jsonify({"error": "Request is not pending"}), 409
+        if course_req.status != "PENDING":
+            return jsonify({"error": "Request is not pending"}), 409
 
-    course_req.status = "REJECTED"
-    db.session.commit()
+        course_req.status = "REJECTED"
 
-    professor = User.query.get(course_req.professor_id)
-    send_email(
-        to=professor.email,
-        subject="Zahtev za kurs odbijen",
-        body=f"Vaš zahtev za kurs '{course_req.name}' je odbijen."
-    )
+        professor = course_req.professor
+        enqueue_email(
+            db,
+            to=professor.email,
+            subject="Zahtev za kurs odbijen",
+            body=f"Vaš zahtev za kurs '{course_req.name}' je odbijen."
+        )
 
-    socketio.emit("course_request.rejected", course_req.to_dict(), room=f"user:{professor.id}")
+        db.commit()
+        db.refresh(course_req)
 
-    return jsonify(course_req.to_dict()), 200
\ No newline at end of file
+        payload = course_req.to_dict()
+        socketio.emit("course_request.rejected", payload, room=f"user:{professor.id}")
+        buffered_emit("course_request.rejected", payload, room="admins")
+
+        return jsonify(payload), 200
+
+    except Exception as e:
+        db.rollback()
+        return jsonify({"error": "Failed to reject request", "detail": str(e)}), 500
+    finally:
+        db.close()
+
+
+@admin_bp.get("/metrics")
+@session_required
+@role_required("ADMIN")
+def get_metrics():
+    """ADMIN vidi metrike (keš, ...)"""
+    return jsonify(collect_metrics()), 200
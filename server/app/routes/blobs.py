@@ -0,0 +1,69 @@
+import mimetypes
+
+from flask import Blueprint, jsonify, send_file, redirect
+
+from app.blob_store import get_blob_store, is_blob_ref, blob_url, open_value, BlobError
+from app.signed_urls import signed_url_required, SIGNED_URL_TTL_SECONDS
+
+blobs_bp = Blueprint("blobs", __name__, url_prefix="/api/blobs")
+
+# samo ovi tipovi se prikazuju u browseru, sve ostalo ide kao attachment
+INLINE_TYPES = {
+    "application/pdf",
+    "image/png",
+    "image/jpeg",
+    "image/gif",
+    "image/webp",
+}
+
+
+@blobs_bp.get("/<name>")
+@signed_url_required
+def get_blob(name):
+    """Stream sadržaja po SHA-256 adresi; sadržaj se ne menja, ali je privatan"""
+    digest, _, ext = name.partition(".")
+    store = get_blob_store()
+
+    try:
+        if not store.exists(digest):
+            return jsonify({"error": "Blob not found"}), 404
+        fileobj = store.open(digest)
+    except BlobError as e:
+        return jsonify({"error": str(e)}), 404
+
+    mime = mimetypes.types_map.get(f".{ext}", "application/octet-stream")
+    inline = mime in INLINE_TYPES
+
+    response = send_file(
+        fileobj,
+        mimetype=mime if inline else "application/octet-stream",
+        as_attachment=not inline,
+        download_name=name,
+        etag=digest,
+        conditional=True,
+    )
+    # predaje i slike su lični podaci - samo browser korisnika sme da ih kešira
+    response.headers["Cache-Control"] = f"private, max-age={SIGNED_URL_TTL_SECONDS}, immutable"
+    response.headers["X-Content-Type-Options"] = "nosniff"
+    return response
+
+
+def send_value(value, download_name):
+    """Odgovor za sadržaj kolone: blob -> redirect na potpisan URL, data URL -> stream"""
+    if is_blob_ref(value):
+        return redirect(blob_url(value), code=302)
+
+    try:
+        fileobj, mime = open_value(value)
+    except BlobError as e:
+        return jsonify({"error": str(e)}), 404
+
+    inline = mime in INLINE_TYPES
+    response = send_file(
+        fileobj,
+        mimetype=mime if inline else "application/octet-stream",
+        as_attachment=not inline,
+        download_name=download_name,
+    )
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
@@ -1,14 +1,17 @@
 """
-Reports route - Demonstracija upotrebe multiprocessing-a za generisanje izveštaja
+Reports route - izveštaji i masovni email idu kao poslovi kroz Redis red
+(app.jobs), a izvršava ih app.job_worker
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from sqlalchemy.orm import Session
 
-from app.models import Course, User, Task, TaskSubmission, CourseEnrollment
 from app.auth import session_required, role_required
 from app.database import SessionLocal
-from app.process_handler import process_manager
+from app import jobs
+from app.job_handlers import recipient_query
+from app.report_engine import REPORTS
+from app.report_export import FORMATS, export_report
 
 reports_bp = Blueprint("reports", __name__, url_prefix="/api/reports")
 
@@ -17,106 +20,81 @@ reports_bp = Blueprint("reports", __name__, url_prefix="/api/reports")
 @session_required
 @role_required("ADMIN", "PROFESOR")
 def generate_report():
-    db: Session = SessionLocal()
-    try:
-        data = request.get_json() or {}
-        report_type = data.get("type", "courses")
-        report_format = data.get("format", "json")
-        
-        if report_type not in ["courses", "users", "submissions"]:
-            return jsonify({"error": "Invalid report type"}), 400
-        
-        report_data = {}
-        
-        if report_type == "courses":
-            courses = db.query(Course).all()
-            report_data = {
-                "total": len(courses),
-                "courses": [
-                    {
-                        "id": c.id,
-                        "name": c.name,
-                        "professor": c.professor.email,
-                        "enrollments": len(c.enrollments),
-                        "tasks": len(c.tasks)
-                    }
-                    for c in courses
-                ]
-            }
-        
-        elif report_type == "users":
-            users = db.query(User).all()
-            report_data = {
-                "total": len(users),
-                "by_role": {
-                    "ADMIN": len([u for u in users if u.role == "ADMIN"]),
-                    "PROFESOR": len([u for u in users if u.role == "PROFESOR"]),
-                    "STUDENT": len([u for u in users if u.role == "STUDENT"])
-                },
-                "users": [
-                    {
-                        "id": u.id,
-                        "email": u.email,
-                        "role": u.role,
-                        "name": f"{u.first_name} {u.last_name}"
-                    }
-                    for u in users
-                ]
-            }
-        
-        elif report_type == "submissions":
-            submissions = db.query(TaskSubmission).all()
-            report_data = {
-                "total": len(submissions),
-                "graded": len([s for s in submissions if s.grade is not None]),
-                "pending": len([s for s in submissions if s.grade is None]),
-                "avg_grade": sum([s.grade for s in submissions if s.grade]) / max(len([s for s in submissions if s.grade]), 1),
-                "submissions": [
-                    {
-                        "id": s.id,
-                        "task": s.task.title,
-                        "student": s.student.email,
-                        "grade": s.grade,
-                        "submitted_at": s.submitted_at.isoformat()
-                    }
-                    for s in submissions[:50]  
-                ]
-            }
-        
-        process = process_manager.generate_report(
-            report_type=report_type,
-            data={
-                "format": report_format,
-                "content": report_data,
-                "requested_by": request.user.get("user_id")
-            }
+    """Streaming izvoz (csv/ndjson) ili posao koji izveštaj računa u worker-ima"""
+    data = request.get_json() or {}
+    report_type = data.get("type", "courses")
+    report_format = data.get("format", "json")
+    
+    if report_type not in REPORTS:
+        return jsonify({"error": "Invalid report type"}), 400
+    
+    if report_format in FORMATS:
+        filename = f"{report_type}-report.{report_format}"
+        return Response(
+            stream_with_context(export_report(report_type, report_format)),
+            mimetype=FORMATS[report_format],
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
         )
-        
-        return jsonify({
-            "message": "Report generation started",
-            "process_id": process.pid,
-            "report_type": report_type,
-            "status": "processing"
-        }), 202
-        
-    finally:
-        db.close()
+    
+    if report_format != "json":
+        return jsonify({"error": "Invalid report format"}), 400
+    
+    job_id = jobs.enqueue(
+        "report",
+        {
+            "type": report_type,
+            "format": report_format,
+            "requested_by": request.user.get("user_id")
+        },
+        user_id=request.user.get("user_id"),
+    )
+    
+    return jsonify({
+        "message": "Report generation started",
+        "jobId": job_id,
+        "report_type": report_type,
+        "status": "queued"
+    }), 202
 
 
 @reports_bp.get("/status")
 @session_required
 @role_required("ADMIN", "PROFESOR")
 def get_report_status():
-    active_count = process_manager.get_active_count()
-    results = process_manager.get_results()
+    """Sažetak poslova trenutnog korisnika"""
+    user_jobs = jobs.list_jobs(request.user.get("user_id"))
     
     return jsonify({
-        "active_processes": active_count,
-        "completed_reports": len(results),
-        "results": results
+        "active_jobs": len([j for j in user_jobs if j["status"] in ("queued", "running")]),
+        "completed_jobs": len([j for j in user_jobs if j["status"] == "completed"]),
+        "jobs": user_jobs
     }), 200
 
 
+@reports_bp.get("/jobs")
+@session_required
+@role_required("ADMIN", "PROFESOR")
+def list_my_jobs():
+    """Poslovi trenutnog korisnika (bez rezultata)"""
+    return jsonify(jobs.list_jobs(request.user.get("user_id"))), 200
+
+
+@reports_bp.get("/jobs/<job_id>")
+@session_required
+@role_required("ADMIN", "PROFESOR")
+def get_job(job_id):
+    """Status, progres i rezultat posla - vidi ga samo vlasnik ili ADMIN"""
+    job = jobs.get_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    
+    user = request.user
+    if job["userId"] != user.get("user_id") and user.get("role") != "ADMIN":
+        return jsonify({"error": "Job not found"}), 404
+    
+    return jsonify(job), 200
+
+
 @reports_bp.post("/email/bulk")
 @session_required
 @role_required("ADMIN", "PROFESOR")
@@ -133,39 +111,31 @@ def send_bulk_emails():
         if not body:
             return jsonify({"error": "Email body is required"}), 400
         
-        recipients = []
-        
-        if recipient_type == "all_students":
-            students = db.query(User).filter(User.role == "STUDENT").all()
-            recipients = [{"to": s.email, "subject": subject, "body": body} for s in students]
+        if recipient_type not in ["all_students", "all_professors", "course_students"]:
+            return jsonify({"error": "Invalid recipient_type"}), 400
         
-        elif recipient_type == "all_professors":
-            professors = db.query(User).filter(User.role == "PROFESOR").all()
-            recipients = [{"to": p.email, "subject": subject, "body": body} for p in professors]
+        course_id = data.get("course_id")
+        if recipient_type == "course_students" and not course_id:
+            return jsonify({"error": "course_id required for course_students"}), 400
         
-        elif recipient_type == "course_students":
-            course_id = data.get("course_id")
-            if not course_id:
-                return jsonify({"error": "course_id required for course_students"}), 400
-            
-            enrollments = db.query(CourseEnrollment).filter(
-                CourseEnrollment.course_id == course_id
-            ).all()
-            recipients = [
-                {"to": e.student.email, "subject": subject, "body": body}
-                for e in enrollments
-            ]
+        params = {
+            "recipient_type": recipient_type,
+            "course_id": course_id,
+            "subject": subject,
+            "body": body,
+        }
         
-        if not recipients:
+        recipient_count = recipient_query(db, params).count()
+        if not recipient_count:
             return jsonify({"error": "No recipients found"}), 400
 
-        process = process_manager.send_bulk_emails(recipients)
+        job_id = jobs.enqueue("bulk_email", params, user_id=request.user.get("user_id"))
         
         return jsonify({
             "message": "Bulk email sending started",
-            "process_id": process.pid,
-            "recipient_count": len(recipients),
-            "status": "processing"
+            "jobId": job_id,
+            "recipient_count": recipient_count,
+            "status": "queued"
         }), 202
         
     finally:
@@ -1,11 +1,19 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, send_file
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app.models import Course, Task, TaskSubmission, CourseEnrollment, User
 from app.auth import session_required, role_required
-from app.email_utils import send_email
+from app.outbox import enqueue_email, enqueue_emails
 from app.database import SessionLocal
+from app.blob_store import store_data_url, open_value, BlobError
+from app.serializers import serialize_all, TASK_LIST, SUBMISSION_LIST
+from app.pagination import paginate, PaginationError
+from app.course_stats import record as record_stats
+from app.cache import bump, COURSES_CACHE, TASKS_CACHE
+from app.etag import conditional
+from app.live import submission_delta, publish_submission_delta
 
 tasks_bp = Blueprint("tasks", __name__, url_prefix="/api/tasks")
 
@@ -49,20 +57,13 @@ def create_task():
         )
         
         db.add(task)
-        db.commit()
-        db.refresh(task)
+        record_stats(db, course.id, tasks=1)
+        
+        student_emails = db.query(User.email).join(
+            CourseEnrollment, CourseEnrollment.student_id == User.id
+        ).filter(CourseEnrollment.course_id == course_id).all()
         
-        enrollments = db.query(CourseEnrollment).filter(
-            CourseEnrollment.course_id == course_id
-        ).all()
-        
-        for enrollment in enrollments:
-            student = enrollment.student
-            try:
-                send_email(
-                    to=student.email,
-                    subject=f"Novi zadatak u kursu {course.name}",
-                    body=f"""
+        body = f"""
 Dodat je novi zadatak u kursu '{course.name}'.
 
 Zadatak: {title}
@@ -71,9 +72,14 @@ Krajnji rok: {deadline_dt.strftime('%d.%m.%Y %H:%M')}
 
 Prijavite se na platformu kako biste predali rešenje.
                     """
-                )
-            except Exception as e:
-                print(f"Failed to send email to {student.email}: {e}")
+        enqueue_emails(db, (
+            {"to": email, "subject": f"Novi zadatak u kursu {course.name}", "body": body}
+            for (email,) in student_emails
+        ))
+        
+        db.commit()
+        bump(TASKS_CACHE.format(course_id=course.id))
+        db.refresh(task)
         
         return jsonify(task.to_dict()), 201
 
@@ -86,6 +92,7 @@ Prijavite se na platformu kako biste predali rešenje.
 
 @tasks_bp.get("/course/<int:course_id>")
 @session_required
+@conditional(COURSES_CACHE, TASKS_CACHE)
 def list_course_tasks(course_id):
     """Svi korisnici mogu da vide zadatke kursa"""
     db: Session = SessionLocal()
@@ -96,9 +103,9 @@ def list_course_tasks(course_id):
         
         tasks = db.query(Task).filter(
             Task.course_id == course_id
-        ).order_by(Task.deadline.desc()).all()
+        ).order_by(Task.deadline.desc())
         
-        return jsonify([t.to_dict() for t in tasks]), 200
+        return jsonify(serialize_all(tasks, TASK_LIST)), 200
     finally:
         db.close()
 
@@ -136,19 +143,29 @@ def submit_task(task_id):
         if not file_path.startswith('data:'):
             return jsonify({"error": "Invalid file format - expected Base64 data URL"}), 400
         
+        try:
+            file_ref, file_size = store_data_url(file_path)
+        except BlobError as e:
+            return jsonify({"error": str(e)}), 400
+        
         existing = db.query(TaskSubmission).filter(
             TaskSubmission.task_id == task_id,
             TaskSubmission.student_id == student_id
         ).first()
         
         if existing:
-            existing.file_path = file_path
+            # ponovna predaja briše staru ocenu
+            if existing.grade is not None:
+                record_stats(db, task.course_id, graded=-1, grade_sum=-existing.grade)
+            existing.file_path = file_ref
+            existing.file_size = file_size
             existing.submitted_at = datetime.utcnow()
             existing.grade = None
             existing.comment = None
             existing.graded_at = None
             db.commit()
             db.refresh(existing)
+            publish_submission_delta(submission_delta(existing, task.course_id, "resubmitted"))
             
             return jsonify({
                 **existing.to_dict(),
@@ -157,19 +174,19 @@ def submit_task(task_id):
         submission = TaskSubmission(
             task_id=task_id,
             student_id=student_id,
-            file_path=file_path  
+            file_path=file_ref,
+            file_size=file_size
         )
         
         db.add(submission)
-        db.commit()
-        db.refresh(submission)
+        record_stats(db, task.course_id, submissions=1)
         
         professor = task.course.professor
-        try:
-            send_email(
-                to=professor.email,
-                subject=f"Novo rešenje za zadatak '{task.title}'",
-                body=f"""
+        enqueue_email(
+            db,
+            to=professor.email,
+            subject=f"Novo rešenje za zadatak '{task.title}'",
+            body=f"""
 Student {request.user.get('email')} je predao rešenje za zadatak '{task.title}'.
 
 Kurs: {task.course.name}
@@ -178,16 +195,22 @@ Fajl: {file_name}
 Vreme predaje: {datetime.utcnow().strftime('%d.%m.%Y %H:%M')}
 
 Prijavite se na platformu da ocenite rešenje.
-                """
-            )
-        except Exception as e:
-            print(f"Failed to send email to professor: {e}")
+            """
+        )
+        
+        db.commit()
+        db.refresh(submission)
+        publish_submission_delta(submission_delta(submission, task.course_id, "submitted"))
         
         return jsonify({
             **submission.to_dict(),
             "message": "Zadatak uspešno predat!"
         }), 201
 
+    except IntegrityError:
+        # istovremena prva predaja istog studenta - unique indeks na (task_id, student_id)
+        db.rollback()
+        return jsonify({"error": "Submission already in progress, please retry"}), 409
     except Exception as e:
         db.rollback()
         print(f"❌ Submit error: {e}")
@@ -210,11 +233,16 @@ def list_task_submissions(task_id):
         if task.course.professor_id != professor_id:
             return jsonify({"error": "You are not the owner of this course"}), 403
         
-        submissions = db.query(TaskSubmission).filter(
-            TaskSubmission.task_id == task_id
-        ).order_by(TaskSubmission.submitted_at.desc()).all()
+        page = paginate(
+            db.query(TaskSubmission).filter(TaskSubmission.task_id == task_id),
+            TaskSubmission.submitted_at,
+            TaskSubmission.id,
+            options=SUBMISSION_LIST,
+        )
         
-        return jsonify([s.to_dict() for s in submissions]), 200
+        return jsonify(page), 200
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
     finally:
         db.close()
 
@@ -225,9 +253,10 @@ def list_task_submissions(task_id):
 def grade_submission(submission_id):
     db: Session = SessionLocal()
     try:
+        # zaključava red da dve istovremene ocene ne bi dva puta uvećale brojače
         submission = db.query(TaskSubmission).filter(
             TaskSubmission.id == submission_id
-        ).first()
+        ).with_for_update().first()
         
         if not submission:
             return jsonify({"error": "Submission not found"}), 404
@@ -250,30 +279,34 @@ def grade_submission(submission_id):
         except (ValueError, TypeError):
             return jsonify({"error": "grade must be an integer between 1 and 5"}), 400
         
+        if submission.grade is None:
+            record_stats(db, submission.task.course_id, graded=1, grade_sum=grade)
+        else:
+            record_stats(db, submission.task.course_id, grade_sum=grade - submission.grade)
+        
         submission.grade = grade
         submission.comment = comment
         submission.graded_at = datetime.utcnow()
         
-        db.commit()
-        db.refresh(submission)
-        
-        # Slanje email-a studentu
+        # Email studentu ide u outbox, u istoj transakciji kao ocena
         student = submission.student
-        try:
-            send_email(
-                to=student.email,
-                subject=f"Ocena za zadatak '{submission.task.title}'",
-                body=f"""
+        enqueue_email(
+            db,
+            to=student.email,
+            subject=f"Ocena za zadatak '{submission.task.title}'",
+            body=f"""
 Vaše rešenje za zadatak '{submission.task.title}' je ocenjeno.
 
 Ocena: {grade}/5
 Komentar profesora: {comment if comment else 'Bez komentara'}
 
 Kurs: {submission.task.course.name}
-                """
-            )
-        except Exception as e:
-            print(f"Failed to send email to {student.email}: {e}")
+            """
+        )
+        
+        db.commit()
+        db.refresh(submission)
+        publish_submission_delta(submission_delta(submission, submission.task.course_id, "graded"))
         
         return jsonify(submission.to_dict()), 200
 
@@ -291,11 +324,16 @@ def get_my_submissions():
     db: Session = SessionLocal()
     try:
         student_id = request.user.get("user_id")
-        submissions = db.query(TaskSubmission).filter(
-            TaskSubmission.student_id == student_id
-        ).order_by(TaskSubmission.submitted_at.desc()).all()
+        page = paginate(
+            db.query(TaskSubmission).filter(TaskSubmission.student_id == student_id),
+            TaskSubmission.submitted_at,
+            TaskSubmission.id,
+            options=SUBMISSION_LIST,
+        )
         
-        return jsonify([s.to_dict() for s in submissions]), 200
+        return jsonify(page), 200
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
     finally:
         db.close()
 
@@ -317,13 +355,17 @@ def download_submission(task_id, submission_id):
         if submission.task.course.professor_id != professor_id:
             return jsonify({"error": "You are not the owner of this course"}), 403
         
-        return jsonify({
-            "fileData": submission.file_path,
-            "fileName": f"{submission.student.first_name}_{submission.student.last_name}_{submission.task.title.replace(' ', '_')}.py",
-            "studentName": f"{submission.student.first_name} {submission.student.last_name}",
-            "taskTitle": submission.task.title,
-            "submittedAt": submission.submitted_at.isoformat()
-        }), 200
+        try:
+            fileobj, mime = open_value(submission.file_path)
+        except BlobError as e:
+            return jsonify({"error": str(e)}), 404
+        
+        return send_file(
+            fileobj,
+            mimetype=mime,
+            as_attachment=True,
+            download_name=f"{submission.student.first_name}_{submission.student.last_name}_{submission.task.title.replace(' ', '_')}.py",
+        )
         
     finally:
         db.close()
\ No newline at end of file
@@ -4,12 +4,18 @@ from sqlalchemy.orm import Session
 from app.models import User
 from app.auth import session_required
 from app.database import SessionLocal
+from app.blob_store import store_data_url, BlobError
+from app.routes.blobs import send_value
+from app.signed_urls import signed_url_required
+from app.cache import bump, COURSES_CACHE, USER_CACHE
+from app.etag import conditional
 
 users_bp = Blueprint("users", __name__, url_prefix="/api/users")
 
 
 @users_bp.get("/profile")
 @session_required
+@conditional(USER_CACHE)
 def get_profile():
     db: Session = SessionLocal()
     try:
@@ -24,6 +30,21 @@ def get_profile():
         db.close()
 
 
+@users_bp.get("/<int:user_id>/profile-image")
+@signed_url_required
+def get_profile_image(user_id):
+    """Slika profila - koristi se direktno kao <img> / CSS url(), pa se umesto sesije proverava potpis URL-a"""
+    db: Session = SessionLocal()
+    try:
+        image = db.query(User.profile_image).filter(User.id == user_id).scalar()
+        if not image:
+            return jsonify({"error": "Profile image not found"}), 404
+
+        return send_value(image, download_name=f"user-{user_id}")
+    finally:
+        db.close()
+
+
 @users_bp.patch("/profile")
 @session_required
 def update_profile():
@@ -69,7 +90,14 @@ def update_profile():
         if "number" in data:
             user.number = str(data["number"]).strip()
 
+        name_changed = user.role == "PROFESOR" and ("firstName" in data or "lastName" in data)
+
         db.commit()
+        bump(USER_CACHE.format(user_id=user_id))
+
+        # ime profesora je deo keširanih kurseva
+        if name_changed:
+            bump(COURSES_CACHE)
         db.refresh(user)
         
         return jsonify(user.to_dict()), 200
@@ -122,20 +150,28 @@ def upload_profile_image():
         if image_path == "":
             print("🗑️ Removing profile image")
             user.profile_image = None
+            user.profile_image_size = None
         else:
+            if not image_path.startswith("data:image/"):
+                print("❌ Not an image data URL")
+                return jsonify({"error": "Invalid image format"}), 400
             print("💾 Saving profile image")
-            user.profile_image = image_path
+            try:
+                user.profile_image, user.profile_image_size = store_data_url(image_path)
+            except BlobError as e:
+                return jsonify({"error": str(e)}), 400
 
         print("💿 Committing to database...")
         db.commit()
+        bump(USER_CACHE.format(user_id=user_id))
         db.refresh(user)
         
         print("✅ Database updated successfully")
-        print(f"🖼️ User profile_image now: {user.profile_image[:100] if user.profile_image else 'NULL'}...")
+        print(f"🖼️ User profile_image_size now: {user.profile_image_size}")
         
         response_data = user.to_dict()
         print(f"📤 Response data keys: {list(response_data.keys())}")
-        print(f"📤 Response profileImage length: {len(response_data.get('profileImage', ''))}")
+        print(f"📤 Response profileImage: {response_data.get('profileImage')}")
         
         print("="*60)
         return jsonify(response_data), 200
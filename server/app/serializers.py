@@ -0,0 +1,59 @@
+"""
+Serijalizacija listi sa unapred učitanim relacijama.
+
+Svaki list endpoint bira svoje loader opcije (joinedload ili selectinload)
+tako da broj SQL upita ostaje isti bez obzira na broj redova.
+"""
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models import Course, CourseRequest, CourseEnrollment, Task, TaskSubmission
+
+LOADERS = {
+    "joined": joinedload,
+    "selectin": selectinload,
+}
+
+
+def eager(*paths, strategy: str = "joined"):
+    """Pravi loader opcije; putanja je relacija ili tuple relacija (lanac)"""
+    if strategy not in LOADERS:
+        raise ValueError(f"Unknown loader strategy: {strategy}")
+
+    options = []
+    for path in paths:
+        if not isinstance(path, tuple):
+            path = (path,)
+
+        option = LOADERS[strategy](path[0])
+        for attr in path[1:]:
+            option = getattr(option, f"{strategy}load")(attr)
+        options.append(option)
+
+    return tuple(options)
+
+
+# many-to-one na malo roditelja -> JOIN u istom upitu
+COURSE_LIST = eager(Course.professor, strategy="joined")
+COURSE_REQUEST_LIST = eager(CourseRequest.professor, strategy="joined")
+TASK_LIST = eager(Task.course, strategy="joined")
+
+# mnogo redova deli iste roditelje -> jedan IN upit po relaciji
+ENROLLMENT_LIST = eager(
+    CourseEnrollment.course,
+    CourseEnrollment.student,
+    strategy="selectin",
+)
+ENROLLED_COURSE_LIST = eager(
+    (CourseEnrollment.course, Course.professor),
+    strategy="selectin",
+)
+SUBMISSION_LIST = eager(
+    TaskSubmission.task,
+    TaskSubmission.student,
+    strategy="selectin",
+)
+
+
+def serialize_all(query, options=()):
+    return [row.to_dict() for row in query.options(*options).all()]
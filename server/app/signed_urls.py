@@ -0,0 +1,61 @@
+"""
+Kratkotrajni potpisani URL-ovi za sadržaj koji browser otvara direktno
+(<a href>, CSS url()) - takvi zahtevi ne mogu da pošalju X-Session-ID.
+
+URL-ove izdaju samo rute koje zahtevaju sesiju (to_dict u modelima), pa link
+dobija samo ko je video i JSON. Potpis je HMAC-SHA256 putanje i trenutka
+isteka. Istek se zaokružuje na prozor od SIGNED_URL_TTL_SECONDS: unutar
+prozora URL je uvek isti (telo odgovora i ETag se ne menjaju), a važi između
+jednog i dva prozora od izdavanja - duže od TTL-a read-through keša.
+"""
+
+import os
+import hmac
+import time
+import hashlib
+from functools import wraps
+from typing import Optional
+from urllib.parse import urlencode
+
+from flask import request, jsonify
+
+SIGNED_URL_TTL_SECONDS = int(os.getenv("SIGNED_URL_TTL_SECONDS", "3600"))
+SIGNED_URL_SECRET = os.getenv("SIGNED_URL_SECRET") or os.getenv(
+    "SECRET_KEY", "dev-secret-key-change-in-production"
+)
+
+
+def current_window(now: Optional[float] = None) -> int:
+    return int((time.time() if now is None else now) // SIGNED_URL_TTL_SECONDS)
+
+
+def _signature(path: str, expires: int) -> str:
+    message = f"{path}|{expires}".encode()
+    return hmac.new(SIGNED_URL_SECRET.encode(), message, hashlib.sha256).hexdigest()
+
+
+def sign_path(path: str, now: Optional[float] = None) -> str:
+    expires = (current_window(now) + 2) * SIGNED_URL_TTL_SECONDS
+    return f"{path}?{urlencode({'expires': expires, 'sig': _signature(path, expires)})}"
+
+
+def verify(path: str, expires, signature, now: Optional[float] = None) -> bool:
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return False
+    if expires < (time.time() if now is None else now):
+        return False
+    return hmac.compare_digest(_signature(path, expires), signature or "")
+
+
+def signed_url_required(fn):
+    """Umesto @session_required za GET rute čiji se URL-ovi dele kroz to_dict"""
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not verify(request.path, request.args.get("expires"), request.args.get("sig")):
+            return jsonify({"error": "Invalid or expired link"}), 403
+        return fn(*args, **kwargs)
+
+    return wrapper
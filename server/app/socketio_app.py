@@ -1,12 +1,73 @@
-from flask_socketio import SocketIO, join_room, emit
+import os
+import atexit
+
+from flask_socketio import SocketIO, join_room, leave_room, emit
 from flask import request
 
+from app.emit_buffer import EmitBuffer
+from app.fastjson import SocketIOJSON
+from app.metrics import register_metrics
+
+# npr. redis://localhost:6379/0 - emit iz bilo kog procesa (web worker, job
+# worker, dispatcher) stiže do klijenata povezanih na bilo koji proces.
+# Bez podešavanja emit stiže samo do klijenata istog procesa.
+SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE") or None
+SOCKETIO_CHANNEL = os.getenv("SOCKETIO_CHANNEL", "flask-socketio")
+SOCKETIO_ASYNC_MODE = os.getenv("SOCKETIO_ASYNC_MODE", "threading")
+# logger loguje svaki emit - korisno za debug, preskupo pod opterećenjem
+SOCKETIO_LOGGER = os.getenv("SOCKETIO_LOGGER", "0") == "1"
+
 socketio = SocketIO(
     cors_allowed_origins="*",
-    async_mode="threading",
-    logger=True,
-    engineio_logger=False
+    async_mode=SOCKETIO_ASYNC_MODE,
+    message_queue=SOCKETIO_MESSAGE_QUEUE,
+    channel=SOCKETIO_CHANNEL,
+    logger=SOCKETIO_LOGGER,
+    engineio_logger=False,
+    json=SocketIOJSON,
+)
+
+# događaji koji mogu da stižu u naletima (npr. zahtevi za kurs na početku
+# semestra) se šalju kroz buffer kao jedan "batch" frame po sobi
+emit_buffer = EmitBuffer(
+    socketio.emit,
+    spawn=socketio.start_background_task,
+    sleep=socketio.sleep,
 )
+register_metrics("emit_buffer", emit_buffer.stats)
+atexit.register(emit_buffer.flush_all)
+
+
+def buffered_emit(event, data, room):
+    emit_buffer.add(event, data, room)
+
+_external = None
+
+
+def external_emitter():
+    """
+    SocketIO samo za slanje, za procese bez Flask aplikacije (job worker,
+    dispatcher); None ako message queue nije podešen.
+    """
+    global _external
+    if SOCKETIO_MESSAGE_QUEUE is None:
+        return None
+    if _external is None:
+        _external = SocketIO(
+            message_queue=SOCKETIO_MESSAGE_QUEUE, channel=SOCKETIO_CHANNEL, json=SocketIOJSON
+        )
+    return _external
+
+
+def emit_external(event, data, room=None):
+    """Emit van Flask procesa; bez message queue-a nema kome da se pošalje pa se preskače"""
+    emitter = external_emitter()
+    if emitter is None:
+        return
+    try:
+        emitter.emit(event, data, room=room)
+    except Exception as e:
+        print(f"⚠️ External emit of '{event}' failed: {e}")
 
 
 def register_ws_handlers():
@@ -40,4 +101,39 @@ def register_ws_handlers():
     def on_ping(data):
         """Test event za proveru konekcije"""
         print(f"[WebSocket] Ping received: {data}")
-        emit("pong", {"received": data, "ok": True})
\ No newline at end of file
+        emit("pong", {"received": data, "ok": True})
+
+    @socketio.on("subscribe")
+    def on_subscribe(data):
+        """
+        {"room": "course:<id>" | "task:<id>", "sessionId": ...}; sesija može
+        i kroz X-Session-ID header handshake-a. Odgovor ide kao ack.
+        """
+        from app.auth import get_session
+        from app.live import authorize_room
+
+        data = data if isinstance(data, dict) else {}
+        room = str(data.get("room") or "")
+        session_id = str(data.get("sessionId") or request.headers.get("X-Session-ID", "")).strip()
+
+        user = get_session(session_id) if session_id else None
+        if not user:
+            return {"ok": False, "error": "Invalid or expired session"}
+
+        error = authorize_room(user, room)
+        if error:
+            return {"ok": False, "error": error}
+
+        join_room(room)
+        print(f"[WebSocket] User {user['user_id']} subscribed to '{room}'")
+        return {"ok": True, "room": room}
+
+    @socketio.on("unsubscribe")
+    def on_unsubscribe(data):
+        from app.live import parse_room
+
+        room = str((data or {}).get("room") or "") if isinstance(data, dict) else ""
+        if parse_room(room) is None:
+            return {"ok": False, "error": "Unknown room"}
+        leave_room(room)
+        return {"ok": True, "room": room}
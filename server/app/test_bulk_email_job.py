@@ -0,0 +1,44 @@
+"""
+Ponovljen bulk_email posao (pao worker) ne šalje poruke drugi put.
+"""
+
+import uuid
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+
+def test_rerun_does_not_duplicate_outbox_rows(db, seeded, redis_ready):
+    from app import jobs
+    from app.models import EmailOutbox
+    from app.redis_client import get_redis
+    from app.job_handlers import run_bulk_email
+
+    subject = f"Obaveštenje {uuid.uuid4().hex[:8]}"
+    params = {
+        "recipient_type": "course_students",
+        "course_id": seeded["course"].id,
+        "subject": subject,
+        "body": "test",
+    }
+    job_id = jobs.enqueue("bulk_email", params, seeded["professor"].id)
+    get_redis().lrem(jobs.QUEUE_KEY, 1, job_id)
+
+    try:
+        first = run_bulk_email(job_id, params)
+        assert first == {"recipient_count": 25, "duplicates_skipped": 0}
+
+        # worker je pao posle commit-a, a pre nego što je cursor sačuvan
+        get_redis().hdel(f"job:{job_id}", "checkpoint")
+        second = run_bulk_email(job_id, params)
+        assert second == {"recipient_count": 25, "duplicates_skipped": 25}
+
+        # sa sačuvanim cursor-om nema šta da se ponovi
+        assert run_bulk_email(job_id, params) == {"recipient_count": 25, "duplicates_skipped": 0}
+
+        assert db.query(EmailOutbox).filter(EmailOutbox.subject == subject).count() == 25
+    finally:
+        db.query(EmailOutbox).filter(EmailOutbox.subject == subject).delete(synchronize_session=False)
+        db.commit()
+        get_redis().delete(f"job:{job_id}")
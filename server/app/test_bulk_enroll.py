@@ -0,0 +1,53 @@
+"""
+Masovni upis - ishod po studentu i broj upita nezavisan od broja studenata.
+"""
+
+import uuid
+
+from app.conftest import session_headers
+
+
+def test_bulk_enroll_outcomes(client, db, seeded, count_queries):
+    from app.models import User, EmailOutbox
+
+    tag = uuid.uuid4().hex[:8]
+    new_students = [
+        User(first_name="Novi", last_name=f"{tag}-{i}", email=f"bulk-{tag}-{i}@test.com",
+             role="STUDENT", password_hash="x")
+        for i in range(2)
+    ]
+    db.add_all(new_students)
+    db.commit()
+
+    try:
+        payload = {"students": [
+            new_students[0].id,
+            new_students[1].email.upper(),
+            seeded["student"].id,
+            f"nobody-{tag}@test.com",
+            seeded["professor"].id,
+        ]}
+        url = f"/api/courses/{seeded['course'].id}/enroll/bulk"
+
+        with count_queries() as counter:
+            response = client.post(url, json=payload, headers=session_headers(seeded["professor"]))
+
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        assert [r["status"] for r in body["results"]] == [
+            "enrolled", "enrolled", "already_enrolled", "not_found", "not_student",
+        ]
+        assert body["enrolled"] == 2
+        assert counter.count <= 10
+
+        queued = db.query(EmailOutbox).filter(
+            EmailOutbox.recipient.in_([s.email for s in new_students])
+        )
+        assert queued.count() == 2
+        queued.delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.query(User).filter(User.id.in_([s.id for s in new_students])).delete(
+            synchronize_session=False
+        )
+        db.commit()
@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("redis")
+
+from app import cache
+
+
+class FlakyRedis:
+    """Čitanja prolaze, a svaki upis pada - kao Redis koji je pao usred zahteva"""
+
+    def __init__(self, cached=None):
+        self.cached = cached
+
+    def get(self, key):
+        if key.endswith(":version"):
+            return b"1"
+        return self.cached
+
+    def hincrby(self, *args):
+        raise ConnectionError("redis down")
+
+    def pipeline(self, transaction=True):
+        return FlakyPipeline()
+
+
+class FlakyPipeline:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+    def execute(self):
+        raise ConnectionError("redis down")
+
+
+def test_hit_survives_stats_write_failure(monkeypatch):
+    monkeypatch.setattr(cache, "get_redis", lambda: FlakyRedis(cached=b'{"id": 1}'))
+
+    assert cache.read_through("courses", "1", lambda: pytest.fail("loader called")) == {"id": 1}
+
+
+def test_miss_returns_loaded_value_when_cache_write_fails(monkeypatch):
+    monkeypatch.setattr(cache, "get_redis", lambda: FlakyRedis())
+
+    assert cache.read_through("courses", "1", lambda: {"id": 1}) == {"id": 1}
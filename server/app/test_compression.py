@@ -0,0 +1,93 @@
+"""
+Kompresija odgovora - pregovaranje, prag veličine, stream i preskočeni tipovi.
+"""
+
+import gzip
+
+import pytest
+
+pytest.importorskip("flask")
+
+from flask import Flask, Response, jsonify, stream_with_context
+
+from app import compression
+from app.compression import init_compression, choose_encoding
+
+ROWS = [{"id": i, "name": f"Kurs {i}", "description": "opis " * 10} for i in range(200)]
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+
+    @app.get("/large")
+    def large():
+        response = jsonify(ROWS)
+        response.set_etag("abc")
+        return response
+
+    @app.get("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.get("/stream")
+    def stream():
+        def generate():
+            for row in ROWS:
+                yield f"{row['id']},{row['name']}\n"
+        return Response(stream_with_context(generate()), mimetype="text/csv")
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" + b"\x00" * 4096, mimetype="image/png")
+
+    init_compression(app)
+    return app.test_client()
+
+
+def test_large_json_is_gzipped_with_suffixed_etag(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip, deflate"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.headers["ETag"] == '"abc-gzip"'
+    assert int(response.headers["Content-Length"]) == len(response.data)
+    assert gzip.decompress(response.data) == client.get("/large").data
+
+
+def test_small_and_unaccepted_responses_are_not_compressed(client):
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+    assert "Accept-Encoding" in small.headers["Vary"]
+
+    identity = client.get("/large")
+    assert "Content-Encoding" not in identity.headers
+    assert identity.headers["ETag"] == '"abc"'
+
+
+def test_already_compressed_types_are_skipped(client):
+    response = client.get("/image", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert "Vary" not in response.headers
+
+
+def test_generator_response_is_stream_compressed(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    lines = gzip.decompress(response.data).decode().splitlines()
+    assert lines[0] == "0,Kurs 0" and len(lines) == len(ROWS)
+
+
+def test_choose_encoding_prefers_brotli_only_when_available(monkeypatch):
+    from werkzeug.datastructures import Accept
+    accept = Accept([("br", 1), ("gzip", 1)])
+
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding(accept) == "gzip"
+
+    monkeypatch.setattr(compression, "brotli", object())
+    assert choose_encoding(accept) == "br"
+    assert choose_encoding(Accept([("gzip", 1), ("br", 0.5)])) == "gzip"
+    assert choose_encoding(Accept([("identity", 1)])) is None
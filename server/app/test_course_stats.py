@@ -0,0 +1,38 @@
+"""
+Inkrementalni brojači u course_stats moraju da se slažu sa rebuild-om iz tabela.
+"""
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.course_stats import record, rebuild, get_stats
+
+
+def test_seeded_stats_match_source_tables(db, seeded):
+    course_id = seeded["course"].id
+    stats = get_stats(db, [course_id])[course_id]
+
+    assert stats["enrollmentCount"] == 25
+    assert stats["taskCount"] == 3
+    assert stats["submissionCount"] == 75
+    assert stats["gradedCount"] == 0
+    assert stats["averageGrade"] is None
+
+
+def test_record_increments_and_rebuild_repairs_drift(db, seeded):
+    course_id = seeded["course"].id
+
+    record(db, course_id, graded=2, grade_sum=9)
+    db.commit()
+    stats = get_stats(db, [course_id])[course_id]
+    assert stats["gradedCount"] == 2
+    assert stats["averageGrade"] == 4.5
+
+    rebuild(db, [course_id])
+    db.commit()
+    assert get_stats(db, [course_id])[course_id]["gradedCount"] == 0
+
+
+def test_missing_course_has_empty_stats(db, engine):
+    assert get_stats(db, [-1])[-1]["enrollmentCount"] == 0
@@ -0,0 +1,105 @@
+"""
+EmitBuffer - događaji iste sobe u prozoru idu u jedan frame.
+"""
+
+import time
+import uuid
+import threading
+
+import pytest
+
+from app.emit_buffer import EmitBuffer, BATCH_EVENT
+
+
+class _Recorder:
+    def __init__(self):
+        self.frames = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event, data, room=None):
+        with self._lock:
+            self.frames.append((event, room, [e["event"] for e in data["events"]]))
+
+
+def _wait_for(frames, count, timeout=2.0):
+    deadline = time.time() + timeout
+    while len(frames) < count and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_coalesces_events_per_room_within_window():
+    emit = _Recorder()
+    buffer = EmitBuffer(emit, window_seconds=0.05, max_batch=100)
+
+    buffer.add("course_request.created", {"id": 1}, room="admins")
+    buffer.add("course_request.created", {"id": 2}, room="admins")
+    buffer.add("course_request.approved", {"id": 1}, room="user:7")
+    buffer.add("course_request.approved", {"id": 1}, room="admins")
+
+    _wait_for(emit.frames, 2)
+
+    assert sorted(emit.frames) == [
+        (BATCH_EVENT, "admins", ["course_request.created", "course_request.created",
+                                 "course_request.approved"]),
+        (BATCH_EVENT, "user:7", ["course_request.approved"]),
+    ]
+    stats = buffer.stats()
+    assert stats["events"] == 4 and stats["frames"] == 2 and stats["pending"] == 0
+
+
+def test_full_batch_is_sent_without_waiting():
+    emit = _Recorder()
+    buffer = EmitBuffer(emit, window_seconds=0.05, max_batch=2)
+
+    for i in range(5):
+        buffer.add("course_request.created", {"id": i}, room="admins")
+
+    # dva puna frame-a su poslata odmah, ostatak posle prozora
+    assert [len(events) for _, _, events in emit.frames] == [2, 2]
+
+    _wait_for(emit.frames, 3)
+    assert [len(events) for _, _, events in emit.frames] == [2, 2, 1]
+    assert buffer.stats()["largestFrame"] == 2
+
+
+def test_emit_failure_is_counted():
+    def failing_emit(event, data, room=None):
+        raise RuntimeError("queue down")
+
+    buffer = EmitBuffer(failing_emit, window_seconds=0, max_batch=10)
+    buffer.add("course_request.created", {"id": 1}, room="admins")
+
+    assert buffer.stats()["errors"] == 1
+
+
+def test_approve_batches_only_the_admins_room(seeded, db, redis_ready, monkeypatch):
+    pytest.importorskip("flask")
+    from flask import Flask
+    from app.conftest import session_headers
+    from app.models import User, CourseRequest
+    from app.routes import admin
+
+    direct, buffered = [], []
+    monkeypatch.setattr(admin.socketio, "emit", lambda event, data, room=None: direct.append((event, room)))
+    monkeypatch.setattr(admin, "buffered_emit", lambda event, data, room=None: buffered.append((event, room)))
+
+    tag = uuid.uuid4().hex[:8]
+    admin_user = User(first_name="Admin", last_name=tag, email=f"admin-{tag}@test.com", role="ADMIN", password_hash="x")
+    course_request = CourseRequest(professor_id=seeded["professor"].id, name=f"Zahtev {tag}", description="test")
+    db.add_all([admin_user, course_request])
+    db.commit()
+
+    app = Flask(__name__)
+    app.register_blueprint(admin.admin_bp)
+    try:
+        response = app.test_client().post(
+            f"/api/admin/course-requests/{course_request.id}/approve",
+            headers=session_headers(admin_user),
+        )
+
+        assert response.status_code == 200, response.get_json()
+        assert direct == [("course_request.approved", f"user:{seeded['professor'].id}")]
+        assert buffered == [("course_request.approved", "admins")]
+    finally:
+        db.delete(admin_user)
+        db.commit()
@@ -0,0 +1,63 @@
+"""
+Uslovni GET - 304 bez upita na bazu dok se verzija namespace-a ne promeni.
+"""
+
+from datetime import datetime, timedelta
+
+from app.conftest import session_headers
+
+
+def test_task_list_etag_revalidates_without_queries(client, seeded, count_queries):
+    headers = session_headers(seeded["student"])
+    url = f"/api/tasks/course/{seeded['course'].id}"
+
+    first = client.get(url, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert not etag.startswith("W/")
+
+    with count_queries() as counter:
+        cached = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+    assert cached.headers["ETag"] == etag
+    assert counter.count == 0
+
+    created = client.post("/api/tasks/", json={
+        "courseId": seeded["course"].id,
+        "title": "Novi zadatak",
+        "description": "test",
+        "deadline": (datetime.utcnow() + timedelta(days=3)).isoformat(),
+    }, headers=session_headers(seeded["professor"]))
+    assert created.status_code == 201, created.get_json()
+
+    changed = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.get_json()) == len(first.get_json()) + 1
+
+
+def test_course_etag_depends_on_path(client, seeded):
+    headers = session_headers(seeded["student"])
+
+    course = client.get(f"/api/courses/{seeded['course'].id}", headers=headers)
+    listing = client.get("/api/courses/?limit=5", headers=headers)
+
+    assert course.status_code == 200 and listing.status_code == 200
+    assert course.headers["ETag"] != listing.headers["ETag"]
+    assert course.headers["Cache-Control"] == "private, no-cache"
+
+
+def test_etag_changes_with_signed_url_window(client, seeded, monkeypatch):
+    from app import etag as etag_module
+
+    headers = session_headers(seeded["student"])
+    url = f"/api/courses/{seeded['course'].id}"
+
+    monkeypatch.setattr(etag_module, "current_window", lambda: 100)
+    first = client.get(url, headers=headers)
+    monkeypatch.setattr(etag_module, "current_window", lambda: 101)
+    later = client.get(url, headers={**headers, "If-None-Match": first.headers["ETag"]})
+
+    assert later.status_code == 200
+    assert later.headers["ETag"] != first.headers["ETag"]
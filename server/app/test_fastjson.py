@@ -0,0 +1,77 @@
+"""
+Brzi JSON - isti izlaz sa orjson-om i bez njega, datumi kao .isoformat().
+"""
+
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from app import fastjson
+
+PAYLOAD = {
+    "createdAt": datetime(2024, 1, 1, 10, 30, 0, 123456),
+    "sentAt": datetime(2024, 1, 1, 10, 30),
+    "birthDate": date(2000, 5, 17),
+    "gradedAt": None,
+    "name": "Đorđe Šćepanović",
+    "avg": Decimal("4.50"),
+    "id": uuid.UUID(int=1),
+    "stats": {7: {"enrollments": 3}},
+}
+
+EXPECTED = {
+    "createdAt": "2024-01-01T10:30:00.123456",
+    "sentAt": "2024-01-01T10:30:00",
+    "birthDate": "2000-05-17",
+    "gradedAt": None,
+    "name": "Đorđe Šćepanović",
+    "avg": "4.50",
+    "id": "00000000-0000-0000-0000-000000000001",
+    "stats": {"7": {"enrollments": 3}},
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(fastjson, "orjson", None)
+    return request.param
+
+
+def test_dumps_matches_isoformat(backend):
+    assert json.loads(fastjson.dumps(PAYLOAD)) == EXPECTED
+    assert fastjson.dumps_bytes(PAYLOAD) == fastjson.dumps(PAYLOAD).encode()
+    assert fastjson.loads(fastjson.dumps_bytes(PAYLOAD)) == EXPECTED
+
+
+def test_unknown_type_raises(backend):
+    with pytest.raises(TypeError):
+        fastjson.dumps({"value": object()})
+
+
+def test_loads_rejects_invalid_json(backend):
+    with pytest.raises(ValueError):
+        fastjson.loads("{not json")
+
+
+def test_socketio_shim_ignores_stdlib_arguments():
+    encoded = fastjson.SocketIOJSON.dumps({"at": PAYLOAD["sentAt"]}, separators=(",", ":"))
+    assert fastjson.SocketIOJSON.loads(encoded) == {"at": "2024-01-01T10:30:00"}
+
+
+def test_flask_provider_response():
+    flask = pytest.importorskip("flask")
+    from app.json_provider import FastJSONProvider
+
+    app = flask.Flask(__name__)
+    app.json = FastJSONProvider(app)
+
+    with app.app_context():
+        response = flask.jsonify({"createdAt": PAYLOAD["createdAt"]})
+    assert response.mimetype == "application/json"
+    assert json.loads(response.data) == {"createdAt": "2024-01-01T10:30:00.123456"}
@@ -0,0 +1,89 @@
+"""
+Red poslova - zaglavljen posao se vraća u red tačno jednom, a dug posao
+javlja heartbeat i dok čeka.
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("redis")
+
+from app import jobs
+
+
+@pytest.fixture
+def stale_job(redis_ready):
+    redis = jobs.get_redis()
+    job_id = jobs.enqueue("test", {}, user_id=0)
+    redis.lrem(jobs.QUEUE_KEY, 0, job_id)
+    redis.lpush(jobs.PROCESSING_KEY, job_id)
+    redis.hset(f"job:{job_id}", "heartbeatAt", time.time() - jobs.JOB_STALE_SECONDS - 1)
+    yield job_id
+    redis.lrem(jobs.QUEUE_KEY, 0, job_id)
+    redis.lrem(jobs.PROCESSING_KEY, 0, job_id)
+    redis.delete(f"job:{job_id}", "jobs:user:0")
+
+
+def test_concurrent_sweeps_requeue_once(stale_job, monkeypatch):
+    redis = jobs.get_redis()
+    barrier = threading.Barrier(2)
+
+    class BothSweepsSeeTheJob:
+        """Oba sweep-a pročitaju jobs:processing pre nego što bilo koji vrati posao"""
+
+        def __getattr__(self, name):
+            return getattr(redis, name)
+
+        def lrange(self, *args):
+            items = redis.lrange(*args)
+            barrier.wait(timeout=5)
+            return items
+
+    proxy = BothSweepsSeeTheJob()
+    monkeypatch.setattr(jobs, "get_redis", lambda: proxy)
+
+    with ThreadPoolExecutor(2) as pool:
+        list(pool.map(lambda _: jobs.requeue_stale(), range(2)))
+
+    assert redis.lrange(jobs.QUEUE_KEY, 0, -1).count(stale_job) == 1
+    assert stale_job not in redis.lrange(jobs.PROCESSING_KEY, 0, -1)
+
+
+def test_fresh_heartbeat_is_not_requeued(stale_job):
+    jobs.update_progress(stale_job, 10)
+
+    assert jobs.requeue_stale() == 0
+    assert stale_job in jobs.get_redis().lrange(jobs.PROCESSING_KEY, 0, -1)
+
+
+def test_report_heartbeats_while_partition_runs(stale_job, monkeypatch):
+    pytest.importorskip("sqlalchemy")
+    from app import job_handlers
+
+    class Pool:
+        size = 1
+
+        def __init__(self):
+            self.executor = ThreadPoolExecutor(1)
+
+        def submit(self, fn, *args):
+            return self.executor.submit(time.sleep, 0.5)
+
+    class Manager:
+        pool = Pool()
+
+    beats = []
+    monkeypatch.setattr(job_handlers, "process_manager", Manager())
+    monkeypatch.setattr(job_handlers, "plan_partitions", lambda db, report_type, size: [(None, None)])
+    monkeypatch.setattr(job_handlers, "merge_report", lambda report_type, partials: partials)
+    monkeypatch.setattr(job_handlers, "JOB_HEARTBEAT_SECONDS", 0.1)
+    monkeypatch.setattr(job_handlers, "update_progress", lambda *args: beats.append(args[1]))
+
+    result = job_handlers.run_report(stale_job, {"type": "courses"})
+
+    assert result["partitions"] == 1
+    assert len(beats) >= 4
+    assert beats[-1] == 95
@@ -0,0 +1,61 @@
+"""
+Sobe za praćenje predaja i delta događaji iz submit/grade.
+"""
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("flask_socketio")
+
+from app import live
+from app.conftest import session_headers
+
+
+def test_parse_room():
+    assert live.parse_room("course:12") == ("course", 12)
+    assert live.parse_room("task:3") == ("task", 3)
+    assert live.parse_room("admins") is None
+    assert live.parse_room("task:3;drop") is None
+
+
+def test_authorize_room_checks_ownership(seeded):
+    professor = seeded["professor"]
+    owner = {"user_id": professor.id, "role": "PROFESOR"}
+    other = {"user_id": -1, "role": "PROFESOR"}
+    student = {"user_id": seeded["student"].id, "role": "STUDENT"}
+
+    assert live.authorize_room(owner, f"course:{seeded['course'].id}") is None
+    assert live.authorize_room(owner, f"task:{seeded['task'].id}") is None
+    assert live.authorize_room({"user_id": 0, "role": "ADMIN"}, f"task:{seeded['task'].id}") is None
+    assert live.authorize_room(other, f"task:{seeded['task'].id}") == "You are not the owner of this course"
+    assert live.authorize_room(student, f"course:{seeded['course'].id}") == "Forbidden"
+    assert live.authorize_room(owner, "task:0") == "Not found"
+
+
+def test_grade_publishes_compact_delta(client, db, seeded, monkeypatch):
+    from app.models import TaskSubmission
+
+    emitted = []
+    monkeypatch.setattr(live, "buffered_emit", lambda event, data, room: emitted.append((event, room, data)))
+
+    submission = db.query(TaskSubmission).filter(
+        TaskSubmission.task_id == seeded["task"].id,
+        TaskSubmission.student_id == seeded["student"].id,
+    ).one()
+
+    response = client.post(
+        f"/api/tasks/submissions/{submission.id}/grade",
+        json={"grade": 4},
+        headers=session_headers(seeded["professor"]),
+    )
+    assert response.status_code == 200, response.get_json()
+
+    assert [(event, room) for event, room, _ in emitted] == [
+        ("submission.delta", f"task:{seeded['task'].id}"),
+        ("submission.delta", f"course:{seeded['course'].id}"),
+    ]
+    delta = emitted[0][2]
+    assert delta["action"] == "graded"
+    assert delta["submissionId"] == submission.id
+    assert delta["status"] == "GRADED" and delta["grade"] == 4
+    assert "filePath" not in delta and "comment" not in delta
@@ -0,0 +1,51 @@
+"""
+Poruka zaglavljena u SENDING se ponovo preuzima samo dok ima pokušaja.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app import outbox_dispatcher
+
+
+def test_stale_sending_respects_max_attempts(db, monkeypatch):
+    from app.models import EmailOutbox
+
+    monkeypatch.setattr(outbox_dispatcher, "BATCH_SIZE", 100000)
+    tag = uuid.uuid4().hex[:8]
+    stale = datetime.utcnow() - timedelta(seconds=outbox_dispatcher.SENDING_TIMEOUT_SECONDS + 60)
+
+    def stuck(attempts):
+        return EmailOutbox(
+            recipient=f"{attempts}-{tag}@test.com", subject=tag, body="x",
+            status="SENDING", attempts=attempts, claimed_at=stale,
+        )
+
+    retry, exhausted = stuck(1), stuck(outbox_dispatcher.MAX_ATTEMPTS)
+    db.add_all([retry, exhausted])
+    db.commit()
+    ours = {retry.id, exhausted.id}
+
+    batch = outbox_dispatcher.claim_batch()
+    others = [message_id for message_id, *_ in batch if message_id not in ours]
+    try:
+        assert retry.id in {message_id for message_id, *_ in batch}
+        assert exhausted.id not in {message_id for message_id, *_ in batch}
+
+        db.expire_all()
+        assert db.get(EmailOutbox, retry.id).attempts == 2
+        assert db.get(EmailOutbox, exhausted.id).status == "FAILED"
+        assert db.get(EmailOutbox, exhausted.id).attempts == outbox_dispatcher.MAX_ATTEMPTS
+    finally:
+        # poruke drugih testova koje je ovaj claim preuzeo vraćaju se u red
+        if others:
+            db.query(EmailOutbox).filter(EmailOutbox.id.in_(others)).update(
+                {"status": "PENDING", "claimed_at": None, "attempts": EmailOutbox.attempts - 1},
+                synchronize_session=False,
+            )
+        db.query(EmailOutbox).filter(EmailOutbox.id.in_(ours)).delete(synchronize_session=False)
+        db.commit()
@@ -0,0 +1,59 @@
+"""
+Pool za lozinke - provera, rehash pri promeni rundi i odbijanje kad je red pun.
+"""
+
+import time
+
+import pytest
+
+pytest.importorskip("passlib")
+
+from app.passwords import PasswordHasher, PasswordQueueFull, PasswordTimeout
+
+
+def test_hash_verify_and_rehash_on_new_rounds():
+    old = PasswordHasher(workers=1, queue_size=2, rounds=1000)
+    new = PasswordHasher(workers=1, queue_size=2, rounds=2000)
+    try:
+        password_hash = old.hash("secret1")
+
+        assert old.verify("secret1", password_hash) == (True, None)
+        assert old.verify("wrong", password_hash) == (False, None)
+
+        valid, rehashed = new.verify("secret1", password_hash)
+        assert valid and rehashed and "$2000$" in rehashed
+        assert new.stats()["rehashed"] == 1
+        assert new.stats()["verify"]["count"] == 1
+    finally:
+        old.shutdown()
+        new.shutdown()
+
+
+def test_full_queue_is_rejected():
+    hasher = PasswordHasher(workers=1, queue_size=0, rounds=1000)
+    with pytest.raises(PasswordQueueFull):
+        hasher.hash("secret1")
+    assert hasher.stats()["rejected"] == 1
+
+
+def test_timeout_keeps_slot_until_work_finishes():
+    hasher = PasswordHasher(workers=1, queue_size=1, rounds=3_000_000, timeout=0.05)
+    try:
+        # proces u pool-u se pokreće unapred da timeout ne bi pogodio posao pre starta
+        hasher._ensure_executor().submit(int).result()
+
+        with pytest.raises(PasswordTimeout):
+            hasher.hash("secret1")
+
+        # posao i dalje radi u pool-u pa red ostaje pun
+        assert hasher.stats()["queueDepth"] == 1
+        with pytest.raises(PasswordQueueFull):
+            hasher.hash("secret1")
+
+        deadline = time.time() + 60
+        while hasher.stats()["queueDepth"] and time.time() < deadline:
+            time.sleep(0.05)
+        assert hasher.stats()["queueDepth"] == 0
+        assert hasher.stats()["timeouts"] == 1
+    finally:
+        hasher.shutdown()
@@ -1,6 +1,10 @@
 
 import time
-from app.process_handler import ProcessManager
+import pytest
+from multiprocessing.shared_memory import SharedMemory
+from app.process_handler import (
+    ProcessManager, WorkerPool, SharedResult, pack_result, unpack_result, process_file_worker
+)
 
 def test_email_process():
     print("\n" + "="*60)
@@ -28,7 +32,7 @@ def test_email_process():
     ]
     
     print(f"\n📧 Starting email process with {len(email_tasks)} emails...")
-    process = manager.send_bulk_emails(email_tasks)
+    manager.send_bulk_emails(email_tasks)
     
     print("⏳ Waiting for process to complete...")
     manager.wait_for_completion(timeout=10)
@@ -59,7 +63,7 @@ def test_report_generation():
     }
     
     print(f"\n📊 Starting report generation process...")
-    process = manager.generate_report("platform_stats", report_data)
+    manager.generate_report("platform_stats", report_data)
     
     print("⏳ Waiting for report generation...")
     manager.wait_for_completion(timeout=10)
@@ -85,7 +89,7 @@ def test_file_processing():
     test_file = "/tmp/test_submissions.csv"
     
     print(f"\n📄 Starting file processing: {test_file}")
-    process = manager.process_file(test_file, operation="validate")
+    manager.process_file(test_file, operation="validate")
     
     print("⏳ Waiting for file processing...")
     manager.wait_for_completion(timeout=10)
@@ -137,6 +141,86 @@ def test_parallel_processes():
     print("\n" + "="*60)
 
 
+def test_large_result_through_shared_memory():
+    """Veliki rezultat ide kroz shared memory segment koji potrošač oslobađa"""
+    result = {"rows": [{"id": i, "email": f"user{i}@test.com"} for i in range(20000)]}
+
+    packed = pack_result(result, threshold=1024)
+    assert isinstance(packed, SharedResult)
+    assert unpack_result(packed) == result
+
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=packed.name)
+
+    small = {"status": "ok"}
+    assert pack_result(small, threshold=1024) is small
+
+
+def test_pool_unpacks_shared_results():
+    pool = WorkerPool(size=1, shm_threshold=1)
+    try:
+        result = pool.submit(process_file_worker, "/tmp/test.csv", "parse").result(timeout=30)
+        assert result["status"] == "completed"
+        assert pool._segments == set()
+    finally:
+        pool.shutdown()
+
+
+def _segment_exists(name):
+    try:
+        SharedMemory(name=name).close()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def test_shutdown_unlinks_unclaimed_segments():
+    """Segment čiji rezultat nikad nije preuzet briše se u shutdown()"""
+    pool = WorkerPool(size=1, shm_threshold=1)
+    # callback se "izgubi" - rezultat ostaje u segmentu
+    pool._resolve = lambda future, name, value: None
+    try:
+        pool.submit(process_file_worker, "/tmp/test.csv", "parse")
+        (name,) = pool._segments
+
+        deadline = time.time() + 30
+        while not _segment_exists(name) and time.time() < deadline:
+            time.sleep(0.05)
+        assert _segment_exists(name)
+    finally:
+        pool.shutdown(wait=False)
+
+    assert not _segment_exists(name)
+    assert pool._segments == set()
+
+
+def test_failed_job_releases_segment():
+    pool = WorkerPool(size=1, shm_threshold=1)
+    try:
+        future = pool.submit(int, "nije broj")
+        with pytest.raises(ValueError):
+            future.result(timeout=30)
+        assert pool._segments == set()
+    finally:
+        pool.shutdown()
+
+
+def test_results_history_is_bounded(monkeypatch):
+    from concurrent.futures import Future
+    from app import process_handler
+
+    monkeypatch.setattr(process_handler, "RESULTS_MAXLEN", 3)
+    manager = process_handler.ProcessManager(pool=object())
+
+    for i in range(5):
+        future = Future()
+        future.set_result({"n": i})
+        manager.pending.add(future)
+        manager._collect(future)
+
+    assert [r["n"] for r in manager.get_results()] == [2, 3, 4]
+
+
 def main():
     """Pokreće sve testove"""
     print("\n" + "#"*60)
@@ -170,4 +254,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
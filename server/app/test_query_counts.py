@@ -0,0 +1,33 @@
+"""
+Broj SQL upita po list endpointu ne sme da zavisi od broja redova.
+"""
+
+import pytest
+
+from app.conftest import session_headers
+
+# (putanja, ko poziva, maksimalan broj upita)
+LIST_ENDPOINTS = [
+    ("/api/courses/", "student", 1),
+    ("/api/courses/my-courses", "student", 3),
+    ("/api/courses/my-requests", "professor", 1),
+    ("/api/courses/{course_id}/students", "professor", 4),
+    ("/api/courses/{course_id}/submissions", "professor", 4),
+    ("/api/tasks/course/{course_id}", "professor", 2),
+    ("/api/tasks/{task_id}/submissions", "professor", 5),
+    ("/api/tasks/my-submissions", "student", 3),
+]
+
+
+@pytest.mark.parametrize("path, caller, max_queries", LIST_ENDPOINTS)
+def test_list_endpoint_query_count(client, seeded, count_queries, path, caller, max_queries):
+    url = path.format(course_id=seeded["course"].id, task_id=seeded["task"].id)
+    headers = session_headers(seeded[caller])
+
+    with count_queries() as counter:
+        response = client.get(url, headers=headers)
+
+    assert response.status_code == 200, response.get_json()
+    assert counter.count <= max_queries, (
+        f"{url} executed {counter.count} queries (max {max_queries})"
+    )
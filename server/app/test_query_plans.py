@@ -0,0 +1,116 @@
+"""
+EXPLAIN za česte upite - svaki mora da koristi svoj namenski indeks.
+
+Na malom test skupu planer bi ionako birao sekvencijalno čitanje, pa se
+enable_seqscan isključuje. Tada planer uzima bilo koji indeks koji sadrži
+kolonu (npr. drugu kolonu unique indeksa, uz Filter), pa nije dovoljno da u
+planu nema Seq Scan-a - proverava se da je korišćen baš očekivani indeks.
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.models import User, Course, CourseRequest, CourseEnrollment, Task, TaskSubmission, EmailOutbox
+from app.job_handlers import recipient_query, EMAIL_BATCH_SIZE
+
+# naziv -> (očekivani indeks ili torka prihvatljivih, funkcija (db, seeded) -> upit)
+HOT_QUERIES = {
+    "enrollment_lookup": ("uq_course_enrollments_course_student", lambda db, s: db.query(CourseEnrollment).filter(
+        CourseEnrollment.course_id == s["course"].id,
+        CourseEnrollment.student_id == s["student"].id,
+    )),
+    "my_courses": ("ix_course_enrollments_student", lambda db, s: db.query(CourseEnrollment).filter(
+        CourseEnrollment.student_id == s["student"].id
+    )),
+    "course_students": ("uq_course_enrollments_course_student", lambda db, s: db.query(CourseEnrollment).filter(
+        CourseEnrollment.course_id == s["course"].id
+    )),
+    "submission_lookup": ("uq_task_submissions_task_student", lambda db, s: db.query(TaskSubmission).filter(
+        TaskSubmission.task_id == s["task"].id,
+        TaskSubmission.student_id == s["student"].id,
+    )),
+    "my_submissions": ("ix_task_submissions_student_submitted", lambda db, s: db.query(TaskSubmission)
+        .filter(TaskSubmission.student_id == s["student"].id)
+        .order_by(TaskSubmission.submitted_at.desc(), TaskSubmission.id.desc())
+        .limit(50)),
+    "ungraded_submissions": ("ix_task_submissions_ungraded", lambda db, s: db.query(TaskSubmission).filter(
+        TaskSubmission.task_id == s["task"].id, TaskSubmission.grade.is_(None)
+    )),
+    "course_tasks": ("ix_tasks_course_deadline", lambda db, s: db.query(Task)
+        .filter(Task.course_id == s["course"].id)
+        .order_by(Task.deadline.desc())),
+    "pending_course_requests": ("ix_course_requests_status_created", lambda db, s: db.query(CourseRequest)
+        .filter(CourseRequest.status == "PENDING")
+        .order_by(CourseRequest.created_at.desc())
+        .limit(50)),
+    "professor_requests": ("ix_course_requests_professor", lambda db, s: db.query(CourseRequest).filter(
+        CourseRequest.professor_id == s["professor"].id
+    )),
+    "professor_courses": ("ix_courses_professor", lambda db, s: db.query(Course).filter(
+        Course.professor_id == s["professor"].id
+    )),
+    "course_catalog_page": ("ix_courses_created", lambda db, s: db.query(Course)
+        .order_by(Course.created_at.desc(), Course.id.desc())
+        .limit(50)),
+    # studenti su većina korisnika, pa uslov po ulozi nije selektivan: oba
+    # indeksa daju redosled strane bez Sort-a, a planer bira po veličini tabele
+    "available_students_page": (("ix_users_role_created", "ix_users_created"), lambda db, s: db.query(User)
+        .filter(User.role == "STUDENT")
+        .order_by(User.created_at.desc(), User.id.desc())
+        .limit(50)),
+    "professor_recipients": ("ix_users_role_created", lambda db, s: recipient_query(
+        db, {"recipient_type": "all_professors"}
+    ).filter(User.id > 0).order_by(User.id).limit(EMAIL_BATCH_SIZE)),
+    "outbox_pending": ("ix_email_outbox_unsent", lambda db, s: db.query(EmailOutbox)
+        .filter(EmailOutbox.status == "PENDING")
+        .order_by(EmailOutbox.id)
+        .limit(100)),
+}
+
+
+ANALYZED_TABLES = [
+    "users", "courses", "course_requests", "course_enrollments",
+    "tasks", "task_submissions", "email_outbox",
+]
+
+
+def _indexes(plan):
+    """Nazivi indeksa iz svih Index/Index Only/Bitmap Index Scan čvorova"""
+    names = [plan["Index Name"]] if "Index Name" in plan else []
+    for child in plan.get("Plans", []):
+        names.extend(_indexes(child))
+    return names
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(db, seeded, name):
+    expected_index, build_query = HOT_QUERIES[name]
+    query = build_query(db, seeded)
+    sql = str(query.statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+
+    # statistika iz autovacuum-a zavisi od toga kada je poslednji put radio
+    # (npr. nad praznim tabelama posle drugih testova) - plan se računa nad seeded podacima
+    db.execute(text(f"ANALYZE {', '.join(ANALYZED_TABLES)}"))
+    db.commit()
+
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    try:
+        raw = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    finally:
+        db.rollback()
+
+    plan = (raw if isinstance(raw, list) else json.loads(raw))[0]["Plan"]
+    used = _indexes(plan)
+    expected = expected_index if isinstance(expected_index, tuple) else (expected_index,)
+    assert set(expected) & set(used), (
+        f"{name}: expected {expected_index}, plan uses {used or 'no index'}\n"
+        f"{json.dumps(plan, indent=2)}"
+    )
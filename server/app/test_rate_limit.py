@@ -0,0 +1,84 @@
+"""
+Token bucket u Redis-u - svi bucket-i zahteva se troše atomski ili nijedan.
+"""
+
+import uuid
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("redis")
+
+from app.rate_limit import consume, rate_limit
+
+
+def test_bucket_denies_after_capacity(redis_ready):
+    key = f"ratelimit:test:{uuid.uuid4().hex}"
+    bucket = {key: (2, 2 / 60)}
+
+    assert consume(bucket)[0]
+    assert consume(bucket)[0]
+    allowed, retry_after_ms = consume(bucket)
+
+    assert not allowed
+    assert 0 < retry_after_ms <= 30_000
+
+
+def test_denied_request_consumes_no_bucket(redis_ready):
+    tag = uuid.uuid4().hex
+    full, empty = f"ratelimit:test:{tag}:full", f"ratelimit:test:{tag}:empty"
+
+    assert consume({empty: (1, 1 / 60)})[0]
+    assert not consume({full: (5, 5 / 60), empty: (1, 1 / 60)})[0]
+
+    for _ in range(5):
+        assert consume({full: (5, 5 / 60)})[0]
+
+
+def test_decorator_returns_429_with_retry_after(redis_ready):
+    from flask import Flask
+
+    app = Flask(__name__)
+    name = f"test-{uuid.uuid4().hex[:8]}"
+
+    @app.post("/login")
+    @rate_limit(name, per_ip="100/60", per_email="1/60")
+    def login():
+        return "ok"
+
+    client = app.test_client()
+    assert client.post("/login", json={"email": "a@test.com"}).status_code == 200
+
+    response = client.post("/login", json={"email": "A@test.com"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    assert client.post("/login", json={"email": "b@test.com"}).status_code == 200
+
+
+def test_ip_bucket_uses_forwarded_client_behind_trusted_proxy(redis_ready):
+    from flask import Flask
+    from app.proxy import init_proxy_fix
+
+    app = Flask(__name__)
+    name = f"test-{uuid.uuid4().hex[:8]}"
+
+    @app.post("/login")
+    @rate_limit(name, per_ip="1/60")
+    def login():
+        return "ok"
+
+    init_proxy_fix(app, hops=1)
+    client = app.test_client()
+    proxy = {"REMOTE_ADDR": "10.0.0.1"}
+
+    def post(forwarded_for):
+        return client.post(
+            "/login", json={}, environ_base=proxy,
+            headers={"X-Forwarded-For": forwarded_for},
+        )
+
+    assert post("203.0.113.1").status_code == 200
+    assert post("203.0.113.2").status_code == 200
+    # lažni unos levo od onog koji je dodao proxy ne menja bucket
+    assert post("198.51.100.9, 203.0.113.1").status_code == 429
@@ -0,0 +1,41 @@
+"""
+Izveštaji se računaju u bazi - fiksan broj upita i ograničen isečak detalja.
+"""
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app import report_engine
+from app.report_engine import (
+    REPORTS, DETAIL_LIMIT, build_report, plan_partitions, compute_partial, merge_report,
+)
+
+
+@pytest.mark.parametrize("report_type", sorted(REPORTS))
+def test_report_runs_constant_queries(db, seeded, count_queries, report_type):
+    with count_queries() as counter:
+        report = build_report(db, report_type)
+
+    assert counter.count <= 2
+    assert report["total"] >= 1
+    details = report[report_type]
+    assert 0 < len(details) <= DETAIL_LIMIT
+
+
+def test_submissions_report_aggregates(db, seeded):
+    report = build_report(db, "submissions")
+    assert report["graded"] + report["pending"] == report["total"]
+    assert report["total"] >= 75
+
+
+@pytest.mark.parametrize("report_type", sorted(REPORTS))
+def test_partitioned_report_matches_single_pass(db, seeded, monkeypatch, report_type):
+    monkeypatch.setattr(report_engine, "PARTITION_MIN_ROWS", 0)
+
+    partitions = plan_partitions(db, report_type, workers=4)
+    partials = [compute_partial(db, report_type, lo, hi) for lo, hi in partitions]
+    merged = merge_report(report_type, partials)
+
+    assert len(partitions) > 1
+    assert merged == build_report(db, report_type)
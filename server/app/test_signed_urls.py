@@ -0,0 +1,78 @@
+"""
+Sadržaj koji browser otvara direktno traži potpisan URL koji ističe.
+"""
+
+import base64
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+
+pytest.importorskip("flask")
+
+from app import signed_urls
+from app.signed_urls import sign_path, verify
+
+
+def _params(url):
+    query = parse_qs(urlsplit(url).query)
+    return query["expires"][0], query["sig"][0]
+
+
+def test_signed_path_verifies_until_it_expires():
+    ttl = signed_urls.SIGNED_URL_TTL_SECONDS
+    url = sign_path("/api/courses/1/material", now=10 * ttl + 5)
+    expires, sig = _params(url)
+
+    assert url.startswith("/api/courses/1/material?")
+    assert verify("/api/courses/1/material", expires, sig, now=11 * ttl)
+    assert not verify("/api/courses/1/material", expires, sig, now=12 * ttl + 1)
+    assert not verify("/api/courses/2/material", expires, sig, now=11 * ttl)
+    assert not verify("/api/courses/1/material", int(expires) + ttl, sig, now=11 * ttl)
+
+
+def test_url_is_stable_within_a_window():
+    ttl = signed_urls.SIGNED_URL_TTL_SECONDS
+    assert sign_path("/x", now=3 * ttl) == sign_path("/x", now=4 * ttl - 1)
+    assert sign_path("/x", now=3 * ttl) != sign_path("/x", now=4 * ttl)
+
+
+def test_material_and_blob_need_signature(seeded, db, tmp_path, monkeypatch):
+    from flask import Flask
+    from app import blob_store
+    from app.models import Course
+    from app.routes.blobs import blobs_bp
+    from routes.courses import courses_bp
+
+    monkeypatch.setattr(blob_store, "_blob_store", blob_store.LocalBlobStore(str(tmp_path)))
+    data_url = "data:application/pdf;base64," + base64.b64encode(b"%PDF-1.4 test").decode()
+    course = db.get(Course, seeded["course"].id)
+    course.material_path, course.material_size = blob_store.store_data_url(data_url)
+    db.commit()
+
+    app = Flask(__name__)
+    app.register_blueprint(courses_bp)
+    app.register_blueprint(blobs_bp)
+    client = app.test_client()
+
+    path = f"/api/courses/{course.id}/material"
+    assert client.get(path).status_code == 403
+
+    redirect = client.get(sign_path(path))
+    assert redirect.status_code == 302
+    blob_path = urlsplit(redirect.location).path
+    assert client.get(blob_path).status_code == 403
+
+    response = client.get(redirect.location)
+    assert response.status_code == 200
+    assert response.data == b"%PDF-1.4 test"
+    assert response.headers["Cache-Control"].startswith("private")
+
+
+def test_serialized_links_are_signed(seeded, db):
+    from app.models import Course
+
+    course = db.get(Course, seeded["course"].id)
+    course.material_size = 10
+
+    url = course.to_dict()["materialPath"]
+    assert verify(urlsplit(url).path, *_params(url))
@@ -0,0 +1,123 @@
+"""
+Socket.IO preko Redis message queue-a sa više procesa.
+
+Pokreću se dva odvojena Socket.IO servera na istom kanalu. Klijent je
+povezan samo na prvi, a događaje emituju drugi server (iz HTTP zahteva) i
+ovaj test proces (external emitter) - oba moraju da stignu do klijenta.
+Preskače se ako Redis nije dostupan lokalno.
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import urllib.request
+import multiprocessing
+
+import pytest
+
+pytest.importorskip("flask_socketio")
+socketio_client = pytest.importorskip("socketio")
+redis = pytest.importorskip("redis")
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=15.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Server on port {port} did not start")
+
+
+def _serve(port, channel):
+    # env se postavlja pre importa da bi socketio_app pokupio podešavanja
+    os.environ["SOCKETIO_MESSAGE_QUEUE"] = REDIS_URL
+    os.environ["SOCKETIO_CHANNEL"] = channel
+
+    from flask import Flask, request
+    from app.socketio_app import (
+        socketio, register_ws_handlers, SOCKETIO_MESSAGE_QUEUE, SOCKETIO_CHANNEL,
+    )
+
+    app = Flask(__name__)
+    socketio.init_app(app, message_queue=SOCKETIO_MESSAGE_QUEUE, channel=SOCKETIO_CHANNEL)
+    register_ws_handlers()
+
+    @app.post("/emit")
+    def emit_from_request():
+        socketio.emit("course_request.created", request.get_json(), room="admins")
+        return "ok"
+
+    socketio.run(app, host="127.0.0.1", port=port, allow_unsafe_werkzeug=True)
+
+
+@pytest.fixture
+def servers():
+    try:
+        redis.from_url(REDIS_URL).ping()
+    except Exception as e:
+        pytest.skip(f"Redis not available: {e}")
+
+    channel = f"test-socketio-{uuid.uuid4().hex[:8]}"
+    ports = [_free_port(), _free_port()]
+    ctx = multiprocessing.get_context("spawn")
+    processes = [ctx.Process(target=_serve, args=(port, channel), daemon=True) for port in ports]
+    for process in processes:
+        process.start()
+
+    try:
+        for port in ports:
+            _wait_for_port(port)
+        yield ports, channel
+    finally:
+        for process in processes:
+            process.terminate()
+            process.join(timeout=5)
+
+
+def _wait_for(received, count, timeout=10.0):
+    deadline = time.time() + timeout
+    while len(received) < count and time.time() < deadline:
+        time.sleep(0.05)
+
+
+def test_emits_from_other_processes_reach_client(servers):
+    from flask_socketio import SocketIO
+
+    (port_a, port_b), channel = servers
+    received = []
+
+    client = socketio_client.Client()
+    client.on("course_request.created", lambda data: received.append(data))
+    client.connect(f"http://127.0.0.1:{port_a}?user_id=1&role=ADMIN", wait_timeout=10)
+
+    try:
+        # emit iz drugog web procesa
+        urllib.request.urlopen(urllib.request.Request(
+            f"http://127.0.0.1:{port_b}/emit",
+            data=json.dumps({"from": "server-b"}).encode(),
+            headers={"Content-Type": "application/json"},
+        ), timeout=5)
+
+        # emit iz procesa bez Flask aplikacije (kao job worker)
+        SocketIO(message_queue=REDIS_URL, channel=channel).emit(
+            "course_request.created", {"from": "external"}, room="admins"
+        )
+
+        _wait_for(received, 2)
+    finally:
+        client.disconnect()
+
+    assert sorted(r["from"] for r in received) == ["external", "server-b"]
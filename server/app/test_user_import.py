@@ -0,0 +1,79 @@
+"""
+Uvoz korisnika - greške po redu ne prekidaju uvoz ostalih redova.
+"""
+
+import uuid
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.user_import import parse_rows, validate_row, run_import
+
+
+def test_parse_ndjson_reports_bad_lines():
+    content = '{"email": "a@test.com"}\n\nnot json\n[1, 2]\n'
+    rows = list(parse_rows(content, "ndjson"))
+
+    assert rows[0] == (1, {"email": "a@test.com"})
+    assert rows[1][0] == 3 and rows[1][1].startswith("Invalid JSON")
+    assert rows[2] == (4, "Line must be a JSON object")
+
+
+def test_validate_row_normalizes_and_rejects():
+    values, password = validate_row({
+        "firstName": " Ana ", "lastName": "Anić", "email": "ANA@Test.com", "password": "secret1",
+    })
+    assert values["email"] == "ana@test.com"
+    assert values["first_name"] == "Ana"
+    assert values["role"] == "STUDENT"
+    assert password == "secret1"
+
+    with pytest.raises(ValueError, match="Missing fields: lastName"):
+        validate_row({"firstName": "A", "email": "a@test.com", "password": "secret1"})
+    with pytest.raises(ValueError, match="Role"):
+        validate_row({"firstName": "A", "lastName": "B", "email": "a@test.com",
+                      "password": "secret1", "role": "ADMIN"})
+
+
+def test_run_import_creates_valid_rows(db, engine):
+    from app.models import User
+
+    tag = uuid.uuid4().hex[:8]
+    content = "\n".join([
+        "firstName,lastName,email,password,role",
+        f"Ana,A,ana-{tag}@test.com,secret1,STUDENT",
+        f"Bojan,B,bojan-{tag}@test.com,123,STUDENT",
+        f"Ceca,C,ana-{tag}@test.com,secret1,STUDENT",
+        f"Dule,D,dule-{tag}@test.com,secret1,PROFESOR",
+    ])
+
+    try:
+        result = run_import(content, "csv")
+
+        assert result["total"] == 4
+        assert result["created"] == 2
+        assert [(e["line"], e["error"]) for e in result["errors"]] == [
+            (3, "Password must be at least 6 characters"),
+            (4, "Duplicate email in file"),
+        ]
+    finally:
+        db.query(User).filter(User.email.like(f"%-{tag}@test.com")).delete(synchronize_session=False)
+        db.commit()
+
+
+def test_import_content_is_kept_out_of_the_job_hash(redis_ready):
+    pytest.importorskip("redis")
+    from app import jobs
+    from app.redis_client import get_redis
+
+    job_id = jobs.enqueue("user_import", {"format": "csv"}, user_id=0, secret={"content": "pw"})
+    try:
+        assert "pw" not in str(get_redis().hgetall(f"job:{job_id}"))
+        assert 0 < get_redis().ttl(f"job:{job_id}:secret") <= jobs.JOB_SECRET_TTL_SECONDS
+
+        assert jobs.take_secret(job_id) == {"content": "pw"}
+        assert jobs.take_secret(job_id) is None
+    finally:
+        get_redis().lrem(jobs.QUEUE_KEY, 1, job_id)
+        get_redis().delete(f"job:{job_id}", "jobs:user:0")
@@ -0,0 +1,157 @@
+"""
+Masovni uvoz korisnika iz CSV ili NDJSON sadržaja (posao "user_import").
+
+Svaki red se validira zasebno - neispravni redovi se prijavljuju sa brojem
+linije i ne prekidaju uvoz ostalih. Lozinke se heširaju paralelno u pool-u
+za lozinke (app.passwords), a korisnici se upisuju u paketima od IMPORT_BATCH_SIZE redova.
+"""
+
+import os
+import io
+import csv
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import SessionLocal
+from app.models import User
+from app.passwords import hash_passwords
+
+IMPORT_BATCH_SIZE = int(os.getenv("USER_IMPORT_BATCH_SIZE", "500"))
+USER_IMPORT_MAX_BYTES = int(os.getenv("USER_IMPORT_MAX_BYTES", str(5 * 1024 * 1024)))
+
+FORMATS = ["csv", "ndjson"]
+REQUIRED_FIELDS = ["firstName", "lastName", "email", "password"]
+ROLES = ["STUDENT", "PROFESOR"]
+
+
+def parse_rows(content: str, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """Vraća (broj linije, red); red koji ne može da se parsira je string sa greškom"""
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(content))
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "ndjson":
+        for line_num, line in enumerate(content.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_num, f"Invalid JSON: {e}"
+                continue
+            yield line_num, row if isinstance(row, dict) else "Line must be a JSON object"
+    else:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+
+def validate_row(row: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+    """Vraća (vrednosti za users tabelu bez hash-a, lozinka) ili podiže ValueError"""
+    missing = [f for f in REQUIRED_FIELDS if not str(row.get(f) or "").strip()]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+
+    email = str(row["email"]).strip().lower()
+    if "@" not in email:
+        raise ValueError("Invalid email format")
+
+    password = str(row["password"])
+    if len(password) < 6:
+        raise ValueError("Password must be at least 6 characters")
+
+    role = str(row.get("role") or "STUDENT").strip().upper()
+    if role not in ROLES:
+        raise ValueError("Role must be STUDENT or PROFESOR")
+
+    values = {
+        "first_name": str(row["firstName"]).strip(),
+        "last_name": str(row["lastName"]).strip(),
+        "email": email,
+        "role": role,
+        "birth_date": str(row.get("birthDate") or "").strip(),
+        "gender": str(row.get("gender") or "").strip(),
+        "country": str(row.get("country") or "").strip(),
+        "street": str(row.get("street") or "").strip(),
+        "number": str(row.get("number") or "").strip(),
+    }
+    return values, password
+
+
+def _import_batch(db, batch: List[Tuple[int, Dict[str, Any], str]], errors: List[Dict]) -> int:
+    emails = [values["email"] for _, values, _ in batch]
+    existing = {
+        email for (email,) in db.query(User.email).filter(User.email.in_(emails))
+    }
+
+    pending = []
+    for line, values, password in batch:
+        if values["email"] in existing:
+            errors.append({"line": line, "email": values["email"], "error": "Email already exists"})
+        else:
+            pending.append((line, values, password))
+    if not pending:
+        return 0
+
+    hashes = hash_passwords([password for _, _, password in pending])
+    now = datetime.utcnow()
+    rows = [
+        {**values, "password_hash": password_hash, "created_at": now}
+        for (_, values, _), password_hash in zip(pending, hashes)
+    ]
+
+    # email koji je u međuvremenu neko drugi upisao se preskače i prijavljuje
+    stmt = insert(User).values(rows).on_conflict_do_nothing(
+        index_elements=[User.email]
+    ).returning(User.email)
+    created = {email for (email,) in db.execute(stmt)}
+    db.commit()
+
+    for line, values, _ in pending:
+        if values["email"] not in created:
+            errors.append({"line": line, "email": values["email"], "error": "Email already exists"})
+    return len(created)
+
+
+def run_import(content: str, fmt: str, progress=None) -> Dict[str, Any]:
+    rows = list(parse_rows(content, fmt))
+    total = len(rows)
+    errors: List[Dict[str, Any]] = []
+    seen = set()
+    created = 0
+
+    db = SessionLocal()
+    try:
+        batch = []
+        for i, (line, row) in enumerate(rows, start=1):
+            try:
+                if isinstance(row, str):
+                    raise ValueError(row)
+                values, password = validate_row(row)
+                if values["email"] in seen:
+                    raise ValueError("Duplicate email in file")
+                seen.add(values["email"])
+                batch.append((line, values, password))
+            except ValueError as e:
+                email = row.get("email") if isinstance(row, dict) else None
+                errors.append({"line": line, "email": email, "error": str(e)})
+
+            if len(batch) >= IMPORT_BATCH_SIZE or (i == total and batch):
+                created += _import_batch(db, batch, errors)
+                batch = []
+                if progress:
+                    progress(i, total)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    errors.sort(key=lambda e: e["line"])
+    return {
+        "total": total,
+        "created": created,
+        "failed": len(errors),
+        "errors": errors,
+    }
@@ -0,0 +1,139 @@
+"""
+HTTP benchmark: zahteva u sekundi i latencije (p50/p99) za jedan endpoint.
+
+    python bench_http.py http://localhost:5000/health -c 50 -d 30
+    python bench_http.py http://localhost:5000/api/courses/ -c 50 -d 30 -H "X-Session-ID: <id>"
+
+Svaka nit drži svoju keep-alive konekciju (nova se otvara samo ako je server
+zatvori) i šalje zahteve jedan za drugim. Prvih --warmup sekundi se ne meri.
+Postupak poređenja dev servera i gunicorn-a je opisan u DEPLOYMENT.md.
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+import http.client
+from urllib.parse import urlsplit
+
+
+def _percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class _Worker(threading.Thread):
+    def __init__(self, url, headers, start_at, measure_from, stop_at):
+        super().__init__(daemon=True)
+        self.url = url
+        self.headers = headers
+        self.start_at = start_at
+        self.measure_from = measure_from
+        self.stop_at = stop_at
+        self.latencies = []
+        self.errors = 0
+        self.statuses = {}
+        self.reconnects = 0
+
+    def _connect(self):
+        cls = http.client.HTTPSConnection if self.url.scheme == "https" else http.client.HTTPConnection
+        return cls(self.url.hostname, self.url.port, timeout=30)
+
+    def run(self):
+        path = self.url.path or "/"
+        if self.url.query:
+            path += "?" + self.url.query
+
+        while time.perf_counter() < self.start_at:
+            time.sleep(0.001)
+
+        conn = self._connect()
+        while True:
+            started = time.perf_counter()
+            if started >= self.stop_at:
+                break
+            try:
+                conn.request("GET", path, headers=self.headers)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+                if response.will_close:
+                    conn.close()
+                    conn = self._connect()
+                    self.reconnects += 1
+            except (OSError, http.client.HTTPException):
+                if started >= self.measure_from:
+                    self.errors += 1
+                conn.close()
+                conn = self._connect()
+                self.reconnects += 1
+                continue
+
+            if started >= self.measure_from:
+                self.latencies.append(time.perf_counter() - started)
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+        conn.close()
+
+
+def run(url, concurrency, duration, warmup, headers):
+    start_at = time.perf_counter() + 0.5
+    measure_from = start_at + warmup
+    stop_at = measure_from + duration
+
+    workers = [
+        _Worker(urlsplit(url), headers, start_at, measure_from, stop_at)
+        for _ in range(concurrency)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    latencies = sorted(l for w in workers for l in w.latencies)
+    statuses = {}
+    for worker in workers:
+        for status, count in worker.statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+
+    def ms(value):
+        return round(value * 1000, 2) if value is not None else None
+
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "durationSeconds": duration,
+        "requests": len(latencies),
+        "rps": round(len(latencies) / duration, 1),
+        "p50Ms": ms(_percentile(latencies, 50)),
+        "p99Ms": ms(_percentile(latencies, 99)),
+        "maxMs": ms(latencies[-1] if latencies else None),
+        "errors": sum(w.errors for w in workers),
+        "reconnects": sum(w.reconnects for w in workers),
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP throughput/latency benchmark")
+    parser.add_argument("url")
+    parser.add_argument("-c", "--concurrency", type=int, default=50)
+    parser.add_argument("-d", "--duration", type=float, default=30, help="seconds measured")
+    parser.add_argument("-w", "--warmup", type=float, default=5, help="seconds not measured")
+    parser.add_argument("-H", "--header", action="append", default=[], help="'Name: value'")
+    args = parser.parse_args()
+
+    headers = {}
+    for header in args.header:
+        name, _, value = header.partition(":")
+        headers[name.strip()] = value.strip()
+
+    result = run(args.url, args.concurrency, args.duration, args.warmup, headers)
+    json.dump(result, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Mikrobenchmark JSON serijalizacije za najveće list odgovore i Redis sesije.
+
+    python bench_json.py              # 200 redova (MAX_PAGE_LIMIT) i 5000 redova
+    python bench_json.py --rows 1000 --repeat 50
+
+Redovi imaju oblik to_dict() rezultata za kurseve, zadatke i predaje.
+Porede se:
+- stdlib: kao ranije - .isoformat() u to_dict i Flask-ov json.dumps (sort_keys)
+- fastjson (stdlib): app.fastjson bez orjson-a (fallback)
+- fastjson (orjson): app.fastjson sa orjson-om, datetime nativno
+Ne koristi bazu ni Flask.
+"""
+
+import json
+import timeit
+import argparse
+import statistics
+from datetime import datetime, timedelta
+
+from app import fastjson
+
+NOW = datetime(2025, 1, 15, 10, 30, 12, 123456)
+
+
+def course_rows(n):
+    return [{
+        "id": i,
+        "professorId": i % 50,
+        "professorName": f"Profesor {i % 50}",
+        "name": f"Kurs {i}",
+        "description": "Opis kursa " * 8,
+        "materialPath": f"/api/courses/{i}/material" if i % 3 else None,
+        "materialSize": 123456 if i % 3 else None,
+        "createdAt": NOW - timedelta(hours=i),
+    } for i in range(n)]
+
+
+def task_rows(n):
+    return [{
+        "id": i,
+        "courseId": i % 40,
+        "courseName": f"Kurs {i % 40}",
+        "title": f"Zadatak {i}",
+        "description": "Opis zadatka " * 12,
+        "deadline": NOW + timedelta(days=i % 30),
+        "createdAt": NOW - timedelta(hours=i),
+    } for i in range(n)]
+
+
+def submission_rows(n):
+    return [{
+        "id": i,
+        "taskId": i % 20,
+        "taskTitle": f"Zadatak {i % 20}",
+        "studentId": i,
+        "studentName": f"Student Studentić {i}",
+        "filePath": f"/api/tasks/{i % 20}/submissions/{i}/download",
+        "fileSize": 2048 + i,
+        "grade": i % 5 + 1 if i % 2 else None,
+        "comment": "Dobro urađeno" if i % 2 else None,
+        "submittedAt": NOW - timedelta(minutes=i),
+        "gradedAt": NOW if i % 2 else None,
+    } for i in range(n)]
+
+
+PAYLOADS = {
+    "courses": course_rows,
+    "tasks": task_rows,
+    "submissions": submission_rows,
+}
+
+SESSION = '{"user_id": 12345, "email": "student12345@test.com", "role": "STUDENT"}'
+
+
+def _isoformat_rows(rows):
+    return [
+        {k: v.isoformat() if isinstance(v, datetime) else v for k, v in row.items()}
+        for row in rows
+    ]
+
+
+def _time(fn, repeat, number):
+    runs = timeit.repeat(fn, repeat=repeat, number=number)
+    per_call = sorted(r / number * 1000 for r in runs)
+    return statistics.median(per_call), per_call[0]
+
+
+def run(rows, repeat, number):
+    has_orjson = fastjson.orjson is not None
+    results = []
+
+    for name, build in PAYLOADS.items():
+        data = build(rows)
+
+        def stdlib():
+            # stari put: konverzija datuma u to_dict + Flask DefaultJSONProvider
+            return json.dumps(_isoformat_rows(data), sort_keys=True)
+
+        def fallback():
+            saved = fastjson.orjson
+            fastjson.orjson = None
+            try:
+                return fastjson.dumps_bytes(data)
+            finally:
+                fastjson.orjson = saved
+
+        variants = [("stdlib", stdlib), ("fastjson (stdlib)", fallback)]
+        if has_orjson:
+            variants.append(("fastjson (orjson)", lambda: fastjson.dumps_bytes(data)))
+
+        baseline = None
+        for variant, fn in variants:
+            median, best = _time(fn, repeat, number)
+            baseline = baseline or median
+            results.append((f"{name} x{rows}", variant, median, best, baseline / median))
+
+    for variant, fn in [("stdlib", lambda: json.loads(SESSION)), ("fastjson", lambda: fastjson.loads(SESSION))]:
+        median, best = _time(fn, repeat, number * 100)
+        results.append(("session loads", variant, median, best, None))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON serialization microbenchmark")
+    parser.add_argument("--rows", type=int, action="append", help="rows per payload (default: 200 and 5000)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"orjson: {fastjson.orjson.__version__ if fastjson.orjson else 'not installed'}")
+    print(f"{'payload':<20} {'variant':<20} {'median ms':>10} {'best ms':>10} {'speedup':>8}")
+    for rows in args.rows or [200, 5000]:
+        for payload, variant, median, best, speedup in run(rows, args.repeat, args.number):
+            speedup = f"{speedup:.1f}x" if speedup else ""
+            print(f"{payload:<20} {variant:<20} {median:>10.4f} {best:>10.4f} {speedup:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from app.database import engine
-from app.models import Base
+from app.migrations import migrate
 
 print("🛠️  Kreiram tabele u PostgreSQL bazi...")
-Base.metadata.create_all(bind=engine)
+migrate(engine)
 print("✅ Sve tabele su uspješno kreirane!")
\ No newline at end of file
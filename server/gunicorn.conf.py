@@ -0,0 +1,49 @@
+"""
+Gunicorn podešavanja; sve se može promeniti kroz env.
+
+Aplikacija se učitava jednom u master procesu (preload_app) pa se migracije
+i inicijalizacija ne ponavljaju po workeru, a workeri se forkuju sa već
+učitanim kodom. Konekcije otvorene u masteru se u post_fork odbacuju.
+
+Graceful reload: `kill -HUP <master pid>` - novi workeri se pokreću, stari
+završavaju započete zahteve (do GUNICORN_GRACEFUL_TIMEOUT sekundi). Uz
+preload_app HUP ne učitava novi kod; za deploy novog koda koristi se
+USR2 (novi master) pa QUIT starom masteru, ili GUNICORN_PRELOAD=0.
+"""
+
+import os
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+
+# Socket.IO sa više workera zahteva sticky sesije na load balanceru i
+# SOCKETIO_MESSAGE_QUEUE da bi emit stigao do klijenata na drugim workerima.
+workers = int(os.getenv("GUNICORN_WORKERS", str(os.cpu_count() or 1)))
+worker_class = os.getenv(
+    "GUNICORN_WORKER_CLASS", "geventwebsocket.gunicorn.workers.GeventWebSocketWorker"
+)
+# istovremene konekcije po gevent workeru
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+# periodična zamena workera ograničava posledice curenja memorije;
+# jitter sprečava da se svi workeri restartuju istovremeno
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "1000"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    # konekcije iz pool-a koje je master otvorio (migracije) se ne dele sa
+    # workerom; close=False jer ih master i dalje poseduje
+    from app.database import engine
+
+    engine.dispose(close=False)
+    server.log.info(f"Worker {worker.pid} started")
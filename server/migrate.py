@@ -0,0 +1,30 @@
+"""
+Primenjuje migracije šeme (app.migrations).
+
+Pokretanje: python migrate.py            - primeni sve neprimenjene
+            python migrate.py --status   - prikaži stanje
+"""
+
+import sys
+
+from app.database import engine
+from app.migrations import migrate, status
+
+
+def main(argv):
+    if "--status" in argv:
+        for version, description, applied in status(engine):
+            mark = "✅" if applied else "⏳"
+            print(f"{mark} {version}  {description}")
+        return 0
+
+    applied = migrate(engine)
+    if applied:
+        print(f"✅ Applied {len(applied)} migration(s): {', '.join(applied)}")
+    else:
+        print("✅ Schema already up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,79 @@
+"""
+Jednokratna migracija: data URL sadržaj iz baze prebacuje u blob store,
+a u kolonama ostavlja samo referencu i popunjava kolone sa veličinom.
+Može se bezbedno pokrenuti više puta.
+"""
+
+import sys
+
+from app.database import SessionLocal
+from app.models import User, Course, TaskSubmission
+from app.blob_store import store_data_url, value_size, BlobError
+
+BATCH_SIZE = 100
+
+COLUMNS = [
+    (User, User.profile_image, User.profile_image_size),
+    (Course, Course.material_path, Course.material_size),
+    (TaskSubmission, TaskSubmission.file_path, TaskSubmission.file_size),
+]
+
+
+def migrate_column(model, column, size_column):
+    db = SessionLocal()
+    migrated, failed, last_id = 0, 0, 0
+    try:
+        while True:
+            rows = (
+                db.query(model.id, column)
+                .filter(
+                    model.id > last_id,
+                    column.isnot(None),
+                    (column.like("data:%")) | (size_column.is_(None)),
+                )
+                .order_by(model.id)
+                .limit(BATCH_SIZE)
+                .all()
+            )
+            if not rows:
+                break
+
+            for row_id, value in rows:
+                try:
+                    if value.startswith("data:"):
+                        ref, size = store_data_url(value)
+                    else:
+                        ref, size = value, value_size(value)
+                except (BlobError, OSError) as e:
+                    print(f"  ⚠️ {model.__tablename__}#{row_id}: {e}")
+                    failed += 1
+                    continue
+                db.query(model).filter(model.id == row_id).update(
+                    {column: ref, size_column: size}, synchronize_session=False
+                )
+                migrated += 1
+
+            db.commit()
+            last_id = rows[-1][0]
+            print(f"  {model.__tablename__}.{column.key}: {migrated} migrated")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    return migrated, failed
+
+
+def main():
+    print("📦 Prebacujem fajlove iz baze u blob store...")
+    total_failed = 0
+    for model, column, size_column in COLUMNS:
+        migrated, failed = migrate_column(model, column, size_column)
+        total_failed += failed
+        print(f"✅ {model.__tablename__}.{column.key}: {migrated} migrated, {failed} failed")
+    return 1 if total_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
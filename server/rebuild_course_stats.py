@@ -0,0 +1,32 @@
+"""
+Ponovo računa tabelu course_stats iz izvornih tabela (upisi, zadaci, predaje).
+Pokreće se kad brojači odstupe, npr. posle ručnih izmena u bazi.
+
+Pokretanje: python rebuild_course_stats.py [course_id ...]
+"""
+
+import sys
+
+from app.database import SessionLocal
+from app.course_stats import rebuild
+
+
+def main(argv):
+    course_ids = [int(a) for a in argv] or None
+
+    db = SessionLocal()
+    try:
+        print("📊 Računam statistiku kurseva...")
+        rebuilt = rebuild(db, course_ids)
+        db.commit()
+        print(f"✅ Statistika osvežena za {rebuilt} kurs(eva)")
+        return 0
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
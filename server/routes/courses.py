@@ -1,14 +1,37 @@
+import os
+from datetime import datetime
+
 from flask import Blueprint, request, jsonify
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models import User, Course, CourseRequest, CourseEnrollment
 from app.auth import session_required, role_required
-from app.socketio_app import socketio
-from app.email_utils import send_email
+from app.socketio_app import buffered_emit
+from app.outbox import enqueue_email, enqueue_emails
 from app.database import SessionLocal
+from app.pagination import paginate, page_params, PaginationError, MAX_PAGE_LIMIT
+from app.cache import read_through, bump, COURSES_CACHE
+from app.etag import conditional
+from app.course_stats import record as record_stats, get_stats
+from app.blob_store import store_data_url, BlobError
+from app.routes.blobs import send_value
+from app.signed_urls import signed_url_required
+from app.serializers import (
+    serialize_all,
+    COURSE_LIST,
+    COURSE_REQUEST_LIST,
+    ENROLLMENT_LIST,
+    ENROLLED_COURSE_LIST,
+    SUBMISSION_LIST,
+)
 
 courses_bp = Blueprint("courses", __name__, url_prefix="/api/courses")
 
+BULK_ENROLL_MAX = int(os.getenv("BULK_ENROLL_MAX", "1000"))
+
 
 @courses_bp.post("/request")
 @session_required
@@ -38,11 +61,7 @@ def create_course_request():
         db.commit()
         db.refresh(course_req)
         
-        socketio.emit(
-            "course_request.created",
-            course_req.to_dict(),
-            room="admins"
-        )
+        buffered_emit("course_request.created", course_req.to_dict(), room="admins")
         
         return jsonify(course_req.to_dict()), 201
 
@@ -63,36 +82,79 @@ def get_my_course_requests():
         professor_id = request.user.get("user_id")
         requests = db.query(CourseRequest).filter(
             CourseRequest.professor_id == professor_id
-        ).order_by(CourseRequest.created_at.desc()).all()
+        ).order_by(CourseRequest.created_at.desc())
         
-        return jsonify([r.to_dict() for r in requests]), 200
+        return jsonify(serialize_all(requests, COURSE_REQUEST_LIST)), 200
     finally:
         db.close()
 
 
 @courses_bp.get("/")
 @session_required
+@conditional(COURSES_CACHE)
 def list_courses():
     """Svi korisnici mogu da vide odobrene kurseve"""
+    try:
+        limit, _ = page_params()
+        cursor = request.args.get("cursor", "")
+        page = read_through(COURSES_CACHE, f"list:{limit}:{cursor}", _load_course_page)
+        return jsonify(page), 200
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+def _load_course_page():
+    db: Session = SessionLocal()
+    try:
+        return paginate(
+            db.query(Course),
+            Course.created_at,
+            Course.id,
+            options=COURSE_LIST,
+        )
+    finally:
+        db.close()
+
+
+@courses_bp.get("/stats")
+@session_required
+def get_courses_stats():
+    """Statistika za kurseve iz ?ids=1,2,3 (upisi, zadaci, predaje, prosečna ocena)"""
+    try:
+        ids = [int(i) for i in request.args.get("ids", "").split(",") if i.strip()]
+    except ValueError:
+        return jsonify({"error": "ids must be a comma-separated list of integers"}), 400
+
+    if not ids:
+        return jsonify({"error": "ids is required"}), 400
+    if len(ids) > MAX_PAGE_LIMIT:
+        return jsonify({"error": f"At most {MAX_PAGE_LIMIT} ids per request"}), 400
+
     db: Session = SessionLocal()
     try:
-        courses = db.query(Course).order_by(Course.created_at.desc()).all()
-        return jsonify([c.to_dict() for c in courses]), 200
+        stats = get_stats(db, ids)
+        return jsonify([stats[i] for i in ids]), 200
     finally:
         db.close()
 
 
 @courses_bp.get("/<int:course_id>")
 @session_required
+@conditional(COURSES_CACHE)
 def get_course(course_id):
     """Detalji kursa"""
+    course = read_through(COURSES_CACHE, f"course:{course_id}", lambda: _load_course(course_id))
+    if not course:
+        return jsonify({"error": "Course not found"}), 404
+    
+    return jsonify(course), 200
+
+
+def _load_course(course_id):
     db: Session = SessionLocal()
     try:
         course = db.query(Course).filter(Course.id == course_id).first()
-        if not course:
-            return jsonify({"error": "Course not found"}), 404
-        
-        return jsonify(course.to_dict()), 200
+        return course.to_dict() if course else None
     finally:
         db.close()
 
@@ -127,6 +189,7 @@ def update_course(course_id):
             course.description = description
         
         db.commit()
+        bump(COURSES_CACHE)
         db.refresh(course)
         
         return jsonify(course.to_dict()), 200
@@ -155,6 +218,7 @@ def delete_course(course_id):
         
         db.delete(course)
         db.commit()
+        bump(COURSES_CACHE)
         
         return jsonify({"status": "deleted", "message": "Course deleted successfully"}), 200
 
@@ -190,24 +254,27 @@ def upload_course_material(course_id):
         if not material_path.startswith("data:application/pdf"):
             return jsonify({"error": "Invalid PDF format"}), 400
         
-        course.material_path = material_path
-        db.commit()
-        db.refresh(course)
+        try:
+            course.material_path, course.material_size = store_data_url(material_path)
+        except BlobError as e:
+            return jsonify({"error": str(e)}), 400
         
-        enrollments = db.query(CourseEnrollment).filter(
-            CourseEnrollment.course_id == course_id
-        ).all()
+        student_emails = db.query(User.email).join(
+            CourseEnrollment, CourseEnrollment.student_id == User.id
+        ).filter(CourseEnrollment.course_id == course_id).all()
+        
+        enqueue_emails(db, (
+            {
+                "to": email,
+                "subject": f"Novi materijal u kursu {course.name}",
+                "body": f"Dodat je novi materijal: {file_name}",
+            }
+            for (email,) in student_emails
+        ))
         
-        for enrollment in enrollments:
-            student = enrollment.student
-            try:
-                send_email(
-                    to=student.email,
-                    subject=f"Novi materijal u kursu {course.name}",
-                    body=f"Dodat je novi materijal: {file_name}"
-                )
-            except Exception as e:
-                print(f"Failed to send email to {student.email}: {e}")
+        db.commit()
+        bump(COURSES_CACHE)
+        db.refresh(course)
         
         return jsonify(course.to_dict()), 200
 
@@ -218,6 +285,21 @@ def upload_course_material(course_id):
         db.close()
 
 
+@courses_bp.get("/<int:course_id>/material")
+@signed_url_required
+def download_course_material(course_id):
+    """Materijal kursa - link se otvara direktno iz browsera, bez X-Session-ID, pa se proverava potpis URL-a"""
+    db: Session = SessionLocal()
+    try:
+        material = db.query(Course.material_path).filter(Course.id == course_id).scalar()
+        if not material:
+            return jsonify({"error": "Material not found"}), 404
+        
+        return send_value(material, download_name=f"course-{course_id}-material.pdf")
+    finally:
+        db.close()
+
+
 @courses_bp.post("/<int:course_id>/enroll")
 @session_required
 @role_required("STUDENT")
@@ -244,11 +326,16 @@ def enroll_student(course_id):
             student_id=student_id
         )
         db.add(enrollment)
+        record_stats(db, course_id, enrollments=1)
         db.commit()
         db.refresh(enrollment)
         
         return jsonify(enrollment.to_dict()), 201
 
+    except IntegrityError:
+        # istovremeni upis istog studenta - unique indeks na (course_id, student_id)
+        db.rollback()
+        return jsonify({"error": "Already enrolled"}), 409
     except Exception as e:
         db.rollback()
         return jsonify({"error": "Failed to enroll", "detail": str(e)}), 500
@@ -297,14 +384,13 @@ def enroll_student_by_professor(course_id):
             student_id=student_id
         )
         db.add(enrollment)
-        db.commit()
-        db.refresh(enrollment)
+        record_stats(db, course_id, enrollments=1)
         
-        try:
-            send_email(
-                to=student.email,
-                subject=f"Dodati ste na kurs: {course.name}",
-                body=f"""
+        enqueue_email(
+            db,
+            to=student.email,
+            subject=f"Dodati ste na kurs: {course.name}",
+            body=f"""
 Poštovani/a {student.first_name},
 
 Dodati ste na kurs '{course.name}'.
@@ -313,13 +399,17 @@ Profesor: {course.professor.first_name} {course.professor.last_name}
 Opis: {course.description}
 
 Prijavite se na platformu kako biste pristupili materijalu i zadacima.
-                """
-            )
-        except Exception as e:
-            print(f"Failed to send email to {student.email}: {e}")
+            """
+        )
+        
+        db.commit()
+        db.refresh(enrollment)
         
         return jsonify(enrollment.to_dict()), 201
 
+    except IntegrityError:
+        db.rollback()
+        return jsonify({"error": "Student is already enrolled"}), 409
     except Exception as e:
         db.rollback()
         return jsonify({"error": "Failed to enroll student", "detail": str(e)}), 500
@@ -327,6 +417,114 @@ Prijavite se na platformu kako biste pristupili materijalu i zadacima.
         db.close()
 
 
+@courses_bp.post("/<int:course_id>/enroll/bulk")
+@session_required
+@role_required("PROFESOR")
+def bulk_enroll_students(course_id):
+    """PROFESOR upisuje više studenata odjednom (lista ID-jeva i/ili email adresa)"""
+    db: Session = SessionLocal()
+    try:
+        course = db.query(Course).filter(Course.id == course_id).first()
+        if not course:
+            return jsonify({"error": "Course not found"}), 404
+        
+        if course.professor_id != request.user.get("user_id"):
+            return jsonify({"error": "You are not the owner of this course"}), 403
+        
+        data = request.get_json() or {}
+        students = data.get("students")
+        
+        if not isinstance(students, list) or not students:
+            return jsonify({"error": "students must be a non-empty list of IDs or emails"}), 400
+        
+        if len(students) > BULK_ENROLL_MAX:
+            return jsonify({"error": f"At most {BULK_ENROLL_MAX} students per request"}), 400
+        
+        ids = {s for s in students if isinstance(s, int) and not isinstance(s, bool)}
+        emails = {s.strip().lower() for s in students if isinstance(s, str) and s.strip()}
+        
+        # svi studenti u jednom upitu
+        users = db.query(User.id, User.email, User.first_name, User.role).filter(
+            or_(User.id.in_(ids), User.email.in_(emails))
+        ).all()
+        by_id = {u.id: u for u in users}
+        by_email = {u.email: u for u in users}
+        
+        resolved = []
+        to_enroll = {}
+        for s in students:
+            if isinstance(s, str):
+                user = by_email.get(s.strip().lower())
+            elif isinstance(s, int) and not isinstance(s, bool):
+                user = by_id.get(s)
+            else:
+                user = None
+            
+            resolved.append((s, user))
+            if user is not None and user.role == "STUDENT":
+                to_enroll[user.id] = user
+        
+        inserted = set()
+        if to_enroll:
+            stmt = insert(CourseEnrollment).values([
+                {"course_id": course_id, "student_id": student_id, "enrolled_at": datetime.utcnow()}
+                for student_id in to_enroll
+            ]).on_conflict_do_nothing(
+                index_elements=[CourseEnrollment.course_id, CourseEnrollment.student_id]
+            ).returning(CourseEnrollment.student_id)
+            inserted = {student_id for (student_id,) in db.execute(stmt)}
+        
+        record_stats(db, course_id, enrollments=len(inserted))
+        
+        professor = course.professor
+        enqueue_emails(db, (
+            {
+                "to": to_enroll[student_id].email,
+                "subject": f"Dodati ste na kurs: {course.name}",
+                "body": f"""
+Poštovani/a {to_enroll[student_id].first_name},
+
+Dodati ste na kurs '{course.name}'.
+
+Profesor: {professor.first_name} {professor.last_name}
+Opis: {course.description}
+
+Prijavite se na platformu kako biste pristupili materijalu i zadacima.
+            """,
+            }
+            for student_id in inserted
+        ))
+        
+        db.commit()
+        
+        results = []
+        reported = set()
+        for s, user in resolved:
+            if user is None:
+                status = "not_found"
+            elif user.role != "STUDENT":
+                status = "not_student"
+            elif user.id in inserted and user.id not in reported:
+                status = "enrolled"
+                reported.add(user.id)
+            else:
+                status = "already_enrolled"
+            results.append({"student": s, "studentId": user.id if user else None, "status": status})
+        
+        return jsonify({
+            "enrolled": len(inserted),
+            "alreadyEnrolled": len([r for r in results if r["status"] == "already_enrolled"]),
+            "failed": len([r for r in results if r["status"] in ("not_found", "not_student")]),
+            "results": results,
+        }), 200
+
+    except Exception as e:
+        db.rollback()
+        return jsonify({"error": "Failed to enroll students", "detail": str(e)}), 500
+    finally:
+        db.close()
+
+
 @courses_bp.get("/<int:course_id>/students")
 @session_required
 @role_required("PROFESOR")
@@ -344,9 +542,9 @@ def list_course_students(course_id):
         
         enrollments = db.query(CourseEnrollment).filter(
             CourseEnrollment.course_id == course_id
-        ).all()
+        )
         
-        return jsonify([e.to_dict() for e in enrollments]), 200
+        return jsonify(serialize_all(enrollments, ENROLLMENT_LIST)), 200
     finally:
         db.close()
 
@@ -361,7 +559,7 @@ def get_my_courses():
         student_id = request.user.get("user_id")
         enrollments = db.query(CourseEnrollment).filter(
             CourseEnrollment.student_id == student_id
-        ).all()
+        ).options(*ENROLLED_COURSE_LIST).all()
         
         courses = [e.course.to_dict() for e in enrollments]
         return jsonify(courses), 200
@@ -376,18 +574,22 @@ def get_available_students():
     """PROFESOR vidi listu svih studenata (za dodavanje na kurs)"""
     db: Session = SessionLocal()
     try:
-        students = db.query(User).filter(User.role == "STUDENT").all()
-        
-        return jsonify([
-            {
+        page = paginate(
+            db.query(User).filter(User.role == "STUDENT"),
+            User.created_at,
+            User.id,
+            serialize=lambda s: {
                 "id": s.id,
                 "email": s.email,
                 "firstName": s.first_name,
                 "lastName": s.last_name,
                 "role": s.role
-            }
-            for s in students
-        ]), 200
+            },
+        )
+        
+        return jsonify(page), 200
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
     finally:
         db.close()
 
@@ -408,13 +610,12 @@ def get_course_submissions(course_id):
         if course.professor_id != professor_id:
             return jsonify({"error": "You are not the owner of this course"}), 403
         
-        tasks = db.query(Task).filter(Task.course_id == course_id).all()
-        task_ids = [t.id for t in tasks]
+        task_ids = db.query(Task.id).filter(Task.course_id == course_id)
         
         submissions = db.query(TaskSubmission).filter(
-            TaskSubmission.task_id.in_(task_ids)
-        ).order_by(TaskSubmission.submitted_at.desc()).all()
+            TaskSubmission.task_id.in_(task_ids.scalar_subquery())
+        ).order_by(TaskSubmission.submitted_at.desc())
         
-        return jsonify([s.to_dict() for s in submissions]), 200
+        return jsonify(serialize_all(submissions, SUBMISSION_LIST)), 200
     finally:
         db.close()
\ No newline at end of file
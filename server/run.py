@@ -1,6 +1,16 @@
-from app.factory import create_app
+"""
+Razvojni server (werkzeug). Za produkciju: gunicorn -c gunicorn.conf.py wsgi:app
+"""
 
-app = create_app()
+import os
+
+from app.main import app, socketio
 
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5000)
\ No newline at end of file
+    socketio.run(
+        app,
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "5000")),
+        debug=os.getenv("FLASK_DEBUG", "1") == "1",
+        allow_unsafe_werkzeug=True,
+    )
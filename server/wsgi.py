@@ -0,0 +1,30 @@
+"""
+Produkcioni ulaz za gunicorn (podešavanja su u gunicorn.conf.py):
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Sa gevent workerom monkey patch mora da se uradi pre importa bilo čega što
+koristi socket-e ili niti (redis, psycopg2, flask_socketio), zato je ovde
+na samom vrhu, pre importa aplikacije.
+"""
+
+import os
+
+os.environ.setdefault("SOCKETIO_ASYNC_MODE", "gevent")
+
+if os.environ["SOCKETIO_ASYNC_MODE"] == "gevent":
+    from gevent import monkey
+
+    monkey.patch_all()
+
+    # psycopg2 je C biblioteka - bez ovoga upit blokira ceo worker
+    try:
+        from psycogreen.gevent import patch_psycopg
+
+        patch_psycopg()
+    except ImportError:
+        print("⚠️ psycogreen not installed, database calls will block the gevent loop")
+
+from app.main import app, socketio  # noqa: E402
+
+__all__ = ["app", "socketio"]